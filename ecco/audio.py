@@ -0,0 +1,115 @@
+import math
+import random
+import threading
+import time
+
+import pygame
+
+from .telemetry import percentile
+
+######################################################################
+# Mixer profiles and output latency
+######################################################################
+
+
+class AudioProfile:
+    def __init__(self, name, frequency=44100, buffer=512, channels=2, mix_channels=16):
+        self.name = name
+        self.frequency = frequency
+        self.buffer = buffer              # Device buffer in sample frames
+        self.channels = channels          # Output channels (2 = stereo)
+        self.mix_channels = mix_channels  # Sounds that can play at once
+
+
+# Smaller buffers start sounds sooner but wake the audio thread more often.
+# Music takes 8 channels when it is layered from stems (see StemDeck).
+AUDIO_PROFILES = {p.name: p for p in (
+    AudioProfile("low-latency", frequency=48000, buffer=256),
+    AudioProfile("balanced", frequency=44100, buffer=512),
+    AudioProfile("power-saving", frequency=22050, buffer=2048, mix_channels=12),
+)}
+
+
+def audio_profile(name):
+    return AUDIO_PROFILES.get(name, AUDIO_PROFILES["balanced"])
+
+
+def pre_init_mixer(profile):
+    """
+    Must run before pygame.init(): that opens the audio device itself, and
+    once it is open a later pre_init() has no effect.
+    """
+    pygame.mixer.pre_init(profile.frequency, -16, profile.channels, profile.buffer)
+
+
+def init_mixer(profile):
+    """Open the device for `profile` (reopening it if it was opened differently)."""
+    pre_init_mixer(profile)
+    current = pygame.mixer.get_init()
+    if current and current != (profile.frequency, -16, profile.channels):
+        pygame.mixer.quit()
+    if not pygame.mixer.get_init():
+        pygame.mixer.init()
+    pygame.mixer.set_num_channels(profile.mix_channels)
+    return MixerStatus(profile)
+
+
+class MixerStatus:
+    """
+    What the device actually gave us, and how long a sound takes to start.
+
+    pygame can't report the obtained buffer size, so measure() times it: a
+    few samples of silence are played the way play_sfx() plays a sound and
+    the channel polled until the mixer has consumed them. That is the wait
+    for the mixer's next pass, uniform over one buffer period, so the
+    longest wait gives the buffer size. The device's own queue comes on top
+    and can't be seen from here.
+    """
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.frequency, _, self.channels = pygame.mixer.get_init()
+        self.mix_channels = pygame.mixer.get_num_channels()
+        self.start_ms = []
+        self._thread = None
+
+    def measure(self, samples=24):
+        """Time sound starts on a background thread (while menus are up)."""
+        self._thread = threading.Thread(target=self._measure, args=(samples,), daemon=True)
+        self._thread.start()
+
+    def _measure(self, samples):
+        blip = pygame.mixer.Sound(buffer=bytes(8 * self.channels))
+        # The last channel: find_channel() hands it out only when all the
+        # others are busy, so the probe won't cut off a real sound
+        channel = pygame.mixer.Channel(self.mix_channels - 1)
+        period = self.profile.buffer / self.profile.frequency
+        rng = random.Random()
+        try:
+            for _ in range(samples):
+                start = time.perf_counter()
+                channel.play(blip)
+                while channel.get_busy():
+                    time.sleep(0.0002)
+                self.start_ms.append((time.perf_counter() - start) * 1000.0)
+                # Land the next play at a random point of the mixer's cycle
+                time.sleep(rng.uniform(0.0, period))
+        except pygame.error:
+            pass  # Mixer closed while measuring (game quit)
+
+    def measured_buffer(self):
+        """Obtained buffer size in frames, rounded to a power of two, or None."""
+        if len(self.start_ms) < 8:
+            return None
+        frames = max(self.start_ms) / 1000.0 * self.frequency
+        return 1 << max(0, round(math.log2(max(1.0, frames))))
+
+    def report(self):
+        text = (f"Audio: {self.profile.name} {self.frequency}Hz {self.channels}ch "
+                f"{self.mix_channels} voices, buffer {self.profile.buffer}")
+        buffer = self.measured_buffer()
+        if buffer is None:
+            return text + " (measuring)"
+        ms = sorted(self.start_ms)
+        return (text + f" (~{buffer} measured) | sfx start "
+                f"{percentile(ms, 50):.1f}/{percentile(ms, 95):.1f}ms")
@@ -0,0 +1,124 @@
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pygame
+
+######################################################################
+# Band-parallel window scaling
+######################################################################
+
+
+def band_rows(height, count):
+    """[(top, bottom), ...] splitting height rows into count near-equal bands."""
+    count = max(1, min(count, height))
+    return [(height * i // count, height * (i + 1) // count) for i in range(count)]
+
+
+class BandScaler:
+    """
+    pygame.transform.scale() split into horizontal bands, one per thread:
+    each band of source rows is scaled into the matching band of the
+    destination through a pair of subsurfaces. scale() releases the GIL,
+    so the bands run on separate cores. (blit() and fill() keep the GIL,
+    so compositing the base frame in bands gains nothing.)
+
+    The subsurface pairs are cached until either surface is replaced or
+    resized, or invalidate() is called (after every set_mode). Band edges
+    land on the same destination rows as an unbanded scale whenever the
+    scale factor is a whole number.
+    """
+
+    def __init__(self, threads=None):
+        self.threads = threads or os.cpu_count() or 1
+        self._pool = ThreadPoolExecutor(self.threads, thread_name_prefix="band")
+        self._bands = {}
+
+    def _pairs(self, src, dest):
+        sw, sh = src.get_size()
+        dw, dh = dest.get_size()
+        key = (id(src), id(dest), sw, sh, dw, dh)
+        cached = self._bands.get(key)
+        if cached is None:
+            if len(self._bands) > 8:
+                self._bands.clear()
+            pairs = []
+            for top, bottom in band_rows(sh, self.threads):
+                dtop, dbottom = top * dh // sh, bottom * dh // sh
+                if dbottom > dtop:
+                    pairs.append((src.subsurface((0, top, sw, bottom - top)),
+                                  dest.subsurface((0, dtop, dw, dbottom - dtop))))
+            # Holding the surfaces keeps their ids from being reused
+            cached = self._bands[key] = (src, dest, pairs)
+        return cached[2]
+
+    def scale(self, src, dest):
+        """pygame.transform.scale(src, dest.get_size(), dest), band by band."""
+        pairs = self._pairs(src, dest)
+        # The calling thread takes the first band instead of waiting idle
+        futures = [self._pool.submit(_scale_band, s, d) for s, d in pairs[1:]]
+        _scale_band(*pairs[0])
+        for f in futures:
+            f.result()
+
+    def invalidate(self):
+        """Forget the subsurfaces; needed after set_mode (see Presenter.invalidate)."""
+        self._bands.clear()
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False)
+        self._bands.clear()
+
+
+def _scale_band(src, dest):
+    pygame.transform.scale(src, dest.get_size(), dest)
+
+
+# ----------------------- Benchmark -----------------------
+
+def benchmark(window, base, threads, frames=60):
+    """Time a base-to-window stretch serial and banded: (serial ms, banded ms, identical)."""
+    src = pygame.Surface(base)
+    # Something to compare: a gradient of columns and rows
+    for x in range(0, base[0], 4):
+        src.fill((x * 255 // base[0], 80, 160), (x, 0, 4, base[1]))
+    for y in range(0, base[1], 3):
+        src.fill((40, y * 255 // base[1], 90), (0, y, base[0], 1))
+    serial_out, banded_out = pygame.Surface(window), pygame.Surface(window)
+    scaler = BandScaler(threads)
+    runs = ((serial_out, lambda: pygame.transform.scale(src, window, serial_out)),
+            (banded_out, lambda: scaler.scale(src, banded_out)))
+    times = []
+    for out, frame in runs:
+        frame()  # Warm up (subsurfaces, pool threads)
+        start = time.perf_counter()
+        for _ in range(frames):
+            frame()
+        times.append((time.perf_counter() - start) * 1000.0 / frames)
+    scaler.shutdown()
+    same = pygame.image.tobytes(serial_out, "RGB") == pygame.image.tobytes(banded_out, "RGB")
+    return times[0], times[1], same
+
+
+def _size(text):
+    w, _, h = text.partition("x")
+    return int(w), int(h)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Time band-parallel window scaling against serial")
+    parser.add_argument("--window", type=_size, default=(2560, 1440), help="window size, WxH")
+    parser.add_argument("--base", type=_size, default=(640, 360), help="base frame size, WxH")
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--frames", type=int, default=60)
+    args = parser.parse_args(argv)
+    serial, banded, same = benchmark(args.window, args.base, args.threads, args.frames)
+    print(f"{args.base[0]}x{args.base[1]} -> {args.window[0]}x{args.window[1]},"
+          f" {args.threads} threads ({os.cpu_count()} cores)")
+    print(f"serial {serial:.2f}ms  banded {banded:.2f}ms  speedup {serial / banded:.2f}x"
+          f"  output {'identical' if same else 'DIFFERS'}")
+
+
+if __name__ == "__main__":
+    main()
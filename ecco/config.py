@@ -8,19 +8,44 @@ TITLE = "Sea Turtle Echo - Deep Dive"
 DEFAULT_W, DEFAULT_H = 1280, 720
 SCALE = 4
 FPS = 60
+IDLE_FPS = 15  # Wake-up rate for menus, pause and game over; input wakes them at once
 
 # Gameplay pacing
 # Each environment lasts this many seconds before switching
 ENV_DURATION_SEC = 90.0
 # Music fade in/out duration when switching environments (ms)
 MUSIC_FADE_MS = 4000
+# Start decoding the next environment's track this many seconds before the switch
+MUSIC_PREFETCH_SEC = 20.0
+# Layer the music live from looping stems (bass, lead, pad, drums) rendered
+# once per tempo group; False plays one whole track per environment
+MUSIC_STEMS = True
+# Tempo (bpm) of each group's stems; environments pick a group and layers in sound.py
+MUSIC_TEMPOS = {"surface": 120, "reef": 95, "deep": 65}
+# How long a layer takes to come in or drop out, e.g. for a power-up (ms)
+MUSIC_LAYER_FADE_MS = 1500
 # Constant ocean current that pushes floating objects left (px/sec)
 CURRENT_DRIFT_SPEED = 30
 
 # Visual toggles
 ENABLE_CRT = False  # Set True for scanline overlay
+ENABLE_VIGNETTE = False  # Darken the screen corners
+ENABLE_LIGHTING = True  # Darkness and glowing creatures on the ocean floor and at the oil rig
+POWERUP_TINT = None  # (r, g, b, alpha) screen wash while powered up, e.g. (255, 200, 100, 24)
+# How the low-res frame reaches the window: stretch, integer, scale2x, scale3x
+PRESENT_MODE = "stretch"
+DISPLAY_BACKEND = "software"  # "software" (CPU scaling) or "scaled" (SDL scaling + vsync)
+# Software backend: scale to the window in horizontal bands on this many
+# threads (0 = off, None = one per core); helps large windows on multi-core CPUs
+RENDER_THREADS = 0
+# Draw the background before reading the keyboard, so input that arrives
+# meanwhile still reaches this frame (F4 toggles, F12 measures latency)
+LATE_INPUT = False
 ENABLE_CAUSTICS = True
 CAUSTICS_BRIGHTNESS = 40  # 0-255 alpha for caustics overlay
+INDEXED_COLOR = False  # 8-bit palettized base surface; caustics animate by palette cycling
+# Drop (and later restore) detail when frames take longer than the FPS budget
+ENABLE_QUALITY_GOVERNOR = True
 
 # Background tracks for each environment
 MUSIC_BEACH_FILE = ASSET_DIR / 'music_beach.wav'
@@ -28,6 +53,8 @@ MUSIC_CORAL_FILE = ASSET_DIR / 'music_coral.wav'
 MUSIC_REEF_FILE = ASSET_DIR / 'music_reef.wav'
 MUSIC_OCEAN_FILE = ASSET_DIR / 'music_ocean.wav'
 MUSIC_RIG_FILE = ASSET_DIR / 'music_rig.wav'
+# Generated stems, one file per tempo group, tempo and stem
+MUSIC_STEM_DIR = ASSET_DIR / 'stems'
 SFX_EAT_FILE = ASSET_DIR / 'sfx_eat_synth.wav'
 SFX_HURT_FILE = ASSET_DIR / 'sfx_hurt_synth.wav'
 SFX_DASH_FILE = ASSET_DIR / 'sfx_dash_synth.wav'
@@ -39,6 +66,50 @@ AMBIENT_GULLS_FILE = ASSET_DIR / 'ambient_gulls.wav'
 AMBIENT_HUM_FILE = ASSET_DIR / 'ambient_hum.wav'
 
 SAVE_FILE = DATA_DIR / 'tide_highscore.json'
+# Runs, per-character bests and per-environment stats (SQLite)
+STORE_FILE = DATA_DIR / 'ecco_store.sqlite3'
+# How long the store's writer thread batches writes before committing (seconds)
+STORE_FLUSH_SEC = 1.0
+# Resolved system font files, so launches after the first skip the font scan
+FONT_CACHE_FILE = DATA_DIR / 'font_cache.json'
+
+# Per-frame session telemetry (summarise with: python -m ecco.telemetry)
+ENABLE_TELEMETRY = False
+TELEMETRY_DIR = DATA_DIR / 'telemetry'
+# Frames the ring buffer holds between flushes of the writer thread
+TELEMETRY_CAPACITY = 4096
+TELEMETRY_FLUSH_SEC = 2.0
+# F10 captures this many seconds of cProfile + tracemalloc data here
+PROFILE_DIR = DATA_DIR / 'profiles'
+PROFILE_CAPTURE_SEC = 5.0
+# Seconds of play kept for rewinding (hold Backspace), and the F5/F6 quicksave
+REWIND_SECONDS = 10.0
+QUICKSAVE_FILE = DATA_DIR / 'quicksave.bin'
+
+# Audio device setup: "low-latency", "balanced" or "power-saving" (see ecco.audio)
+AUDIO_PROFILE = "balanced"
+# Keep synthesized music stems and ambient loops as WAV files in the mixer's
+# format, so later launches load them instead of rendering again
+AUDIO_CACHE = True
+# Fingerprints of the audio generators' expected output (python -m ecco.synthcheck)
+AUDIO_GOLDEN_FILE = BASE_PATH / 'ecco' / 'audio_golden.json'
+
+# Startup
+# Init only the pygame modules in use and load non-menu assets after the menu shows
+FAST_START = True
+# Print a phase-by-phase time-to-first-frame breakdown on launch
+STARTUP_REPORT = False
+
+# Random event rates, in events per second of game time
+JELLY_SPAWN_RATE = 0.18
+JELLY_SPAWN_RATE_PER_POINT = 0.003   # Extra jellies per second per point scored
+JELLY_SPAWN_RATE_MAX_BONUS = 0.6
+BAG_SPAWN_RATE = 0.12
+BAG_SPAWN_RATE_PER_POINT = 0.0018
+BAG_SPAWN_RATE_MAX_BONUS = 0.48
+CREATURE_SPAWN_RATE = 0.24
+MANTIS_PUNCH_RATE = 0.3
+PUFFER_PUFF_RATE = 0.18
 
 POWERUP_THRESHOLD = 15
 POWERUP_DURATION = 10.0
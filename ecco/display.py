@@ -0,0 +1,155 @@
+import statistics
+import time
+from collections import deque
+
+import pygame
+
+from .config import FPS
+from .surfaces import reconvert_all
+
+######################################################################
+# Display backends and frame pacing
+######################################################################
+
+# software - window-sized display surface; Presenter scales the base surface
+#            on the CPU and clock.tick(FPS) paces frames
+# scaled   - during gameplay the display surface *is* the base resolution
+#            (pygame SCALED); SDL uploads that small surface, scales it on
+#            the GPU and flip() waits for vblank when vsync is available
+DISPLAY_BACKENDS = ("software", "scaled")
+
+
+class FramePacing:
+    """
+    Flip-to-flip intervals over the last `window` frames.
+
+    jitter is the standard deviation of the interval; a frame that took
+    more than one refresh interval counts the vblanks it skipped as missed.
+    """
+
+    def __init__(self, target_fps=FPS, window=240):
+        self.target_ms = 1000.0 / target_fps
+        self.intervals = deque(maxlen=window)
+        self._last = None
+
+    def mark(self):
+        now = time.perf_counter()
+        if self._last is not None:
+            self.intervals.append((now - self._last) * 1000.0)
+        self._last = now
+
+    def reset(self):
+        """Forget the last flip, e.g. after a pause, so the gap isn't counted."""
+        self._last = None
+
+    def mean_ms(self):
+        return statistics.fmean(self.intervals) if self.intervals else 0.0
+
+    def jitter_ms(self):
+        return statistics.pstdev(self.intervals) if len(self.intervals) > 1 else 0.0
+
+    def missed_vblanks(self):
+        return sum(max(0, round(ms / self.target_ms) - 1) for ms in self.intervals)
+
+    def report(self):
+        if not self.intervals:
+            return "Pacing: no samples"
+        return (f"Pacing: {self.mean_ms():.2f}ms ±{self.jitter_ms():.2f} "
+                f"worst {max(self.intervals):.1f} missed {self.missed_vblanks()}"
+                f"/{len(self.intervals)}")
+
+
+def _refresh_rate():
+    try:
+        return pygame.display.get_current_refresh_rate() or FPS
+    except (AttributeError, pygame.error):
+        return FPS
+
+
+class Display:
+    """
+    Owns the window for one of DISPLAY_BACKENDS.
+
+    Menus always get a window-sized surface from window(). game() switches
+    to the backend's gameplay surface: unchanged for "software", a
+    base-sized SDL-scaled surface for "scaled". If SDL cannot create the
+    scaled renderer the display falls back to "software" for good. Cached
+    surfaces are reconverted whenever a new mode changes the pixel format.
+    """
+
+    def __init__(self, backend="software"):
+        self.backend = backend if backend in DISPLAY_BACKENDS else "software"
+        self.scaled = False
+        self.vsync = False
+        self.fullscreen = False
+        self.screen = None
+        self.window_size = None
+        self.pacing = FramePacing()
+        self._vsync_checked = False
+
+    def window(self, size):
+        """Plain window-sized display surface (menus, and the software backend)."""
+        self.window_size = size
+        if self.fullscreen:
+            self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        else:
+            self.screen = pygame.display.set_mode(size, pygame.RESIZABLE)
+        reconvert_all()
+        self.scaled = False
+        self.vsync = False
+        self.pacing = FramePacing()
+        return self.screen
+
+    def game(self, base_size):
+        """Display surface to present gameplay frames of base_size on."""
+        if self.backend != "scaled":
+            return self.screen
+        flags = pygame.SCALED | (pygame.FULLSCREEN if self.fullscreen else pygame.RESIZABLE)
+        for vsync in (1, 0):
+            try:
+                self.screen = pygame.display.set_mode(base_size, flags, vsync=vsync)
+            except pygame.error:
+                continue
+            reconvert_all()
+            self.scaled = True
+            self.vsync = bool(vsync)
+            self._vsync_checked = False
+            self.pacing = FramePacing(_refresh_rate() if vsync else FPS)
+            return self.screen
+        # No renderer for SCALED on this driver: stay on the CPU path
+        self.backend = "software"
+        return self.window(self.window_size or base_size)
+
+    def toggle_fullscreen(self, size):
+        self.fullscreen = not self.fullscreen
+        if self.scaled:
+            try:
+                pygame.display.toggle_fullscreen()
+            except pygame.error:
+                # Not every driver can toggle in place; rebuild the window
+                return self.game(self.screen.get_size())
+            reconvert_all()
+            return self.screen
+        return self.window(size)
+
+    def frame_cap(self):
+        """FPS limit for clock.tick: none while vblank is pacing the frames."""
+        return 0 if self.vsync else FPS
+
+    def flip(self, paced=True):
+        pygame.display.flip()
+        if not paced:
+            self.pacing.reset()
+            return
+        self.pacing.mark()
+        # Some drivers accept vsync but never block on it; fall back to
+        # clock.tick pacing if flips come far faster than the refresh rate
+        if self.vsync and not self._vsync_checked and len(self.pacing.intervals) >= 60:
+            self._vsync_checked = True
+            if self.pacing.mean_ms() < self.pacing.target_ms * 0.5:
+                self.vsync = False
+                self.pacing = FramePacing(FPS)
+
+    def report(self):
+        mode = self.backend + (" vsync" if self.vsync else "")
+        return f"{mode} | {self.pacing.report()}"
@@ -2,6 +2,7 @@ import math
 import random
 import pygame
 from .config import ENABLE_CAUSTICS, CAUSTICS_BRIGHTNESS
+from .surfaces import SurfaceCache, COLORKEY
 
 class Environment:
     OCEAN_FLOOR = "Ocean Floor"
@@ -21,9 +22,12 @@ _BAYER4 = (
     (15, 7, 13,  5),
 )
 
-_tile_cache = {}
-_silhouette_cache = {}
-_caustics_cache = {}
+# Cached in the display's pixel format (see ecco.surfaces)
+_tile_cache = SurfaceCache()
+# Aliased shapes on clear: classify() would always say COLORKEY
+_silhouette_cache = SurfaceCache(COLORKEY)
+_caustics_cache = SurfaceCache()
+_gradient_cache = SurfaceCache()
 
 
 def _lerp(a, b, t):
@@ -48,6 +52,16 @@ def _dither_color(c1, c2, t, x, y):
     )
 
 
+# Per-environment tile colors: mid, dark, light
+_TILE_COLORS = {
+    Environment.ROCKY_REEF: ((58, 72, 84), (34, 42, 50), (116, 132, 148)),
+    Environment.CORAL_COVE: ((120, 70, 100), (80, 40, 60), (200, 120, 160)),
+    Environment.BEACH: ((196, 174, 132), (150, 126, 90), (220, 206, 170)),
+    Environment.OIL_RIG: ((70, 70, 75), (40, 40, 45), (110, 110, 120)),
+    Environment.OCEAN_FLOOR: ((30, 60, 70), (18, 36, 42), (70, 120, 130)),
+}
+
+
 def _make_tile(env_type, size=24):
     key = (env_type, size)
     if key in _tile_cache:
@@ -56,26 +70,7 @@ def _make_tile(env_type, size=24):
     surf = pygame.Surface((size, size), pygame.SRCALPHA)
     pa = pygame.PixelArray(surf)
 
-    if env_type == Environment.ROCKY_REEF:
-        c_mid = (58, 72, 84)
-        c_dark = (34, 42, 50)
-        c_light = (116, 132, 148)
-    elif env_type == Environment.CORAL_COVE:
-        c_mid = (120, 70, 100)
-        c_dark = (80, 40, 60)
-        c_light = (200, 120, 160)
-    elif env_type == Environment.BEACH:
-        c_mid = (196, 174, 132)
-        c_dark = (150, 126, 90)
-        c_light = (220, 206, 170)
-    elif env_type == Environment.OIL_RIG:
-        c_mid = (70, 70, 75)
-        c_dark = (40, 40, 45)
-        c_light = (110, 110, 120)
-    else:  # OCEAN_FLOOR
-        c_mid = (30, 60, 70)
-        c_dark = (18, 36, 42)
-        c_light = (70, 120, 130)
+    c_mid, c_dark, c_light = _TILE_COLORS.get(env_type, _TILE_COLORS[Environment.OCEAN_FLOOR])
 
     # Base with dithered gradient
     for y in range(size):
@@ -101,13 +96,31 @@ def _make_tile(env_type, size=24):
         pygame.draw.circle(surf, c_dark, (rx+1, ry+1), r, 1)
 
     _tile_cache[key] = surf
-    return surf
+    return _tile_cache[key]
+
+
+# Rows of the caustics pattern computed per build step
+_CAUSTICS_BAND_ROWS = 16
+
+
+def _finish(steps):
+    """Run a stepwise build (see prewarm_tasks) straight through."""
+    for _ in steps:
+        pass
 
 
 def _get_silhouette_layer(w, h, env_type, seed, color=(0, 40, 50), alpha=90):
+    key = (env_type, w, h, seed, color, alpha)
+    if key not in _silhouette_cache:
+        _finish(_build_silhouette_layer(w, h, env_type, seed, color, alpha))
+    return _silhouette_cache[key]
+
+
+def _build_silhouette_layer(w, h, env_type, seed, color=(0, 40, 50), alpha=90):
+    """Draws the layer, then (the costly part at large sizes) converts it."""
     key = (env_type, w, h, seed, color, alpha)
     if key in _silhouette_cache:
-        return _silhouette_cache[key]
+        return
 
     s = pygame.Surface((w, h), pygame.SRCALPHA)
     rng = random.Random(seed)
@@ -129,33 +142,54 @@ def _get_silhouette_layer(w, h, env_type, seed, color=(0, 40, 50), alpha=90):
         x = rng.randrange(0, w)
         y = h - rng.randrange(30, 80)
         pygame.draw.ellipse(s, color, (x-40, y-20, 80, 40))
+    yield
 
     s.set_alpha(alpha)
     _silhouette_cache[key] = s
-    return s
 
 
 def _get_caustics(size=128):
+    if size not in _caustics_cache:
+        _finish(_build_caustics(size))
+    return _caustics_cache[size]
+
+
+def _build_caustics(size=128):
+    """Computes the pattern _CAUSTICS_BAND_ROWS rows per step."""
     if size in _caustics_cache:
-        return _caustics_cache[size]
+        return
     s = pygame.Surface((size, size), pygame.SRCALPHA)
-    px = pygame.PixelArray(s)
-    for y in range(size):
-        for x in range(size):
-            v = (
-                math.sin((x*0.17) + (y*0.11)) +
-                math.sin((x*0.07) - (y*0.19)) +
-                math.sin((x*0.13) + (y*0.05))
-            )
-            # Normalize to 0..1
-            v = (v + 3) / 6.0
-            # Low-intensity bluish highlight pattern (prevents overbright washout)
-            intensity = int(40 + v*40)  # 40..80
-            px[x, y] = s.map_rgb((int(intensity*0.3), int(intensity*0.5), intensity))
-    del px
+    for top in range(0, size, _CAUSTICS_BAND_ROWS):
+        px = pygame.PixelArray(s)
+        for y in range(top, min(size, top + _CAUSTICS_BAND_ROWS)):
+            for x in range(size):
+                v = (
+                    math.sin((x*0.17) + (y*0.11)) +
+                    math.sin((x*0.07) - (y*0.19)) +
+                    math.sin((x*0.13) + (y*0.05))
+                )
+                # Normalize to 0..1
+                v = (v + 3) / 6.0
+                # Low-intensity bluish highlight pattern (prevents overbright washout)
+                intensity = int(40 + v*40)  # 40..80
+                px[x, y] = s.map_rgb((int(intensity*0.3), int(intensity*0.5), intensity))
+        del px
+        yield
     s.set_alpha(max(0, min(255, CAUSTICS_BRIGHTNESS)))
     _caustics_cache[size] = s
-    return s
+
+
+# Per-environment backdrop: gradient top, gradient bottom, silhouette color
+_BACKDROPS = {
+    Environment.OCEAN_FLOOR: ((6, 30, 40), (2, 14, 18), (10, 40, 48)),
+    Environment.ROCKY_REEF: ((12, 36, 50), (4, 16, 24), (14, 60, 70)),
+    Environment.CORAL_COVE: ((30, 40, 70), (20, 20, 40), (60, 40, 70)),
+    Environment.BEACH: ((40, 110, 150), (20, 60, 100), (30, 90, 120)),
+    Environment.OIL_RIG: ((12, 16, 22), (6, 10, 14), (20, 26, 34)),
+}
+
+# Parallax silhouette layers, back to front: (seed, alpha, scroll factor)
+_PARALLAX_LAYERS = ((1, 60, 0.2), (2, 90, 0.4))
 
 
 def _fill_vertical_gradient(surf, top, bottom):
@@ -170,44 +204,50 @@ def _fill_vertical_gradient(surf, top, bottom):
         pygame.draw.line(surf, col, (0, y), (w, y))
 
 
-def draw_environment(surf, env_type, offset, time_val):
+def _get_gradient(w, h, top, bottom):
+    key = (w, h, top, bottom)
+    if key not in _gradient_cache:
+        s = pygame.Surface((w, h))
+        _fill_vertical_gradient(s, top, bottom)
+        _gradient_cache[key] = s
+    return _gradient_cache[key]
+
+
+def draw_environment(surf, env_type, offset, time_val, caustics=ENABLE_CAUSTICS, parallax_layers=2):
+    w, h = surf.get_width(), surf.get_height()
+
+    # Background gradient per environment (deep water look), one row-by-row
+    # draw per size instead of every frame
+    top, bottom, sil_color = _BACKDROPS.get(env_type, _BACKDROPS[Environment.OIL_RIG])
+    surf.blit(_get_gradient(w, h, top, bottom), (0, 0))
+
+    # Parallax silhouettes (up to two layers; the back one is dropped first)
+    for seed, alpha, factor in _PARALLAX_LAYERS[len(_PARALLAX_LAYERS) - parallax_layers:]:
+        layer = _get_silhouette_layer(w, h, env_type, seed=seed, color=sil_color, alpha=alpha)
+        # Parallax scroll slower than world
+        lx = int(-offset * factor) % w
+        surf.blit(layer, (lx - w, 0))
+        surf.blit(layer, (lx, 0))
+
+    y_start = _draw_tile_belt(surf, _make_tile(env_type, 24), offset)
+    _draw_props(surf, env_type, offset, time_val, y_start)
+
+    # Water caustics overlay (moving) — guarded and alpha blended
+    if caustics:
+        ca = _get_caustics(128)
+        cx = int(time_val * 0.06) % ca.get_width()
+        cy = int(time_val * 0.04) % ca.get_height()
+        for y in range(-cy, h, ca.get_height()):
+            for x in range(-cx, w, ca.get_width()):
+                surf.blit(ca, (x, y))
+
+
+def _draw_tile_belt(surf, tile, offset, rows=4):
+    """Midground tiled texture for 16-bit look; returns the belt's top y."""
     w, h = surf.get_width(), surf.get_height()
-    surf.fill((0, 0, 0))
-
-    # Background gradient per environment (deep water look)
-    if env_type == Environment.OCEAN_FLOOR:
-        _fill_vertical_gradient(surf, (6, 30, 40), (2, 14, 18))
-        sil_color = (10, 40, 48)
-    elif env_type == Environment.ROCKY_REEF:
-        _fill_vertical_gradient(surf, (12, 36, 50), (4, 16, 24))
-        sil_color = (14, 60, 70)
-    elif env_type == Environment.CORAL_COVE:
-        _fill_vertical_gradient(surf, (30, 40, 70), (20, 20, 40))
-        sil_color = (60, 40, 70)
-    elif env_type == Environment.BEACH:
-        _fill_vertical_gradient(surf, (40, 110, 150), (20, 60, 100))
-        sil_color = (30, 90, 120)
-    else:  # OIL_RIG
-        _fill_vertical_gradient(surf, (12, 16, 22), (6, 10, 14))
-        sil_color = (20, 26, 34)
-
-    # Parallax silhouettes (two layers)
-    back = _get_silhouette_layer(w, h, env_type, seed=1, color=sil_color, alpha=60)
-    mid = _get_silhouette_layer(w, h, env_type, seed=2, color=sil_color, alpha=90)
-    # Parallax scroll slower than world
-    bx = int(-offset * 0.2) % w
-    mx = int(-offset * 0.4) % w
-    surf.blit(back, (bx - w, 0))
-    surf.blit(back, (bx, 0))
-    surf.blit(mid, (mx - w, 0))
-    surf.blit(mid, (mx, 0))
-
-    # Midground tiled texture for 16-bit look
-    tile = _make_tile(env_type, 24)
     tw, th = tile.get_width(), tile.get_height()
 
     # Draw a belt of tiles across bottom third
-    rows = 4
     y_start = h - rows * th
     ox = int(-offset) % tw
     for r in range(rows):
@@ -216,8 +256,12 @@ def draw_environment(surf, env_type, offset, time_val):
             surf.blit(tile, (x + ox, y))
         # Bevel shadow between rows for depth
         pygame.draw.line(surf, (0, 0, 0), (0, y), (w, y), 1)
+    return y_start
 
-    # Environment-specific overlays
+
+def _draw_props(surf, env_type, offset, time_val, y_start):
+    """Environment-specific overlays: kelp or oil rig struts."""
+    w, h = surf.get_width(), surf.get_height()
     if env_type in (Environment.OCEAN_FLOOR, Environment.ROCKY_REEF, Environment.CORAL_COVE):
         # Kelp foreground vines
         rng = random.Random(999)
@@ -235,11 +279,261 @@ def draw_environment(surf, env_type, offset, time_val):
             for y in range(40, h, 48):
                 pygame.draw.line(surf, (70, 70, 80), (dx - 24, y), (dx + 24, y - 24), 2)
 
-    # Water caustics overlay (moving) — guarded and alpha blended
-    if ENABLE_CAUSTICS:
-        ca = _get_caustics(128)
-        cx = int(time_val * 0.06) % ca.get_width()
-        cy = int(time_val * 0.04) % ca.get_height()
-        for y in range(-cy, h, ca.get_height()):
-            for x in range(-cx, w, ca.get_width()):
-                surf.blit(ca, (x, y))
+
+######################################################################
+# Indexed-color (8-bit) renderer
+######################################################################
+#
+# Palette layout, per environment:
+#   water       _WATER_SHADES gradient steps x _WATER_PHASES caustic phases
+#   silhouettes one gradient ramp per parallax layer
+#   fixed       tile / prop colors, the caller's sprite colors, a color cube
+#   GLOW_INDEX  one entry the caller can pulse (power-up glow)
+#
+# Open water is baked once per size into a surface of water indices: the
+# row picks the (dithered) gradient shade and a caustic field picks the
+# phase. Rotating which phase is bright, by swapping in one of a few
+# precomputed palettes, animates the caustics without touching a pixel.
+
+_WATER_SHADES = 10
+_WATER_PHASES = 10
+_SIL_BASE = _WATER_SHADES * _WATER_PHASES
+_FIXED_BASE = _SIL_BASE + _WATER_SHADES * len(_PARALLAX_LAYERS)
+GLOW_INDEX = 255
+# Index the baked silhouette layers use for "transparent"
+_CLEAR_INDEX = 0
+# Caustic phases advanced per millisecond
+_CAUSTIC_ROTATE = 0.006
+
+_palette_cache = {}
+_indexed_water_cache = {}
+_indexed_silhouette_cache = {}
+_indexed_tile_cache = {}
+# Byte translation tables adding a constant to every index
+_add_tables = {}
+_caustic_phase_rows = []
+
+
+def _caustic_value(x, y):
+    """The caustics pattern of _get_caustics() at (x, y), in 0..1."""
+    v = (math.sin((x*0.17) + (y*0.11)) +
+         math.sin((x*0.07) - (y*0.19)) +
+         math.sin((x*0.13) + (y*0.05)))
+    return (v + 3) / 6.0
+
+
+def _dithered_shade(x, y, h):
+    t = y / max(1, h - 1) * (_WATER_SHADES - 1)
+    shade = int(t)
+    if t - shade > _BAYER4[y % 4][x % 4] / 16.0:
+        shade += 1
+    return min(shade, _WATER_SHADES - 1)
+
+
+def _add_table(k):
+    if k not in _add_tables:
+        _add_tables[k] = bytes((i + k) & 255 for i in range(256))
+    return _add_tables[k]
+
+
+def _shade_rows(w, h, base=0):
+    """
+    For each row y, base + _dithered_shade(x, y, h) across the row as bytes.
+    The Bayer matrix repeats every 4 px, so each row is one 4-byte run.
+    """
+    return [(bytes(base + _dithered_shade(x, y, h) for x in range(4)) * (w // 4 + 1))[:w]
+            for y in range(h)]
+
+
+def _caustic_phases():
+    """Rows of the 128 px caustic field as phase numbers, built once."""
+    if not _caustic_phase_rows:
+        _caustic_phase_rows.extend(
+            bytes(int(_caustic_value(x, y) * _WATER_PHASES) % _WATER_PHASES for x in range(128))
+            for y in range(128))
+    return _caustic_phase_rows
+
+
+def _blend(a, b, t):
+    return (int(_lerp(a[0], b[0], t)), int(_lerp(a[1], b[1], t)), int(_lerp(a[2], b[2], t)))
+
+
+class IndexedPalette:
+    """
+    The 256 colors of one environment. frames[k] is the full palette with
+    caustic phase k brightest; plain has no caustics (low quality tiers).
+    """
+
+    def __init__(self, env_type, sprite_colors=()):
+        top, bottom, sil_color = _BACKDROPS.get(env_type, _BACKDROPS[Environment.OIL_RIG])
+        shades = [_blend(top, bottom, i / (_WATER_SHADES - 1)) for i in range(_WATER_SHADES)]
+
+        silhouettes = []
+        for _, alpha, _ in _PARALLAX_LAYERS:
+            silhouettes += [_blend(c, sil_color, alpha / 255.0) for c in shades]
+
+        c_mid, c_dark, c_light = _TILE_COLORS.get(env_type, _TILE_COLORS[Environment.OCEAN_FLOOR])
+        fixed = [(0, 0, 0), (255, 255, 255), c_mid, c_dark, c_light,
+                 _blend(c_mid, c_dark, 0.25), _blend(c_mid, c_dark, 0.75),
+                 tuple(max(0, c - 20) for c in c_dark), tuple(min(255, c + 20) for c in c_light),
+                 (40, 120, 70), (30, 90, 60), (80, 80, 90), (70, 70, 80)]
+        fixed += [tuple(c) for c in sprite_colors]
+        fixed += [(r, g, b) for r in (0, 128, 255) for g in (0, 128, 255) for b in (0, 128, 255)]
+        fixed += [(v, v, v) for v in range(32, 256, 32)]
+        fixed = list(dict.fromkeys(fixed))[:GLOW_INDEX - _FIXED_BASE]
+        fixed += [(0, 0, 0)] * (GLOW_INDEX - _FIXED_BASE - len(fixed))
+        self.tail = silhouettes + fixed + [(255, 200, 100)]
+
+        strength = max(0, min(255, CAUSTICS_BRIGHTNESS)) / 255.0
+        self.plain = [c for c in shades for _ in range(_WATER_PHASES)] + self.tail
+        self.frames = []
+        for k in range(_WATER_PHASES):
+            water = []
+            for c in shades:
+                for phase in range(_WATER_PHASES):
+                    bump = 0.5 + 0.5 * math.cos(math.tau * ((phase - k) % _WATER_PHASES) / _WATER_PHASES)
+                    i = 40 + bump * 40  # Same 40..80 highlight as _get_caustics
+                    water.append(_blend(c, (i * 0.3, i * 0.5, i), strength))
+            self.frames.append(water + self.tail)
+
+    def frame(self, time_val, caustics=True):
+        if not caustics:
+            return self.plain
+        return self.frames[int(time_val * _CAUSTIC_ROTATE) % _WATER_PHASES]
+
+
+def indexed_palette(env_type, sprite_colors=()):
+    key = (env_type, tuple(sprite_colors))
+    if key not in _palette_cache:
+        _palette_cache[key] = IndexedPalette(env_type, sprite_colors)
+    return _palette_cache[key]
+
+
+def _get_indexed_water(w, h, palette):
+    """
+    Water indices for a w x h surface. The indices are the same for every
+    environment; each palette gets its own copy so blits are straight copies.
+    """
+    key = (w, h, id(palette))
+    if key in _indexed_water_cache:
+        return _indexed_water_cache[key]
+    raw = _indexed_water_cache.get((w, h))
+    if raw is None:
+        # The caustic field repeats every 128 px like the RGB overlay, and
+        # the dither every 4, so each row is a 128 px run: the phase row
+        # with each of the 4 dithered shades added to its own columns
+        phases = _caustic_phases()
+        rows = []
+        for y in range(h):
+            phase, run = phases[y % 128], bytearray(128)
+            for x in range(4):
+                shade = _dithered_shade(x, y, h) * _WATER_PHASES
+                run[x::4] = phase[x::4].translate(_add_table(shade))
+            rows.append((bytes(run) * (w // 128 + 1))[:w])
+        raw = pygame.image.frombytes(b"".join(rows), (w, h), "P")
+        raw.set_palette(palette.plain)  # copy() needs one; each copy gets its own
+        _indexed_water_cache[(w, h)] = raw
+    s = raw.copy()
+    s.set_palette(palette.plain)
+    _indexed_water_cache[key] = s
+    return s
+
+
+def _get_indexed_silhouette(w, h, env_type, layer, palette):
+    """
+    A parallax layer as indices into its own gradient ramp. The layers only
+    scroll sideways, so each pixel's shade can be baked in by row.
+    """
+    key = (env_type, w, h, layer, id(palette))
+    if key in _indexed_silhouette_cache:
+        return _indexed_silhouette_cache[key]
+    seed, alpha, _ = _PARALLAX_LAYERS[layer]
+    sil_color = _BACKDROPS.get(env_type, _BACKDROPS[Environment.OIL_RIG])[2]
+    src = _get_silhouette_layer(w, h, env_type, seed=seed, color=sil_color, alpha=alpha)
+    # Any coverage (alpha may be baked in), as 0xFF / 0x00 bytes
+    mask = pygame.mask.from_surface(src, 0)
+    covered = pygame.image.tobytes(mask.to_surface(), "RGB")[0::3]
+    ramp = b"".join(_shade_rows(w, h, _SIL_BASE + layer * _WATER_SHADES))
+    # AND-ing the two as big integers leaves _CLEAR_INDEX (0) where uncovered
+    cut = (int.from_bytes(ramp, "big") & int.from_bytes(covered, "big")).to_bytes(w * h, "big")
+    s = pygame.image.frombytes(cut, (w, h), "P")
+    s.set_palette(palette.plain)
+    s.set_colorkey(_CLEAR_INDEX)
+    _indexed_silhouette_cache[key] = s
+    return s
+
+
+def _get_indexed_tile(env_type, palette, size=24):
+    key = (env_type, size, id(palette))
+    if key not in _indexed_tile_cache:
+        src = _make_tile(env_type, size)
+        lookup = pygame.Surface((1, 1), 0, 8)
+        lookup.set_palette(palette.plain)
+        # Mapped colour by colour: convert() to 8-bit goes through a coarse
+        # 3-3-2 lookup and misses the exact tile entries in the palette
+        rgb = pygame.image.tobytes(src, "RGB")
+        pixels = [rgb[i:i + 3] for i in range(0, len(rgb), 3)]
+        index = {c: lookup.map_rgb(tuple(c)) for c in set(pixels)}
+        tile = pygame.image.frombytes(bytes(index[c] for c in pixels), (size, size), "P")
+        tile.set_palette(palette.plain)
+        _indexed_tile_cache[key] = tile
+    return _indexed_tile_cache[key]
+
+
+def draw_environment_indexed(surf, env_type, offset, time_val, caustics=ENABLE_CAUSTICS,
+                             parallax_layers=2, sprite_colors=()):
+    """
+    draw_environment() for an 8-bit surface. Sets the surface's palette for
+    this frame; everything drawn afterwards in RGB maps to its nearest entry,
+    so sprite_colors should list the exact colors the sprites use.
+    """
+    w, h = surf.get_width(), surf.get_height()
+    palette = indexed_palette(env_type, sprite_colors)
+    # Cached layers share the plain palette with the target, so SDL copies
+    # their indices unchanged instead of remapping every pixel by color
+    surf.set_palette(palette.plain)
+
+    surf.blit(_get_indexed_water(w, h, palette), (0, 0))
+    first = len(_PARALLAX_LAYERS) - parallax_layers
+    for layer in range(first, len(_PARALLAX_LAYERS)):
+        sil = _get_indexed_silhouette(w, h, env_type, layer, palette)
+        lx = int(-offset * _PARALLAX_LAYERS[layer][2]) % w
+        surf.blit(sil, (lx - w, 0))
+        surf.blit(sil, (lx, 0))
+
+    y_start = _draw_tile_belt(surf, _get_indexed_tile(env_type, palette), offset)
+    _draw_props(surf, env_type, offset, time_val, y_start)
+
+    surf.set_palette(palette.frame(time_val, caustics))
+    # The glow entry pulses instead of the glow ring changing size
+    pulse = 0.5 + 0.5 * math.sin(time_val * 0.01)
+    surf.set_palette_at(GLOW_INDEX, _blend((255, 170, 60), (255, 235, 170), pulse))
+
+
+def prewarm_tasks(env_type, w, h, caustics=ENABLE_CAUSTICS, parallax_layers=2,
+                  indexed=False, sprite_colors=()):
+    """
+    (name, job) pairs for an IdleTaskQueue: each job builds one of the
+    cached surfaces draw_environment() (or draw_environment_indexed()) needs
+    for env_type at a w x h base size. Running them ahead of an environment
+    switch keeps the switch frame as cheap as any other. The costly builds
+    are generators that do a slice of the work per step.
+    """
+    if indexed:
+        first = len(_PARALLAX_LAYERS) - parallax_layers
+        palette = indexed_palette(env_type, sprite_colors)
+        tasks = [("indexed water", lambda: _get_indexed_water(w, h, palette)),
+                 ("indexed tile", lambda: _get_indexed_tile(env_type, palette))]
+        for layer in range(first, len(_PARALLAX_LAYERS)):
+            tasks.append(("indexed silhouette",
+                          lambda layer=layer: _get_indexed_silhouette(w, h, env_type, layer, palette)))
+        return tasks
+
+    top, bottom, sil_color = _BACKDROPS.get(env_type, _BACKDROPS[Environment.OIL_RIG])
+    tasks = [("gradient", lambda: _get_gradient(w, h, top, bottom)),
+             ("tile", lambda: _make_tile(env_type, 24))]
+    for seed, alpha, _ in _PARALLAX_LAYERS[len(_PARALLAX_LAYERS) - parallax_layers:]:
+        tasks.append(("silhouette", _build_silhouette_layer(w, h, env_type, seed, sil_color, alpha)))
+    if caustics:
+        tasks.append(("caustics", _build_caustics(128)))
+    return tasks
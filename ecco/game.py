@@ -3,16 +3,40 @@
 # Double-click to run (Python + Pygame required). First run generates music/SFX.
 # ------------------------------------------------------------
 
-import os, sys, math, random, time
+import os, sys, math, random, time, threading
 import pygame
 from pygame.locals import *
 
-from .config import (TITLE, DEFAULT_W, DEFAULT_H, SCALE, FPS,
-                     POWERUP_THRESHOLD, POWERUP_DURATION, SAVE_FILE,
-                     ENV_DURATION_SEC, MUSIC_FADE_MS, CURRENT_DRIFT_SPEED,
-                     ENABLE_CRT)
-from .environment import Environment, draw_environment
-from .sound import load_or_generate_audio, play_sfx, _sfx
+from .config import (TITLE, DEFAULT_W, DEFAULT_H, SCALE, FPS, IDLE_FPS,
+                     POWERUP_THRESHOLD, POWERUP_DURATION,
+                     ENV_DURATION_SEC, MUSIC_PREFETCH_SEC, CURRENT_DRIFT_SPEED,
+                     ENABLE_CRT, FAST_START, STARTUP_REPORT,
+                     JELLY_SPAWN_RATE, JELLY_SPAWN_RATE_PER_POINT, JELLY_SPAWN_RATE_MAX_BONUS,
+                     BAG_SPAWN_RATE, BAG_SPAWN_RATE_PER_POINT, BAG_SPAWN_RATE_MAX_BONUS,
+                     CREATURE_SPAWN_RATE, MANTIS_PUNCH_RATE, PUFFER_PUFF_RATE,
+                     ENABLE_QUALITY_GOVERNOR, PRESENT_MODE, ENABLE_VIGNETTE, POWERUP_TINT,
+                     DISPLAY_BACKEND, ENABLE_TELEMETRY, REWIND_SECONDS, QUICKSAVE_FILE,
+                     INDEXED_COLOR, LATE_INPUT, AUDIO_PROFILE, MUSIC_STEMS, ENABLE_LIGHTING,
+                     RENDER_THREADS)
+from .environment import (Environment, draw_environment, draw_environment_indexed,
+                          prewarm_tasks, GLOW_INDEX)
+from .sound import (load_or_generate_audio, resolve_music_map, play_sfx, _sfx,
+                    MusicDeck, StemDeck)
+from .startup import StartupTimer, init_pygame, load_font
+from .store import ScoreStore
+from .scheduler import EventScheduler, IdleTaskQueue, poisson_interval
+from .quality import QualityGovernor
+from .present import Presenter
+from .display import Display
+from .postfx import PostPipeline, ScanlineStage, VignetteStage, FlashStage, TintStage
+from .telemetry import TelemetryRecorder, FLAG_MUSIC_TRANSITION, FLAG_QUALITY_CHANGE
+from .profiling import ProfileCapture
+from .snapshot import SnapshotCodec, RewindBuffer, save_snapshot, load_snapshot
+from .surfaces import render_text
+from .latency import LatencyProbe
+from .audio import audio_profile, pre_init_mixer, init_mixer
+from .lighting import LightMap
+from .bands import BandScaler
 
 
 # Graceful message if pygame isn't installed
@@ -23,6 +47,40 @@ def _msgbox(title, text):
     except Exception:
         print(f"{title}: {text}")
 
+# Internal resolution divisor; the quality governor may raise it at runtime
+_render_scale = SCALE
+# Window size in pixels, kept up to date by run() (and set directly by ecco.sim)
+_window_size = (DEFAULT_W, DEFAULT_H)
+
+def _base_size():
+    return _window_size[0] // _render_scale, _window_size[1] // _render_scale
+
+# Colours the sprites and HUD draw with; in INDEXED_COLOR mode each gets an
+# exact palette entry so it doesn't snap to the nearest water shade
+INDEXED_SPRITE_COLORS = (
+    (255, 200, 100), (10, 20, 16), (255, 80, 40), (90, 60, 40), (70, 70, 110),
+    (60, 180, 160), (255, 160, 20), (255, 140, 0), (255, 130, 70), (240, 220, 200),
+    (200, 60, 50), (20, 40, 30), (180, 180, 80), (170, 170, 70), (150, 150, 50),
+    (200, 200, 100), (255, 255, 100), (231, 192, 255), (250, 240, 255), (216, 172, 240),
+    (60, 40, 80), (235, 245, 255), (215, 225, 235), (150, 200, 220), (50, 100, 150),
+    (8, 22, 44), (0, 200, 100), (100, 200, 255), (255, 100, 50), (255, 150, 90),
+    (255, 210, 120), (255, 220, 140), (255, 240, 180), (200, 170, 100), (80, 90, 100),
+    # Turtle shells, bodies and accents
+    (18, 102, 85), (32, 140, 110), (190, 235, 210), (102, 18, 85), (140, 32, 110),
+    (235, 190, 220), (240, 220, 70), (235, 235, 235), (120, 75, 160), (92, 64, 35),
+    (115, 80, 44), (140, 120, 80), (230, 240, 230),
+    # HUD text
+    (220, 255, 255), (180, 230, 255), (180, 220, 240), (200, 180, 255), (240, 90, 100),
+    (255, 100, 100), (255, 220, 220), (230, 230, 240), (210, 240, 250), (100, 100, 100),
+)
+
+
+def make_base(w, h):
+    """The low-res surface a frame is drawn on (8-bit in INDEXED_COLOR mode)."""
+    if INDEXED_COLOR:
+        return pygame.Surface((w, h), 0, 8)
+    return pygame.Surface((w, h))
+
 # ----------------------- Character Types ----------------------
 class CharacterType:
     MALE_TURTLE = "Male Sea Turtle"
@@ -32,6 +90,13 @@ class CharacterType:
 
 # ----------------------- Game Objects ----------------------
 class Turtle:
+    # Mutable state saved by ecco.snapshot; colours etc. follow the character
+    snapshot_fields = (("x", "d"), ("y", "d"), ("vx", "d"), ("vy", "d"), ("angle", "d"),
+                       ("speed", "d"), ("cooldown", "d"), ("health", "h"), ("has_moved", "?"),
+                       ("death_timer", "d"), ("iframes", "d"), ("mouth_timer", "d"),
+                       ("swim_animation", "d"), ("jellyfish_eaten", "h"), ("powered_up", "?"),
+                       ("powerup_timer", "d"))
+
     def __init__(self, x, y, character_type=CharacterType.MALE_TURTLE):
         self.x, self.y = float(x), float(y)
         self.vx, self.vy = 0.0, 0.0
@@ -139,8 +204,7 @@ class Turtle:
         self.y += self.vy * dt_sec
         
         # Get current screen dimensions
-        base_w = pygame.display.get_surface().get_width() // SCALE
-        base_h = pygame.display.get_surface().get_height() // SCALE
+        base_w, base_h = _base_size()
         
         # Constrain to screen (no wrap in side-scroller)
         self.x = max(self.radius, min(base_w - self.radius, self.x))
@@ -169,8 +233,12 @@ class Turtle:
         
         # Power-up glow effect
         if self.powered_up:
-            glow_r = r + 5 + int(math.sin(pygame.time.get_ticks() * 0.01) * 2)
-            pygame.draw.circle(surf, (255, 200, 100), (cx, cy), glow_r, 2)
+            if surf.get_bitsize() == 8:
+                # The palette entry pulses (see draw_environment_indexed)
+                pygame.draw.circle(surf, GLOW_INDEX, (cx, cy), r + 5, 2)
+            else:
+                glow_r = r + 5 + int(math.sin(pygame.time.get_ticks() * 0.01) * 2)
+                pygame.draw.circle(surf, (255, 200, 100), (cx, cy), glow_r, 2)
 
         flipper_color = self.shell_color
         head_color = self.accent_color
@@ -237,7 +305,45 @@ class Turtle:
             my = cy + int(math.sin(math.radians(self.angle)) * r * 1.5)
             pygame.draw.circle(surf, (255, 255, 255), (mx, my), 2)
 
-class Jelly:
+class Entity:
+    """
+    Off-screen level of detail shared by the floating entities. While an
+    entity is still beyond the right edge it only drifts in a straight line;
+    the animation phases it skipped are caught up in one step when it comes
+    into view.
+    """
+    extent = 10         # Reach of the drawn sprite from (x, y), for culling
+    drift_factor = 1.0  # Share of the ocean current that carries it left
+    light = None        # (radius, (r, g, b), (dx, dy)) it casts in the dark
+    dormant_sec = 0.0
+    # (attribute, struct code) pairs saved by ecco.snapshot
+    snapshot_fields = (("x", "d"), ("y", "d"), ("r", "h"), ("dormant_sec", "d"))
+
+    def drift_velocity(self, scroll_speed):
+        return -scroll_speed * self.drift_factor
+
+    def drift(self, dt, scroll_speed):
+        dt_sec = dt / 1000.0
+        self.x += self.drift_velocity(scroll_speed) * dt_sec
+        self.dormant_sec += dt_sec
+
+    def wake(self):
+        if self.dormant_sec:
+            self.advance_phase(self.dormant_sec)
+            self.dormant_sec = 0.0
+
+    def advance_phase(self, sec):
+        pass
+
+# Fields shared by the edible creatures
+_CREATURE_FIELDS = Entity.snapshot_fields + (("edible", "?"), ("value", "h"))
+
+class Jelly(Entity):
+    extent = 16
+    drift_factor = 0.5
+    light = (10, (120, 80, 200), (0, -2))
+    snapshot_fields = Entity.snapshot_fields + (("phase", "d"), ("speed", "d"), ("value", "h"))
+
     def __init__(self, x, y):
         self.x, self.y = float(x), float(y)
         self.r = 6 + random.randint(0, 2)
@@ -245,6 +351,9 @@ class Jelly:
         self.speed = 0.5 + random.random() * 0.5
         self.value = 1  # Score value
 
+    def advance_phase(self, sec):
+        self.phase += self.speed * sec * 2
+
     def update(self, dt, scroll_speed):
         dt_sec = dt / 1000.0
         self.y += math.sin(self.phase) * 30 * dt_sec
@@ -253,7 +362,7 @@ class Jelly:
         self.x -= scroll_speed * dt_sec * 0.5
         self.phase += self.speed * dt_sec * 2
         
-        base_h = pygame.display.get_surface().get_height() // SCALE
+        base_h = _base_size()[1]
         
         # Wrap vertically
         if self.y < 0: self.y = base_h
@@ -276,13 +385,20 @@ class Jelly:
             tx_end = tx + int(tentacle_wave * 0.5)
             pygame.draw.line(surf, (216, 172, 240), (tx, ty_start), (tx_end, ty_end), 1)
 
-class PlasticBag:
+class PlasticBag(Entity):
+    extent = 12
+    drift_factor = 0.7
+    snapshot_fields = Entity.snapshot_fields + (("swing", "d"), ("speed", "d"))
+
     def __init__(self, x, y):
         self.x, self.y = float(x), float(y)
         self.r = 7
         self.swing = random.random() * math.tau
         self.speed = 0.3 + random.random() * 0.3
 
+    def advance_phase(self, sec):
+        self.swing += self.speed * sec * 2
+
     def update(self, dt, scroll_speed):
         dt_sec = dt / 1000.0
         # Sway with currents while drifting left with the level
@@ -291,7 +407,7 @@ class PlasticBag:
         self.y += math.sin(self.swing) * 10 * dt_sec
         self.swing += self.speed * dt_sec * 2
         
-        base_h = pygame.display.get_surface().get_height() // SCALE
+        base_h = _base_size()[1]
         
         if self.y < 0: self.y = base_h
         if self.y > base_h: self.y = 0
@@ -313,27 +429,45 @@ class PlasticBag:
         pygame.draw.line(surf, bag_color, (cx+1, cy-3), (cx+3, cy+3), 1)
 
 # New creature classes
-class MantisShrimp:
+class MantisShrimp(Entity):
+    simple_color = (255, 130, 70)  # Flat color for the low-quality tier
+    extent = 17
+    drift_factor = 0.8
+    snapshot_fields = _CREATURE_FIELDS + (("direction", "h"), ("speed", "d"),
+                                         ("punch_timer", "d"), ("next_punch", "d"))
+
     def __init__(self, x, y):
         self.x, self.y = float(x), float(y)
         self.r = 8
         self.direction = 1 if random.random() > 0.5 else -1
         self.speed = 1.5
         self.punch_timer = 0.0
+        self.next_punch = poisson_interval(MANTIS_PUNCH_RATE)
         self.edible = True
         self.value = 5  # Worth more points when eaten
 
+    def drift_velocity(self, scroll_speed):
+        return self.direction * self.speed * 30 - scroll_speed * self.drift_factor
+
+    def advance_phase(self, sec):
+        self.punch_timer = max(0.0, self.punch_timer - sec)
+        self.next_punch -= sec
+        if self.next_punch <= 0:
+            self.next_punch = poisson_interval(MANTIS_PUNCH_RATE)
+
     def update(self, dt, scroll_speed):
         dt_sec = dt / 1000.0
         self.x += self.direction * self.speed * 30 * dt_sec
         self.x -= scroll_speed * dt_sec * 0.8
         
-        # Random punching animation
-        if random.random() < 0.005:
+        # Random punching animation (Poisson timer, independent of FPS)
+        self.next_punch -= dt_sec
+        if self.next_punch <= 0:
             self.punch_timer = 0.3
+            self.next_punch += poisson_interval(MANTIS_PUNCH_RATE)
         self.punch_timer = max(0.0, self.punch_timer - dt_sec)
         
-        base_h = pygame.display.get_surface().get_height() // SCALE
+        base_h = _base_size()[1]
         # Bounce off top and bottom
         if self.y < 20 or self.y > base_h - 20:
             self.direction *= -1
@@ -368,7 +502,12 @@ class MantisShrimp:
         pygame.draw.circle(surf, (0, 200, 100), (cx + 2, cy - 4), 2)
         pygame.draw.circle(surf, (0, 200, 100), (cx - 2, cy - 4), 2)
 
-class SeaHorse:
+class SeaHorse(Entity):
+    simple_color = (255, 200, 100)  # Flat color for the low-quality tier
+    extent = 10
+    drift_factor = 0.6
+    snapshot_fields = _CREATURE_FIELDS + (("bob", "d"),)
+
     def __init__(self, x, y):
         self.x, self.y = float(x), float(y)
         self.r = 6
@@ -376,6 +515,9 @@ class SeaHorse:
         self.edible = True
         self.value = 3
 
+    def advance_phase(self, sec):
+        self.bob += sec * 3
+
     def update(self, dt, scroll_speed):
         dt_sec = dt / 1000.0
         self.x -= scroll_speed * dt_sec * 0.6
@@ -404,7 +546,12 @@ class SeaHorse:
         pygame.draw.ellipse(surf, (255, 220, 140),
                             (cx - 8 + fin_wave, cy - 3, 4, 6))
 
-class Clownfish:
+class Clownfish(Entity):
+    simple_color = (255, 140, 0)  # Flat color for the low-quality tier
+    extent = 8
+    drift_factor = 0.9
+    snapshot_fields = _CREATURE_FIELDS + (("swim_cycle", "d"),)
+
     def __init__(self, x, y):
         self.x, self.y = float(x), float(y)
         self.r = 5
@@ -412,6 +559,9 @@ class Clownfish:
         self.edible = True
         self.value = 2
 
+    def advance_phase(self, sec):
+        self.swim_cycle += sec * 4
+
     def update(self, dt, scroll_speed):
         dt_sec = dt / 1000.0
         self.x += math.cos(self.swim_cycle) * 40 * dt_sec
@@ -436,23 +586,40 @@ class Clownfish:
         pygame.draw.circle(surf, (255, 160, 20), (cx - 5, cy), 2)
         pygame.draw.circle(surf, (255, 160, 20), (cx + 5, cy), 2)
 
-class Pufferfish:
+class Pufferfish(Entity):
+    simple_color = (180, 180, 80)  # Flat color for the low-quality tier
+    extent = 13
+    drift_factor = 0.5
+    snapshot_fields = _CREATURE_FIELDS + (("puffed", "?"), ("puff_timer", "d"), ("next_puff", "d"))
+
     def __init__(self, x, y):
         self.x, self.y = float(x), float(y)
         self.r = 7
         self.puffed = False
         self.puff_timer = 0.0
+        self.next_puff = poisson_interval(PUFFER_PUFF_RATE)
         self.edible = True
         self.value = 4
 
+    def advance_phase(self, sec):
+        if self.puffed:
+            self.puff_timer -= sec
+            if self.puff_timer <= 0:
+                self.puffed = False
+        else:
+            self.next_puff = max(0.0, self.next_puff - sec)
+
     def update(self, dt, scroll_speed):
         dt_sec = dt / 1000.0
         self.x -= scroll_speed * dt_sec * 0.5
         
-        # Random puffing
-        if not self.puffed and random.random() < 0.003:
-            self.puffed = True
-            self.puff_timer = 2.0
+        # Random puffing (Poisson timer, only runs while deflated)
+        if not self.puffed:
+            self.next_puff -= dt_sec
+            if self.next_puff <= 0:
+                self.puffed = True
+                self.puff_timer = 2.0
+                self.next_puff = poisson_interval(PUFFER_PUFF_RATE)
         
         if self.puffed:
             self.puff_timer -= dt_sec
@@ -486,7 +653,12 @@ class Pufferfish:
         pygame.draw.circle(surf, (0, 0, 0), (cx + 3, cy - 2), 1)
 
 # Additional 90s-flavor sea life (zone-specific)
-class Eel:
+class Eel(Entity):
+    simple_color = (60, 180, 160)  # Flat color for the low-quality tier
+    extent = 30  # Body trails 2px per segment behind the head
+    drift_factor = 0.9
+    snapshot_fields = _CREATURE_FIELDS + (("wave", "d"), ("length", "h"))
+
     def __init__(self, x, y):
         self.x, self.y = float(x), float(y)
         self.r = 6
@@ -495,6 +667,9 @@ class Eel:
         self.value = 4
         self.length = 14
 
+    def advance_phase(self, sec):
+        self.wave += sec * 6
+
     def update(self, dt, scroll_speed):
         dt_sec = dt / 1000.0
         self.x -= scroll_speed * dt_sec * 0.9
@@ -510,7 +685,11 @@ class Eel:
             py = cy + int(math.sin((self.wave*0.8) + i*0.4) * 2)
             pygame.draw.circle(surf, color, (px, py), 2)
 
-class Stingray:
+class Stingray(Entity):
+    simple_color = (70, 70, 110)  # Flat color for the low-quality tier
+    extent = 20
+    snapshot_fields = _CREATURE_FIELDS + (("glide", "d"),)
+
     def __init__(self, x, y):
         self.x, self.y = float(x), float(y)
         self.r = 10
@@ -518,6 +697,9 @@ class Stingray:
         self.edible = True
         self.value = 6
 
+    def advance_phase(self, sec):
+        self.glide += sec
+
     def update(self, dt, scroll_speed):
         dt_sec = dt / 1000.0
         self.x -= scroll_speed * dt_sec * 1.0
@@ -532,7 +714,13 @@ class Stingray:
         # Tail
         pygame.draw.line(surf, body, (cx+10, cy+2), (cx+18, cy+6), 2)
 
-class Anglerfish:
+class Anglerfish(Entity):
+    simple_color = (90, 60, 40)  # Flat color for the low-quality tier
+    extent = 13
+    drift_factor = 0.6
+    light = (20, (255, 210, 120), (5, -11))  # The lure
+    snapshot_fields = _CREATURE_FIELDS + (("bob", "d"),)
+
     def __init__(self, x, y):
         self.x, self.y = float(x), float(y)
         self.r = 8
@@ -540,6 +728,9 @@ class Anglerfish:
         self.edible = True
         self.value = 7
 
+    def advance_phase(self, sec):
+        self.bob += sec * 2
+
     def update(self, dt, scroll_speed):
         dt_sec = dt / 1000.0
         self.x -= scroll_speed * dt_sec * 0.6
@@ -557,7 +748,12 @@ class Anglerfish:
         pygame.draw.line(surf, (240, 220, 200), (cx+3, cy+2), (cx+5, cy+4), 1)
         pygame.draw.line(surf, (240, 220, 200), (cx+5, cy+2), (cx+7, cy+4), 1)
 
-class Crab:
+class Crab(Entity):
+    simple_color = (200, 60, 50)  # Flat color for the low-quality tier
+    extent = 10
+    drift_factor = 0.8
+    snapshot_fields = _CREATURE_FIELDS + (("ground", "d"), ("dir", "h"))
+
     def __init__(self, x, y, ground_y_offset=12):
         self.x, self.y = float(x), float(y)
         self.ground = y
@@ -570,7 +766,7 @@ class Crab:
         dt_sec = dt / 1000.0
         self.x -= scroll_speed * dt_sec * 0.8
         # Keep near bottom
-        base_h = pygame.display.get_surface().get_height() // SCALE
+        base_h = _base_size()[1]
         self.y = base_h - 14
 
     def draw(self, surf):
@@ -585,6 +781,8 @@ class Crab:
         pygame.draw.circle(surf, body, (cx+8, cy-2), 2)
 
 class Bubble:
+    snapshot_fields = (("x", "d"), ("y", "d"), ("vx", "d"), ("vy", "d"), ("life", "d"), ("r", "h"))
+
     def __init__(self, x, y):
         self.x, self.y = float(x), float(y)
         self.vx = (random.random() * 2 - 1) * 10
@@ -609,25 +807,220 @@ class Bubble:
                                  (int(self.x - self.r//2), int(self.y - self.r//2)), 1)
 
 # --------------------- Helper Functions --------------------
+def is_visible(entity, base_w, base_h):
+    """True when any part of the entity's sprite can land on the base surface."""
+    e = entity.extent
+    return -e <= entity.x <= base_w + e and -e <= entity.y <= base_h + e
+
+def rescale_world(sx, sy, turtle, groups):
+    """
+    Move the turtle and every entity by (sx, sy) when the base surface is
+    resized under the same window (a render scale change), so everything
+    stays where it was on screen.
+    """
+    turtle.x *= sx
+    turtle.y *= sy
+    for group in groups:
+        for e in group:
+            e.x *= sx
+            e.y *= sy
+            if hasattr(e, "ground"):
+                e.ground *= sy
+
+def draw_simple(entity, surf):
+    """Cheap stand-in for entity.draw() used by low quality tiers."""
+    pygame.draw.circle(surf, entity.simple_color, (int(entity.x), int(entity.y)), entity.r)
+
 def dist2(a, b, x, y):
     return (a - x) * (a - x) + (b - y) * (b - y)
 
 def circle_collide(ax, ay, ar, bx, by, br):
     return dist2(ax, ay, bx, by) <= (ar + br) * (ar + br)
 
-def load_highscore(path):
-    try:
-        with open(path, 'r', encoding='utf-8') as f:
-            return max(0, int(f.read().strip()))
-    except Exception:
-        return 0
+# Order the zones cycle through during a run
+ENVIRONMENT_ORDER = (Environment.BEACH, Environment.CORAL_COVE, Environment.ROCKY_REEF,
+                     Environment.OCEAN_FLOOR, Environment.OIL_RIG)
 
-def save_highscore(path, score):
-    try:
-        with open(path, 'w', encoding='utf-8') as f:
-            f.write(str(int(score)))
-    except Exception:
-        pass
+# Creatures that roam each zone, and the ones already there when a run starts
+ZONE_CREATURES = {
+    Environment.BEACH: [SeaHorse, Clownfish, Crab],
+    Environment.CORAL_COVE: [Clownfish, SeaHorse, MantisShrimp],
+    Environment.ROCKY_REEF: [Eel, MantisShrimp, Pufferfish],
+    Environment.OCEAN_FLOOR: [Anglerfish, Eel, Pufferfish],
+    Environment.OIL_RIG: [Stingray, Eel, Pufferfish],
+}
+INITIAL_ZONE_CREATURES = {
+    Environment.BEACH: [SeaHorse, Clownfish, Crab],
+    Environment.CORAL_COVE: [Clownfish, SeaHorse, MantisShrimp],
+    Environment.ROCKY_REEF: [Eel, MantisShrimp],
+    Environment.OCEAN_FLOOR: [Anglerfish, Eel],
+    Environment.OIL_RIG: [Stingray, Eel],
+}
+
+def populate_world(rng, env, base_w, base_h, jellies, bags, creatures):
+    """Entities present at the start of a run."""
+    for _ in range(5):
+        jellies.append(Jelly(rng.randrange(base_w//2, base_w), 
+                           rng.randrange(20, base_h-20)))
+    for _ in range(3):
+        bags.append(PlasticBag(rng.randrange(base_w//2, base_w), 
+                              rng.randrange(20, base_h-20)))
+    for i, C in enumerate(INITIAL_ZONE_CREATURES.get(env, [SeaHorse, Clownfish])):
+        creatures.append(C(base_w - 50 - i*40, base_h//2 + (i-1)*base_h//6))
+
+def schedule_spawns(scheduler, get_score):
+    """Register the spawn events; jelly and bag rates grow with the score."""
+    scheduler.every("spawn_jelly", lambda: JELLY_SPAWN_RATE + min(
+        JELLY_SPAWN_RATE_MAX_BONUS, get_score() * JELLY_SPAWN_RATE_PER_POINT))
+    scheduler.every("spawn_bag", lambda: BAG_SPAWN_RATE + min(
+        BAG_SPAWN_RATE_MAX_BONUS, get_score() * BAG_SPAWN_RATE_PER_POINT))
+    scheduler.every("spawn_creature", CREATURE_SPAWN_RATE)
+
+def spawn_entity(event, rng, env, base_w, base_h, jellies, bags, creatures):
+    """Handle a spawn_* scheduler event; returns False for any other event."""
+    if event == "spawn_jelly":
+        jellies.append(Jelly(base_w + rng.randrange(20, 100), 
+                           rng.randrange(20, base_h-20)))
+    elif event == "spawn_bag":
+        bags.append(PlasticBag(base_w + rng.randrange(20, 100), 
+                              rng.randrange(20, base_h-20)))
+    elif event == "spawn_creature":
+        CreatureClass = rng.choice(ZONE_CREATURES.get(env, [MantisShrimp]))
+        creatures.append(CreatureClass(base_w + rng.randrange(20, 100),
+                                      rng.randrange(40, base_h-40)))
+    else:
+        return False
+    return True
+
+def follow_camera(turtle, base_w, world_offset):
+    """Scroll the world when the turtle pushes against either edge."""
+    # Camera follow: when turtle swims right past 60% of screen, move world
+    margin = max(12, int(turtle.radius) + 2)
+    right_guard = base_w - margin
+    left_guard = margin
+    if turtle.x > right_guard:
+        delta = turtle.x - right_guard
+        turtle.x = right_guard
+        world_offset += delta
+    elif turtle.x < left_guard and world_offset > 0:
+        delta = left_guard - turtle.x
+        turtle.x = left_guard
+        world_offset = max(0, world_offset - delta)
+    return world_offset
+
+def update_entities(dt, drift, jellies, bags, creatures, bubbles, base_w):
+    """
+    Advance every entity one frame and drop the ones that left the world.
+    Entities still waiting beyond the right edge only drift (see Entity).
+    """
+    for group in (jellies, bags, creatures):
+        for e in group[:]:
+            if e.x - e.extent > base_w:
+                e.drift(dt, drift)
+                continue
+            e.wake()
+            e.update(dt, drift)
+            if e.x < -20:  # Remove off-screen
+                group.remove(e)
+    
+    for bub in list(bubbles):
+        bub.update(dt)
+        if bub.life <= 0:
+            bubbles.remove(bub)
+
+def resolve_collisions(turtle, jellies, bags, creatures, bubbles, score, streak):
+    """
+    Apply this frame's eat/hurt rules. Returns the new score and streak and
+    how many things the turtle ate.
+    """
+    eaten = 0
+    
+    # Collisions with jellies
+    for j in list(jellies):
+        if circle_collide(turtle.x, turtle.y, turtle.radius, j.x, j.y, j.r):
+            jellies.remove(j)
+            score += j.value + min(9, streak // 5)
+            streak += 1
+            turtle.mouth_timer = 0.4
+            turtle.jellyfish_eaten += 1
+            eaten += 1
+            play_sfx("eat")
+            
+            # Check for power-up
+            if not turtle.powered_up and turtle.jellyfish_eaten >= POWERUP_THRESHOLD:
+                turtle.powered_up = True
+                turtle.powerup_timer = POWERUP_DURATION
+                turtle.jellyfish_eaten = 0
+                play_sfx("powerup")
+                # Visual effect
+                for _ in range(8):
+                    bubbles.append(Bubble(turtle.x, turtle.y))
+            else:
+                for _ in range(4):
+                    bubbles.append(Bubble(turtle.x, turtle.y))
+    
+    # Collisions with plastic bags
+    for pb in list(bags):
+        if circle_collide(turtle.x, turtle.y, turtle.radius, pb.x, pb.y, pb.r):
+            if turtle.iframes <= 0.0:
+                turtle.health -= 1
+                turtle.iframes = 1.5
+                streak = 0
+                play_sfx("hurt")
+                dx = turtle.x - pb.x
+                dy = turtle.y - pb.y
+                d = math.hypot(dx, dy) or 1.0
+                turtle.vx += (dx / d) * 180
+                turtle.vy += (dy / d) * 180
+                bags.remove(pb)
+                for _ in range(8):
+                    bubbles.append(Bubble(turtle.x, turtle.y))
+    
+    # Collisions with creatures (only if powered up)
+    if turtle.powered_up:
+        for creature in list(creatures):
+            if hasattr(creature, 'edible') and creature.edible:
+                if circle_collide(turtle.x, turtle.y, turtle.radius, 
+                                creature.x, creature.y, creature.r):
+                    creatures.remove(creature)
+                    score += creature.value * 2  # Double points when powered up
+                    turtle.mouth_timer = 0.4
+                    eaten += 1
+                    play_sfx("eat")
+                    for _ in range(6):
+                        bubbles.append(Bubble(turtle.x, turtle.y))
+    
+    return score, streak, eaten
+
+# ----------------------- Snapshots -----------------------
+SNAPSHOT_EVENTS = ("spawn_jelly", "spawn_bag", "spawn_creature",
+                   "env_prefetch", "env_transition", "env_switch")
+
+# world_offset, score, streak, environment index, transitioning,
+# run_time, env_played, env_eaten; plus the global and the game's RNG
+SNAPSHOT_CODEC = SnapshotCodec(
+    "dqqH?ddq", Turtle,
+    (Jelly, PlasticBag, MantisShrimp, SeaHorse, Clownfish, Pufferfish,
+     Eel, Stingray, Anglerfish, Crab, Bubble),
+    SNAPSHOT_EVENTS, randoms=2)
+
+# ----------------------- Idle screens -----------------------
+# Events that mean a static screen has to be drawn again
+_REDRAW_EVENTS = (KEYDOWN, VIDEORESIZE, VIDEOEXPOSE, WINDOWEXPOSED, WINDOWSHOWN,
+                  WINDOWRESTORED, WINDOWSIZECHANGED)
+
+def wait_events(timeout_ms):
+    """
+    Sleep until an event arrives or timeout_ms passes, then return every
+    pending event. Static screens use this instead of a 60 FPS clock.tick,
+    so they wake instantly on input but otherwise leave the CPU idle.
+    """
+    first = pygame.event.wait(timeout_ms)
+    events = [] if first.type == NOEVENT else [first]
+    return events + pygame.event.get()
+
+def needs_redraw(events):
+    return any(e.type in _REDRAW_EVENTS for e in events)
 
 # ----------------------- Character Selection -----------------------
 def character_selection_screen(screen, clock, base_font, title_font):
@@ -640,9 +1033,13 @@ def character_selection_screen(screen, clock, base_font, title_font):
     ]
     
     selected = 0
+    dirty = True
     
     while True:
-        for event in pygame.event.get():
+        # Nothing here animates: sleep until input, redraw only after it
+        events = wait_events(1000 // IDLE_FPS)
+        clock.tick()
+        for event in events:
             if event.type == QUIT:
                 return None
             if event.type == KEYDOWN:
@@ -654,12 +1051,15 @@ def character_selection_screen(screen, clock, base_font, title_font):
                     selected = (selected + 1) % len(characters)
                 elif event.key == K_RETURN or event.key == K_SPACE:
                     return characters[selected][0]
+        if not (dirty or needs_redraw(events)):
+            continue
+        dirty = False
         
         # Draw selection screen
         screen.fill((8, 22, 44))
         
         # Title
-        title = title_font.render("SELECT YOUR CHARACTER", True, (220, 255, 255))
+        title = render_text(title_font, "SELECT YOUR CHARACTER", True, (220, 255, 255))
         screen.blit(title, (screen.get_width()//2 - title.get_width()//2, 50))
         
         # Character options
@@ -679,30 +1079,35 @@ def character_selection_screen(screen, clock, base_font, title_font):
                               (cx-15, cy-15, 30, 30), 3)
             
             # Character name
-            name_text = base_font.render(char_type, True, (220, 255, 255))
+            name_text = render_text(base_font, char_type, True, (220, 255, 255))
             screen.blit(name_text, (screen.get_width()//2 - 100, y))
             
             # Description
-            desc_text = base_font.render(desc, True, (180, 220, 240))
+            desc_text = render_text(base_font, desc, True, (180, 220, 240))
             screen.blit(desc_text, (screen.get_width()//2 - 100, y + 30))
         
         # Instructions
-        inst = base_font.render("↑↓ or W/S to select, ENTER to confirm, ESC to quit", 
+        inst = render_text(base_font, "↑↓ or W/S to select, ENTER to confirm, ESC to quit", 
                               True, (150, 200, 220))
         screen.blit(inst, (screen.get_width()//2 - inst.get_width()//2, 
                          screen.get_height() - 50))
         
         pygame.display.flip()
-        clock.tick(FPS)
 
 # ----------------------- Main Menu with Volume Control -----------------------
-def main_menu_screen(screen, clock, base_font, title_font, volume):
+def main_menu_screen(screen, clock, base_font, title_font, volume, music,
+                     on_first_frame=None):
     """Main menu with volume control"""
     selected = 0
     menu_items = ["Start Game", f"Music Volume: {int(volume * 100)}%", "Quit"]
+    drawn_wave = None
     
     while True:
-        for event in pygame.event.get():
+        # Only the title wave animates; it moves a whole pixel a few times a
+        # second, so waking at IDLE_FPS is enough and input wakes us at once
+        events = wait_events(1000 // IDLE_FPS)
+        clock.tick()
+        for event in events:
             if event.type == QUIT:
                 return None, volume
             if event.type == KEYDOWN:
@@ -715,12 +1120,12 @@ def main_menu_screen(screen, clock, base_font, title_font, volume):
                 elif event.key == K_LEFT or event.key == K_a:
                     if selected == 1:  # Volume control
                         volume = max(0.0, volume - 0.1)
-                        pygame.mixer.music.set_volume(volume)
+                        music.set_volume(volume)
                         menu_items[1] = f"Music Volume: {int(volume * 100)}%"
                 elif event.key == K_RIGHT or event.key == K_d:
                     if selected == 1:  # Volume control
                         volume = min(1.0, volume + 0.1)
-                        pygame.mixer.music.set_volume(volume)
+                        music.set_volume(volume)
                         menu_items[1] = f"Music Volume: {int(volume * 100)}%"
                 elif event.key == K_RETURN or event.key == K_SPACE:
                     if selected == 0:  # Start
@@ -728,16 +1133,22 @@ def main_menu_screen(screen, clock, base_font, title_font, volume):
                     elif selected == 2:  # Quit
                         return None, volume
         
-        # Draw menu
-        screen.fill((8, 22, 44))
+        music.update()
         
         # Title with wave effect
         wave_offset = int(math.sin(pygame.time.get_ticks() * 0.001) * 10)
-        title = title_font.render("SEA TURTLE ECHO", True, (220, 255, 255))
+        if wave_offset == drawn_wave and not needs_redraw(events):
+            continue
+        drawn_wave = wave_offset
+        
+        # Draw menu
+        screen.fill((8, 22, 44))
+        
+        title = render_text(title_font, "SEA TURTLE ECHO", True, (220, 255, 255))
         screen.blit(title, (screen.get_width()//2 - title.get_width()//2, 
                            100 + wave_offset))
         
-        subtitle = base_font.render("~ Deep Dive Edition ~", True, (180, 220, 240))
+        subtitle = render_text(base_font, "~ Deep Dive Edition ~", True, (180, 220, 240))
         screen.blit(subtitle, (screen.get_width()//2 - subtitle.get_width()//2, 
                               140 + wave_offset))
         
@@ -752,7 +1163,7 @@ def main_menu_screen(screen, clock, base_font, title_font, volume):
                                (screen.get_width()//2 - 200, y - 10, 400, 40), 3)
             
             color = (255, 255, 255) if i == selected else (180, 220, 240)
-            item_text = base_font.render(item, True, color)
+            item_text = render_text(base_font, item, True, color)
             screen.blit(item_text, (screen.get_width()//2 - item_text.get_width()//2, y))
             
             # Volume bar
@@ -765,22 +1176,31 @@ def main_menu_screen(screen, clock, base_font, title_font, volume):
                                (bar_x, bar_y, int(200 * volume), 10))
         
         # Instructions
-        inst = base_font.render("↑↓ to navigate, ←→ to adjust volume, ENTER to select", 
+        inst = render_text(base_font, "↑↓ to navigate, ←→ to adjust volume, ENTER to select", 
                               True, (150, 200, 220))
         screen.blit(inst, (screen.get_width()//2 - inst.get_width()//2, 
                          screen.get_height() - 50))
         
         pygame.display.flip()
-        clock.tick(FPS)
+        if on_first_frame is not None:
+            on_first_frame()
+            on_first_frame = None
 
 # ------------------------- Main Game -----------------------
 def run():
-    pygame.init()
-    pygame.mixer.pre_init(44100, -16, 2, 512)
-    pygame.mixer.init()
+    global _render_scale, _window_size
+    timer = StartupTimer()
+    profile = audio_profile(AUDIO_PROFILE)
+    pre_init_mixer(profile)  # Before pygame.init(), which may open the device
+    init_pygame(FAST_START)
+    timer.mark("pygame init")
+    mixer = init_mixer(profile)
+    mixer.measure()
+    timer.mark("mixer init")
     
     # Start with default size but allow resizing
-    screen = pygame.display.set_mode((DEFAULT_W, DEFAULT_H), RESIZABLE)
+    display = Display(DISPLAY_BACKEND)
+    screen = display.window((DEFAULT_W, DEFAULT_H))
     pygame.display.set_caption(TITLE)
     
     # Icon
@@ -788,32 +1208,60 @@ def run():
     pygame.draw.circle(icon, (32, 140, 110), (16, 16), 14)
     pygame.draw.circle(icon, (18, 102, 85), (16, 16), 14, 2)
     pygame.display.set_icon(icon)
+    timer.mark("display")
     
     clock = pygame.time.Clock()
     
     # Fonts
     pygame.font.init()
-    base_font = pygame.font.SysFont("consolas", 14)
-    title_font = pygame.font.SysFont("consolas", 22, bold=True)
+    if FAST_START:
+        base_font = load_font("consolas", 14)
+        title_font = load_font("consolas", 22, bold=True)
+    else:
+        base_font = pygame.font.SysFont("consolas", 14)
+        title_font = pygame.font.SysFont("consolas", 22, bold=True)
+    timer.mark("fonts")
     
-    # Audio
-    music_map, eat, hurt, dash, powerup = load_or_generate_audio()
-    pygame.mixer.music.load(music_map[Environment.BEACH])
+    # Audio: SFX and any missing tracks are only needed once the game starts
+    def load_game_audio():
+        _, _, eat, hurt, dash, powerup = load_or_generate_audio()
+        _sfx["eat"] = eat
+        _sfx["hurt"] = hurt
+        _sfx["dash"] = dash
+        _sfx["powerup"] = powerup
     
-    _sfx["eat"] = pygame.mixer.Sound(eat)
-    _sfx["hurt"] = pygame.mixer.Sound(hurt)
-    _sfx["dash"] = pygame.mixer.Sound(dash)
-    _sfx["powerup"] = pygame.mixer.Sound(powerup)
+    audio_loader = None
+    if not FAST_START:
+        load_game_audio()
+        timer.mark("audio")
     
     # Main menu
     volume = 0.35
-    pygame.mixer.music.set_volume(volume)
-    pygame.mixer.music.play(-1)
+    music = StemDeck(volume) if MUSIC_STEMS else MusicDeck(resolve_music_map(), volume)
+    music.play(Environment.BEACH, fade_ms=0)
+    timer.mark("music")
+    
+    def on_menu_visible():
+        nonlocal audio_loader
+        timer.mark("first frame")
+        if STARTUP_REPORT:
+            timer.report()
+        if FAST_START:
+            audio_loader = threading.Thread(target=load_game_audio, daemon=True)
+            audio_loader.start()
     
-    menu_result, volume = main_menu_screen(screen, clock, base_font, title_font, volume)
+    menu_result, volume = main_menu_screen(screen, clock, base_font, title_font, volume, music,
+                                           on_first_frame=on_menu_visible)
     if menu_result is None:
         pygame.quit()
         return
+    if STARTUP_REPORT:
+        print(mixer.report())
+    if audio_loader is not None:
+        audio_loader.join()
+        # Tracks generated in the background replace their fallbacks
+        if not MUSIC_STEMS:
+            music.music_map = resolve_music_map()
     
     # Character selection
     selected_character = character_selection_screen(screen, clock, base_font, title_font)
@@ -823,8 +1271,14 @@ def run():
     
     # Create base surface for the game
     current_w, current_h = screen.get_size()
-    base_w, base_h = current_w // SCALE, current_h // SCALE
-    base = pygame.Surface((base_w, base_h))
+    _window_size = (current_w, current_h)
+    base_w, base_h = current_w // _render_scale, current_h // _render_scale
+    base = make_base(base_w, base_h)
+    screen = display.game((base_w, base_h))
+    
+    # Frame-time driven quality tiers
+    governor = QualityGovernor()
+    quality = governor.tier
     
     # Game state
     rng = random.Random()
@@ -841,15 +1295,11 @@ def run():
     bubbles = []
     
     # Environment management
-    environments = [Environment.BEACH, Environment.CORAL_COVE, Environment.ROCKY_REEF, 
-                   Environment.OCEAN_FLOOR, Environment.OIL_RIG]
+    environments = list(ENVIRONMENT_ORDER)
     current_env_index = 0
     current_env = environments[current_env_index]
     env_transition = 0
-    # Time-based environment duration
-    env_time = 0.0
     transitioning = False
-    transition_timer = 0.0
     
     # Camera + scrolling variables
     world_offset = 0  # background parallax offset (pixels)
@@ -858,64 +1308,218 @@ def run():
     # Ensure gameplay starts with the correct environment music
     last_music_env = None
     if last_music_env != current_env:
-        pygame.mixer.music.load(music_map[current_env])
-        pygame.mixer.music.play(-1, 0.0, MUSIC_FADE_MS)
+        music.play(current_env)
         last_music_env = current_env
     
     score = 0
     streak = 0
     paused = False
     start_menu = False  
-    fullscreen = False
     
-    highscore_path = SAVE_FILE
-    highscore = load_highscore(highscore_path)
+    # Base -> window scaling (F9 cycles modes, F8 picks the fastest)
+    presenter = Presenter(PRESENT_MODE, BandScaler(RENDER_THREADS) if RENDER_THREADS != 0 else None)
+    present_notice_until = 0.0
+    
+    # Window-space effects; each keeps its overlays until the window resizes
+    def make_post():
+        # Under the scaled backend the display surface is base resolution
+        px = 1 if display.scaled else SCALE
+        return PostPipeline([
+            TintStage(),
+            FlashStage(thickness=2 * px),
+            VignetteStage(enabled=ENABLE_VIGNETTE),
+            ScanlineStage(enabled=ENABLE_CRT),
+        ])
+    
+    post = make_post()
+    show_pacing = False
+    # Darkness and glowing creatures in the deep (8-bit bases stay unlit)
+    lighting = LightMap() if ENABLE_LIGHTING and not INDEXED_COLOR else None
+    
+    # Scores and stats are written by the store's background thread
+    store = ScoreStore()
+    highscore = store.best()
+    run_started = time.time()
+    run_time = 0.0
+    run_recorded = False
+    env_played = 0.0
+    env_eaten = 0
     
     t = 0.0
     
     # Spawn initial entities
-    for _ in range(5):
-        jellies.append(Jelly(rng.randrange(base_w//2, base_w), 
-                           rng.randrange(20, base_h-20)))
-    for _ in range(3):
-        bags.append(PlasticBag(rng.randrange(base_w//2, base_w), 
-                              rng.randrange(20, base_h-20)))
+    populate_world(rng, current_env, base_w, base_h, jellies, bags, creatures)
     
-    # Add initial creatures (zone-specific variety)
-    initial_zone_map = {
-        Environment.BEACH: [SeaHorse, Clownfish, Crab],
-        Environment.CORAL_COVE: [Clownfish, SeaHorse, MantisShrimp],
-        Environment.ROCKY_REEF: [Eel, MantisShrimp],
-        Environment.OCEAN_FLOOR: [Anglerfish, Eel],
-        Environment.OIL_RIG: [Stingray, Eel],
-    }
-    for i, C in enumerate(initial_zone_map.get(current_env, [SeaHorse, Clownfish])):
-        creatures.append(C(base_w - 50 - i*40, base_h//2 + (i-1)*base_h//6))
+    # Spawns and environment changes are events on the game clock
+    scheduler = EventScheduler(rng)
+    
+    def schedule_world_events():
+        scheduler.clear()
+        schedule_spawns(scheduler, lambda: score)
+        scheduler.after("env_prefetch", ENV_DURATION_SEC - MUSIC_PREFETCH_SEC)
+        scheduler.after("env_transition", ENV_DURATION_SEC)
+    
+    schedule_world_events()
+    
+    # Next environment's surfaces are built in spare frame time before the switch
+    prewarm = IdleTaskQueue(1000.0 / FPS)
+    
+    # Paused and game-over screens are static: the scene is frozen into a
+    # snapshot and the window is only redrawn when something changes
+    idle = False
+    frozen = None
+    notice_shown = False
+    
+    # Per-frame timings and counts for offline tuning (python -m ecco.telemetry)
+    telemetry = TelemetryRecorder(environments) if ENABLE_TELEMETRY else None
+    
+    # F10 profiles the next few seconds into DATA_DIR/profiles
+    capture = ProfileCapture()
+    
+    def profile_context():
+        return {"environment": current_env, "score": score, "quality": quality.name,
+                "base_size": (base_w, base_h), "jellies": len(jellies), "bags": len(bags),
+                "creatures": len(creatures), "bubbles": len(bubbles),
+                "fps": round(clock.get_fps(), 1), "paused": paused, "game_over": game_over}
+    
+    # Last REWIND_SECONDS of play (hold Backspace); F5/F6 quicksave/quickload
+    rewind = RewindBuffer(int(REWIND_SECONDS * FPS))
+    
+    def capture_state():
+        return SNAPSHOT_CODEC.encode(
+            (world_offset, score, streak, current_env_index, transitioning,
+             run_time, env_played, env_eaten),
+            turtle, (random.getstate(), rng.getstate()),
+            (scheduler.now, scheduler.pending()), (jellies, bags, creatures, bubbles))
+    
+    def restore_state(data):
+        nonlocal world_offset, score, streak, current_env_index, current_env, transitioning
+        nonlocal run_time, env_played, env_eaten, jellies, bags, creatures, bubbles
+        scalars, _, (global_rng, game_rng), (now, pending), groups = SNAPSHOT_CODEC.decode(data, turtle)
+        (world_offset, score, streak, current_env_index, transitioning,
+         run_time, env_played, env_eaten) = scalars
+        current_env = environments[current_env_index]
+        random.setstate(global_rng)
+        rng.setstate(game_rng)
+        scheduler.restore(now, pending)
+        jellies, bags, creatures, bubbles = groups
+    
+    def scene_lights():
+        lights = []
+        for e in jellies + creatures:
+            if e.light is not None and is_visible(e, base_w, base_h):
+                radius, color, (dx, dy) = e.light
+                lights.append((e.x + dx, e.y + dy, radius, color))
+        if turtle.powered_up and turtle.health > 0:
+            lights.append((turtle.x, turtle.y, turtle.radius + 24, (255, 190, 90)))
+        return lights
+    
+    def draw_background():
+        if INDEXED_COLOR:
+            draw_environment_indexed(base, current_env, int(world_offset), int(t),
+                                     caustics=quality.caustics,
+                                     parallax_layers=quality.parallax_layers,
+                                     sprite_colors=INDEXED_SPRITE_COLORS)
+        else:
+            draw_environment(base, current_env, int(world_offset), int(t),
+                             caustics=quality.caustics, parallax_layers=quality.parallax_layers)
+    
+    # Input-to-flip latency (F12) and late input sampling (F4). Events
+    # drained at the late sample are handled at the top of the next frame.
+    probe = LatencyProbe()
+    late_input = LATE_INPUT
+    carried = []
     
     while True:
-        dt = clock.tick(FPS)
+        if idle:
+            fresh = wait_events(1000 // IDLE_FPS)
+            dt = clock.tick()
+        else:
+            # With vsync the flip already waits for the next vblank
+            dt = clock.tick(display.frame_cap())
+            fresh = pygame.event.get()
+        if probe.active:
+            probe.observe(fresh)
+        events = carried + fresh
+        carried = []
+        frame_start = time.perf_counter()
         t += dt
-        
-        for e in pygame.event.get():
+        frame_flags = 0
+        eaten = hits = 0
+        
+        # get_rawtime() is last frame's work time, without tick's sleep
+        # (not while profiling: its overhead would drop the tier for good)
+        if (ENABLE_QUALITY_GOVERNOR and not idle and not capture.active
+                and governor.update(clock.get_rawtime(), dt)):
+            quality = governor.tier
+            frame_flags |= FLAG_QUALITY_CHANGE
+            if quality.scale != _render_scale:
+                _render_scale = quality.scale
+                old_w, old_h = base_w, base_h
+                base_w, base_h = current_w // _render_scale, current_h // _render_scale
+                base = make_base(base_w, base_h)
+                # The window is unchanged, so the view must be too; rewind
+                # states hold the old coordinates
+                rescale_world(base_w / old_w, base_h / old_h, turtle,
+                              (jellies, bags, creatures, bubbles))
+                world_offset *= base_w / old_w
+                rewind.clear()
+                if display.scaled:
+                    screen = display.game((base_w, base_h))
+                    presenter.invalidate()
+                    post = make_post()
+        
+        for e in events:
             if e.type == QUIT:
                 pygame.quit()
                 return
-            elif e.type == VIDEORESIZE:
+            elif e.type == VIDEORESIZE and not display.scaled:
+                # (SDL rescales a SCALED window by itself)
                 current_w, current_h = e.w, e.h
-                screen = pygame.display.set_mode((current_w, current_h), RESIZABLE)
-                base_w, base_h = current_w // SCALE, current_h // SCALE
-                base = pygame.Surface((base_w, base_h))
+                screen = display.window((current_w, current_h))
+                presenter.invalidate()
+                _window_size = (current_w, current_h)
+                base_w, base_h = current_w // _render_scale, current_h // _render_scale
+                base = make_base(base_w, base_h)
             elif e.type == KEYDOWN:
-                if e.key == K_F11:
-                    fullscreen = not fullscreen
-                    if fullscreen:
-                        screen = pygame.display.set_mode((0, 0), FULLSCREEN)
-                        current_w, current_h = screen.get_size()
+                if e.key == K_F9 and not display.scaled:
+                    presenter.cycle()
+                    present_notice_until = t + 2000
+                elif e.key == K_F8 and not display.scaled:
+                    presenter.pick_fastest(base, screen)
+                    present_notice_until = t + 2000
+                elif e.key == K_F7:
+                    show_pacing = not show_pacing
+                elif e.key == K_F10:
+                    capture.start(profile_context())
+                elif e.key == K_F12:
+                    if probe.active:
+                        probe.stop()
                     else:
-                        screen = pygame.display.set_mode((DEFAULT_W, DEFAULT_H), RESIZABLE)
-                        current_w, current_h = DEFAULT_W, DEFAULT_H
-                    base_w, base_h = current_w // SCALE, current_h // SCALE
-                    base = pygame.Surface((base_w, base_h))
+                        probe.start()
+                elif e.key == K_F4:
+                    late_input = not late_input
+                elif e.key == K_F5 and not game_over:
+                    save_snapshot(QUICKSAVE_FILE, turtle.character_type, capture_state())
+                elif e.key == K_F6:
+                    saved = load_snapshot(QUICKSAVE_FILE)
+                    if saved is not None:
+                        character, data = saved
+                        if character != turtle.character_type:
+                            turtle = Turtle(50, base_h//2, character)
+                        restore_state(data)
+                        rewind.clear()
+                        game_over = paused = False
+                        death_message = ""
+                        run_recorded = False
+                elif e.key == K_F11:
+                    screen = display.toggle_fullscreen((DEFAULT_W, DEFAULT_H))
+                    presenter.invalidate()
+                    if not display.scaled:
+                        current_w, current_h = screen.get_size()
+                        _window_size = (current_w, current_h)
+                        base_w, base_h = current_w // _render_scale, current_h // _render_scale
+                        base = make_base(base_w, base_h)
                 elif e.key == K_ESCAPE:
                     if start_menu or game_over:
                         pygame.quit()
@@ -925,10 +1529,15 @@ def run():
                     start_menu = False
                 elif e.key == K_r and game_over:
                     # Restart
+                    if display.scaled:
+                        screen = display.window((current_w, current_h))
                     selected_character = character_selection_screen(screen, clock, base_font, title_font)
                     if selected_character is None:
                         pygame.quit()
                         return
+                    screen = display.game((base_w, base_h))
+                    presenter.invalidate()
+                    post = make_post()
                     turtle = Turtle(50, base_h//2, selected_character)
                     game_over = False
                     death_message = ""
@@ -938,49 +1547,84 @@ def run():
                     bubbles = []
                     score = 0
                     streak = 0
-                    env_time = 0.0
+                    run_started = time.time()
+                    run_time = 0.0
+                    run_recorded = False
+                    env_played = 0.0
+                    env_eaten = 0
                     transitioning = False
-                    transition_timer = 0.0
+                    schedule_world_events()
                     world_offset = 0
                     current_env_index = 0
                     current_env = environments[current_env_index]
-                    pygame.mixer.music.load(music_map[current_env])
-                    pygame.mixer.music.play(-1, 0.0, MUSIC_FADE_MS)
+                    music.play(current_env)
                     last_music_env = current_env
                     
                     # Respawn entities
-                    for _ in range(5):
-                        jellies.append(Jelly(rng.randrange(base_w//2, base_w), 
-                                           rng.randrange(20, base_h-20)))
-                    for _ in range(3):
-                        bags.append(PlasticBag(rng.randrange(base_w//2, base_w), 
-                                              rng.randrange(20, base_h-20)))
-                    for i, C in enumerate(initial_zone_map.get(current_env, [SeaHorse, Clownfish])):
-                        creatures.append(C(base_w - 50 - i*40, base_h//2 + (i-1)*base_h//6))
+                    populate_world(rng, current_env, base_w, base_h, jellies, bags, creatures)
+                    rewind.clear()
                     start_menu = False
         
+        if capture.active and not capture.remaining():
+            capture.stop(profile_context())
+        
+        # Late input: the background doesn't depend on this frame's input,
+        # so draw it first and read the keyboard as late as possible
+        playing = not (paused or game_over or start_menu)
+        background_ready = False
+        if late_input and playing:
+            draw_background()
+            background_ready = True
+            carried = pygame.event.get()
+            if probe.active:
+                probe.observe(carried)
         keys = pygame.key.get_pressed()
-        
-        # Update game state
-        if not (paused or game_over or start_menu):
-            # Time based environment transitions to 90 seconds
-            if not transitioning:
-                env_time += dt / 1000.0
-                if env_time >= ENV_DURATION_SEC:
+        if probe.active:
+            probe.sampled()
+        
+        # Start any cross-fade whose track finished decoding this frame,
+        # with every music layer in while powered up
+        music.boost(turtle.powered_up)
+        music.update()
+        
+        # Update game state (holding Backspace steps back through recorded frames)
+        if playing and keys[K_BACKSPACE] and rewind:
+            frozen = None
+            restore_state(rewind.pop())
+        elif playing:
+            frozen = None
+            run_time += dt / 1000.0
+            env_played += dt / 1000.0
+            
+            # Scheduled events: spawns and the 90 second environment cycle
+            next_env = environments[(current_env_index + 1) % len(environments)]
+            for event in scheduler.advance(dt / 1000.0):
+                if spawn_entity(event, rng, current_env, base_w, base_h, jellies, bags, creatures):
+                    continue
+                if event == "env_prefetch":
+                    music.prefetch(next_env)
+                    prewarm.add(prewarm_tasks(next_env, base_w, base_h, caustics=quality.caustics,
+                                              parallax_layers=quality.parallax_layers,
+                                              indexed=INDEXED_COLOR,
+                                              sprite_colors=INDEXED_SPRITE_COLORS))
+                elif event == "env_transition":
                     transitioning = True
-                    transition_timer = MUSIC_FADE_MS / 1000.0
-                    pygame.mixer.music.fadeout(MUSIC_FADE_MS)
-            else:
-                transition_timer -= dt / 1000.0
-                if transition_timer <= 0:
-                    # Switch environment with fade-in
-                    env_time = 0.0
+                    frame_flags |= FLAG_MUSIC_TRANSITION
+                    # Cross-fade straight into the prefetched track
+                    music.play(next_env)
+                    scheduler.after("env_switch", music.fade_ms / 1000.0)
+                elif event == "env_switch":
+                    # Switch environment once the cross-fade has finished
+                    store.record_environment(current_env, env_played, env_eaten)
+                    env_played = 0.0
+                    env_eaten = 0
                     transitioning = False
                     current_env_index = (current_env_index + 1) % len(environments)
                     current_env = environments[current_env_index]
-                    pygame.mixer.music.load(music_map[current_env])
-                    pygame.mixer.music.play(-1, 0.0, MUSIC_FADE_MS)
+                    next_env = environments[(current_env_index + 1) % len(environments)]
                     last_music_env = current_env
+                    scheduler.after("env_prefetch", ENV_DURATION_SEC - MUSIC_PREFETCH_SEC)
+                    scheduler.after("env_transition", ENV_DURATION_SEC)
                     # spawn fresh food in new environment
                     for _ in range(3):
                         jellies.append(
@@ -990,25 +1634,13 @@ def run():
 
             # Safety: if for any reason music got desynced, enforce correct track
             if not transitioning and last_music_env != current_env:
-                pygame.mixer.music.load(music_map[current_env])
-                pygame.mixer.music.play(-1, 0.0, MUSIC_FADE_MS)
+                music.play(current_env)
                 last_music_env = current_env
             
             # Update turtle
             turtle.update(dt, keys, current_drift)
             
-            # Camera follow: when turtle swims right past 60% of screen, move world
-            margin = max(12, int(turtle.radius) + 2)
-            right_guard = base_w - margin
-            left_guard = margin
-            if turtle.x > right_guard:
-                delta = turtle.x - right_guard
-                turtle.x = right_guard
-                world_offset += delta
-            elif turtle.x < left_guard and world_offset > 0:
-                delta = left_guard - turtle.x
-                turtle.x = left_guard
-                world_offset = max(0, world_offset - delta)
+            world_offset = follow_camera(turtle, base_w, world_offset)
             
             # Check for tortoise death
             if turtle.is_tortoise and turtle.has_moved and turtle.health <= 0:
@@ -1018,158 +1650,111 @@ def run():
                 game_over = True
             
             # Update entities
-            for j in jellies[:]:
-                j.update(dt, current_drift)
-                if j.x < -20:  # Remove off-screen
-                    jellies.remove(j)
+            update_entities(dt, current_drift, jellies, bags, creatures, bubbles, base_w)
             
-            for b in bags[:]:
-                b.update(dt, current_drift)
-                if b.x < -20:
-                    bags.remove(b)
-            
-            for c in creatures[:]:
-                c.update(dt, current_drift)
-                if c.x < -20:
-                    creatures.remove(c)
-            
-            for bub in list(bubbles):
-                bub.update(dt)
-                if bub.life <= 0:
-                    bubbles.remove(bub)
-            
-            # Spawn new entities
-            if rng.random() < (0.003 + min(0.01, score * 0.00005)):
-                jellies.append(Jelly(base_w + rng.randrange(20, 100), 
-                                   rng.randrange(20, base_h-20)))
-            if rng.random() < (0.002 + min(0.008, score * 0.00003)):
-                bags.append(PlasticBag(base_w + rng.randrange(20, 100), 
-                                      rng.randrange(20, base_h-20)))
+            # Limit entities
+            jellies = jellies[-quality.max_jellies:]
+            bags = bags[-quality.max_bags:]
+            creatures = creatures[-quality.max_creatures:]
+            bubbles = bubbles[-quality.max_particles:]
             
-            # Spawn creatures
-            if rng.random() < 0.004:
-                zone_map = {
-                    Environment.BEACH: [SeaHorse, Clownfish, Crab],
-                    Environment.CORAL_COVE: [Clownfish, SeaHorse, MantisShrimp],
-                    Environment.ROCKY_REEF: [Eel, MantisShrimp, Pufferfish],
-                    Environment.OCEAN_FLOOR: [Anglerfish, Eel, Pufferfish],
-                    Environment.OIL_RIG: [Stingray, Eel, Pufferfish],
-                }
-                CreatureClass = rng.choice(zone_map.get(current_env, [MantisShrimp]))
-                creatures.append(CreatureClass(base_w + rng.randrange(20, 100),
-                                              rng.randrange(40, base_h-40)))
+            # Collisions
+            health = turtle.health
+            score, streak, eaten = resolve_collisions(turtle, jellies, bags, creatures, bubbles,
+                                                      score, streak)
+            hits = max(0, health - turtle.health)
+            env_eaten += eaten
             
-            # Limit entities
-            jellies = jellies[-30:]
-            bags = bags[-20:]
-            creatures = creatures[-15:]
+            if game_over and not run_recorded:
+                run_recorded = True
+                store.record_run(turtle.character_type, score, current_env, run_time, run_started)
+                store.record_environment(current_env, env_played, env_eaten, died=True)
+                highscore = max(highscore, score)
+            elif not game_over:
+                rewind.push(capture_state())
+        
+        was_idle = idle
+        idle = paused or game_over or start_menu
+        
+        # Idle frames are skipped entirely unless input, a resize or the
+        # presentation notice expiring changed what should be on screen
+        if (was_idle and idle and frozen is not None and not needs_redraw(events)
+                and notice_shown == (t < present_notice_until)):
+            probe.discard()
+            continue
+        notice_shown = t < present_notice_until
+        
+        # Draw everything
+        if frozen is not None and frozen.get_size() == base.get_size():
+            base.blit(frozen, (0, 0))
+        else:
+            if not background_ready:
+                draw_background()
             
-            # Collisions with jellies
-            for j in list(jellies):
-                if circle_collide(turtle.x, turtle.y, turtle.radius, j.x, j.y, j.r):
-                    jellies.remove(j)
-                    score += j.value + min(9, streak // 5)
-                    streak += 1
-                    turtle.mouth_timer = 0.4
-                    turtle.jellyfish_eaten += 1
-                    play_sfx("eat")
-                    
-                    # Check for power-up
-                    if not turtle.powered_up and turtle.jellyfish_eaten >= POWERUP_THRESHOLD:
-                        turtle.powered_up = True
-                        turtle.powerup_timer = POWERUP_DURATION
-                        turtle.jellyfish_eaten = 0
-                        play_sfx("powerup")
-                        # Visual effect
-                        for _ in range(8):
-                            bubbles.append(Bubble(turtle.x, turtle.y))
-                    else:
-                        for _ in range(4):
-                            bubbles.append(Bubble(turtle.x, turtle.y))
+            # Draw entities (off-screen ones are culled)
+            for j in jellies:
+                if is_visible(j, base_w, base_h):
+                    j.draw(base)
+            for b in bags:
+                if is_visible(b, base_w, base_h):
+                    b.draw(base)
+            for c in creatures:
+                if not is_visible(c, base_w, base_h):
+                    continue
+                if quality.simple_creatures:
+                    draw_simple(c, base)
+                else:
+                    c.draw(base)
+            for bub in bubbles:
+                bub.draw(base)
             
-            # Collisions with plastic bags
-            for pb in list(bags):
-                if circle_collide(turtle.x, turtle.y, turtle.radius, pb.x, pb.y, pb.r):
-                    if turtle.iframes <= 0.0:
-                        turtle.health -= 1
-                        turtle.iframes = 1.5
-                        streak = 0
-                        play_sfx("hurt")
-                        dx = turtle.x - pb.x
-                        dy = turtle.y - pb.y
-                        d = math.hypot(dx, dy) or 1.0
-                        turtle.vx += (dx / d) * 180
-                        turtle.vy += (dy / d) * 180
-                        bags.remove(pb)
-                        for _ in range(8):
-                            bubbles.append(Bubble(turtle.x, turtle.y))
+            if turtle.health > 0:
+                turtle.draw(base)
             
-            # Collisions with creatures (only if powered up)
-            if turtle.powered_up:
-                for creature in list(creatures):
-                    if hasattr(creature, 'edible') and creature.edible:
-                        if circle_collide(turtle.x, turtle.y, turtle.radius, 
-                                        creature.x, creature.y, creature.r):
-                            creatures.remove(creature)
-                            score += creature.value * 2  # Double points when powered up
-                            turtle.mouth_timer = 0.4
-                            play_sfx("eat")
-                            for _ in range(6):
-                                bubbles.append(Bubble(turtle.x, turtle.y))
+            if lighting is not None:
+                lighting.update(current_env, dt / 1000.0)
+                if lighting.active():
+                    lighting.apply(base, scene_lights())
             
-            if game_over and score > highscore:
-                highscore = score
-                save_highscore(highscore_path, highscore)
+            # Freeze the scene (without UI text) while nothing is moving
+            if idle:
+                frozen = base.copy()
         
-        # Draw everything
-        draw_environment(base, current_env, int(world_offset), int(t))
-        
-        # Draw entities
-        for j in jellies:
-            j.draw(base)
-        for b in bags:
-            b.draw(base)
-        for c in creatures:
-            c.draw(base)
-        for bub in bubbles:
-            bub.draw(base)
-        
-        if turtle.health > 0:
-            turtle.draw(base)
-        
-        # UI
+        # UI (per-pixel alpha doesn't blend onto an 8-bit base, so text is
+        # rendered colour-keyed instead of antialiased there)
+        text_aa = base.get_bitsize() != 8
         if paused:
-            p = base_font.render("PAUSED - Press ESC to resume", True, (210, 240, 250))
+            p = render_text(base_font, "PAUSED - Press ESC to resume", text_aa, (210, 240, 250))
             base.blit(p, (base_w//2 - p.get_width()//2, base_h//2))
             
         elif game_over:
             if death_message:
-                msg = base_font.render(death_message, True, (255, 100, 100))
+                msg = render_text(base_font, death_message, text_aa, (255, 100, 100))
                 base.blit(msg, (base_w//2 - msg.get_width()//2, base_h//2 - 20))
-            go = base_font.render(f"Game Over - Score: {score} (Best: {highscore})", True, (255, 220, 220))
+            go = render_text(base_font, f"Game Over - Score: {score} (Best: {highscore})", text_aa, (255, 220, 220))
             base.blit(go, (base_w//2 - go.get_width()//2, base_h//2))
-            ri = base_font.render("Press R to select new character, ESC to quit", True, (230, 230, 240))
+            ri = render_text(base_font, "Press R to select new character, ESC to quit", text_aa, (230, 230, 240))
             base.blit(ri, (base_w//2 - ri.get_width()//2, base_h//2 + 20))
         
         # HUD
-        s = base_font.render(f"Score: {score}", True, (220, 255, 255))
+        s = render_text(base_font, f"Score: {score}", text_aa, (220, 255, 255))
         base.blit(s, (6, 4))
-        h = base_font.render(f"Best: {highscore}", True, (180, 230, 255))
+        h = render_text(base_font, f"Best: {highscore}", text_aa, (180, 230, 255))
         base.blit(h, (6, 18))
         
         # Environment indicator
-        env_text = base_font.render(f"Zone: {current_env}", True, (180, 220, 240))
+        env_text = render_text(base_font, f"Zone: {current_env}", text_aa, (180, 220, 240))
         base.blit(env_text, (6, 32))
         
         # Power-up indicator
         if turtle.powered_up:
-            power_text = base_font.render(f"POWER-UP: {int(turtle.powerup_timer)}s", 
-                                        True, (255, 200, 100))
+            power_text = render_text(base_font, f"POWER-UP: {int(turtle.powerup_timer)}s", 
+                                        text_aa, (255, 200, 100))
             base.blit(power_text, (base_w//2 - power_text.get_width()//2, 10))
         else:
             # Jellyfish counter
-            jelly_text = base_font.render(f"Jellies: {turtle.jellyfish_eaten}/{POWERUP_THRESHOLD}", 
-                                         True, (200, 180, 255))
+            jelly_text = render_text(base_font, f"Jellies: {turtle.jellyfish_eaten}/{POWERUP_THRESHOLD}", 
+                                         text_aa, (200, 180, 255))
             base.blit(jelly_text, (base_w//2 - jelly_text.get_width()//2, 10))
         
         # Hearts
@@ -1180,21 +1765,52 @@ def run():
             pygame.draw.polygon(base, (240, 90, 100), 
                               [(heart_x - 8, 14), (heart_x + 4, 14), (heart_x - 2, 20)])
         
-        # Invulnerability flash
-        if turtle.iframes > 0 and (int(t * 0.01) % 2 == 0):
-            pygame.draw.rect(base, (255, 255, 255), (0, 0, base_w, base_h), 2)
+        # Presentation mode and its cost, shown briefly after switching
+        if notice_shown:
+            pm = render_text(base_font, presenter.report(), text_aa, (180, 220, 240))
+            base.blit(pm, (6, 46))
+        
+        # Display backend and frame pacing (F7)
+        if show_pacing:
+            fp = render_text(base_font, display.report(), text_aa, (180, 220, 240))
+            base.blit(fp, (6, 60))
+            au = render_text(base_font, mixer.report(), text_aa, (180, 220, 240))
+            base.blit(au, (6, 88))
+        if capture.active:
+            pc = render_text(base_font, f"PROFILING {capture.remaining():.1f}s", text_aa, (255, 200, 100))
+            base.blit(pc, (base_w - pc.get_width() - 6, 24))
+        if probe.active:
+            lt = render_text(base_font, ("late " if late_input else "early ") + probe.report(),
+                             text_aa, (180, 220, 240))
+            base.blit(lt, (6, 74))
+        
+        # Scale to window (SDL does the scaling for the scaled backend)
+        if display.scaled:
+            screen.blit(base, (0, 0))
+            frame_area = screen
+        else:
+            presenter.present(base, screen)
+            frame_area = presenter.target(screen)
+        
+        # Post-processing: tint, invulnerability flash, vignette, CRT scanlines
+        post.apply(frame_area,
+                   flash=turtle.iframes > 0 and (int(t * 0.01) % 2 == 0),
+                   tint=POWERUP_TINT if turtle.powered_up else None)
+        display.flip(paced=not idle)
+        if probe.active:
+            if idle:
+                probe.discard()
+            else:
+                probe.flipped()
         
-        # Scale to window
-        pygame.transform.scale(base, (current_w, current_h), screen)
+        if telemetry and not idle:
+            telemetry.record(dt, (time.perf_counter() - frame_start) * 1000.0,
+                             len(jellies), len(bags), len(creatures), len(bubbles),
+                             eaten, hits, current_env, score, frame_flags)
         
-        # Optional CRT scanlines
-        if ENABLE_CRT:
-            overlay = pygame.Surface((current_w, current_h), pygame.SRCALPHA)
-            for y in range(0, current_h, 2):
-                pygame.draw.line(overlay, (0, 0, 0, 26), (0, y), (current_w, y))
-            pygame.draw.rect(overlay, (0, 0, 0, 28), (0, 0, current_w, current_h), 8)
-            screen.blit(overlay, (0, 0))
-        pygame.display.flip()
+        # Spend whatever is left of this frame's budget warming caches
+        if prewarm:
+            prewarm.run(1000.0 / FPS - (time.perf_counter() - frame_start) * 1000.0)
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,95 @@
+import random
+import time
+from collections import deque
+
+import pygame
+
+from .telemetry import percentile
+
+######################################################################
+# Input-to-flip latency measurement
+######################################################################
+
+# Keys whose presses are timed (anything Turtle.update reacts to)
+_TIMED_KEYS = {pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+               pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s,
+               pygame.K_SPACE, pygame.K_LSHIFT}
+
+
+class LatencyProbe:
+    """
+    Times input from arrival to the flip that first shows its effect.
+
+    pygame events carry no timestamp, so real key presses are timed from
+    the moment the game drains them and their wait in SDL's queue is
+    missed. To cover the whole path, the probe also schedules virtual
+    inputs at random times (a thread posting real events would only get
+    the GIL while the game sleeps, bunching them up): each one counts as
+    queued at its time and is picked up by the first drain after it, like
+    a key press would be.
+
+    Per frame: observe() every newly drained batch of events, sampled()
+    right where the game reads the keyboard, flipped() after the flip.
+    Inputs observed after the sample wait for the next frame's sample.
+    """
+
+    def __init__(self, window=240, interval=(0.05, 0.15)):
+        self.interval = interval
+        self.probe_ms = deque(maxlen=window)
+        self.key_ms = deque(maxlen=window)
+        self.sample_ms = deque(maxlen=window)
+        self.active = False
+        self._observed = []   # (samples, input time) not yet sampled
+        self._sampled = []    # ... sampled, waiting for the flip
+        self._sample_time = None
+        self._rng = random.Random()
+        self._next_probe = 0.0
+
+    def start(self):
+        self.active = True
+        self.probe_ms.clear()
+        self.key_ms.clear()
+        self.sample_ms.clear()
+        self._next_probe = time.perf_counter() + self._rng.uniform(*self.interval)
+
+    def stop(self):
+        self.active = False
+        self.discard()
+
+    def observe(self, events):
+        now = time.perf_counter()
+        while self._next_probe <= now:
+            self._observed.append((self.probe_ms, self._next_probe))
+            self._next_probe += self._rng.uniform(*self.interval)
+        for e in events:
+            if e.type == pygame.KEYDOWN and e.key in _TIMED_KEYS:
+                self._observed.append((self.key_ms, now))
+
+    def sampled(self):
+        self._sampled += self._observed
+        self._observed = []
+        self._sample_time = time.perf_counter()
+
+    def flipped(self):
+        now = time.perf_counter()
+        for samples, when in self._sampled:
+            samples.append((now - when) * 1000.0)
+        self._sampled = []
+        if self._sample_time is not None:
+            self.sample_ms.append((now - self._sample_time) * 1000.0)
+            self._sample_time = None
+
+    def discard(self):
+        """Forget inputs of a frame that was never flipped (idle screens)."""
+        self._observed = []
+        self._sampled = []
+        self._sample_time = None
+
+    def report(self):
+        probe = sorted(self.probe_ms)
+        keys = sorted(self.key_ms)
+        text = (f"Latency: probe {percentile(probe, 50):.1f}/{percentile(probe, 95):.1f}ms"
+                f" sample->flip {percentile(sorted(self.sample_ms), 50):.1f}ms")
+        if keys:
+            text += f" keys {percentile(keys, 50):.1f}ms"
+        return text
@@ -0,0 +1,92 @@
+import pygame
+
+from .environment import Environment
+
+######################################################################
+# Darkness and light sprites for the deep environments
+######################################################################
+
+# Light reaching the scene where nothing glows; environments not listed are
+# fully lit and skip the lighting pass
+AMBIENT_LIGHT = {
+    Environment.OCEAN_FLOOR: (110, 125, 165),
+    Environment.OIL_RIG: (130, 120, 110),
+}
+FULL_LIGHT = (255, 255, 255)
+# Share of a light's colour also added onto the scene itself (its visible
+# halo) at full darkness; it fades with the ambient light
+HALO = 0.8
+# The halo strength is rounded to this many steps so its sprites cache
+HALO_STEPS = 8
+
+_sprites = {}
+
+
+def light_sprite(radius, color, like):
+    """
+    A (2*radius+1)-pixel square that falls off from `color` at the centre
+    to black at the rim as (1 - d/radius)^2, in the pixel format of `like`.
+    Cached per radius and colour.
+    """
+    key = (radius, color)
+    sprite = _sprites.get(key)
+    if sprite is None:
+        size = radius * 2 + 1
+        sprite = pygame.Surface((size, size), 0, like)
+        sprite.fill((0, 0, 0))
+        # Concentric discs from the rim inwards, each brighter than the last
+        for ring in range(radius, 0, -1):
+            f = (1.0 - (ring - 1) / radius) ** 2
+            pygame.draw.circle(sprite, [int(c * f) for c in color], (radius, radius), ring)
+        _sprites[key] = sprite
+    return sprite
+
+
+class LightMap:
+    """
+    Multiplies the base frame by a darkness map and lets lights through.
+    Each frame the map is filled with the ambient light, every light's
+    sprite is added onto it in one batched blit, the scene is multiplied by
+    the map, and a dimmer copy of the sprites is added on top as the glow
+    itself. That is a fill and three blit calls however many lights there
+    are; the map surface is reused until the base size changes.
+    """
+
+    def __init__(self, fade_sec=2.0):
+        self.fade_sec = fade_sec  # Time to ease into a new environment's light
+        self.level = None         # Current ambient (r, g, b) as floats
+        self.surface = None
+
+    def update(self, env, dt_sec):
+        target = AMBIENT_LIGHT.get(env, FULL_LIGHT)
+        if self.level is None:
+            self.level = [float(c) for c in target]
+            return
+        step = min(1.0, dt_sec / self.fade_sec)
+        self.level = [c + (t - c) * step for c, t in zip(self.level, target)]
+
+    def active(self):
+        return self.level is not None and min(self.level) < 254.5
+
+    def halo_strength(self):
+        darkness = 1.0 - sum(self.level) / (3 * 255)
+        return round(darkness * HALO_STEPS) / HALO_STEPS * HALO
+
+    def apply(self, surf, lights):
+        """Light `surf`; lights are (x, y, radius, (r, g, b)) in its pixels."""
+        if not self.active():
+            return
+        if self.surface is None or self.surface.get_size() != surf.get_size():
+            self.surface = pygame.Surface(surf.get_size(), 0, surf)
+        self.surface.fill([int(c) for c in self.level])
+        halo = self.halo_strength()
+        glows, halos = [], []
+        for x, y, radius, color in lights:
+            pos = (int(x) - radius, int(y) - radius)
+            glows.append((light_sprite(radius, color, surf), pos, None, pygame.BLEND_ADD))
+            if halo:
+                dim = tuple(int(c * halo) for c in color)
+                halos.append((light_sprite(radius, dim, surf), pos, None, pygame.BLEND_ADD))
+        self.surface.blits(glows, doreturn=False)
+        surf.blit(self.surface, (0, 0), special_flags=pygame.BLEND_MULT)
+        surf.blits(halos, doreturn=False)
@@ -0,0 +1,138 @@
+import pygame
+
+######################################################################
+# Window-space post-processing
+######################################################################
+
+
+class PostStage:
+    """
+    One effect over the presented frame. Anything that depends on its size is
+    built in build() and reused until the size changes (VIDEORESIZE / F11),
+    so apply() is a single blit or a couple of fills.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.size = None
+
+    def prepare(self, size):
+        if size != self.size:
+            self.size = size
+            self.build(size)
+
+    def build(self, size):
+        pass
+
+    def active(self, state):
+        return self.enabled
+
+    def apply(self, screen, state):
+        """Subclasses draw their effect on screen here."""
+
+
+class ScanlineStage(PostStage):
+    """CRT scanlines plus a soft dark border, as one multiply blit."""
+
+    def __init__(self, enabled=True, line_alpha=26, border_alpha=28, border=8):
+        super().__init__(enabled)
+        self.line_alpha = line_alpha
+        self.border_alpha = border_alpha
+        self.border = border
+
+    def build(self, size):
+        w, h = size
+        # Multiplying by (255 - a) matches alpha-blending black at alpha a
+        line = 255 - self.line_alpha
+        edge = 255 - self.border_alpha
+        self.overlay = pygame.Surface(size)
+        self.overlay.fill((255, 255, 255))
+        for y in range(0, h, 2):
+            self.overlay.fill((line, line, line), (0, y, w, 1))
+        b = self.border
+        for rect in ((0, 0, w, b), (0, h - b, w, b), (0, b, b, h - 2 * b), (w - b, b, b, h - 2 * b)):
+            self.overlay.fill((edge, edge, edge), rect, special_flags=pygame.BLEND_MULT)
+
+    def apply(self, screen, state):
+        screen.blit(self.overlay, (0, 0), special_flags=pygame.BLEND_MULT)
+
+
+class VignetteStage(PostStage):
+    """Darkens the corners; rendered small once per size and smoothscaled."""
+
+    def __init__(self, enabled=True, strength=0.45):
+        super().__init__(enabled)
+        self.strength = strength
+
+    def build(self, size):
+        sw, sh = 64, 36
+        small = pygame.Surface((sw, sh))
+        for y in range(sh):
+            for x in range(sw):
+                dx = (x + 0.5) / sw * 2 - 1
+                dy = (y + 0.5) / sh * 2 - 1
+                d = min(1.0, (dx * dx + dy * dy) / 2.0)
+                v = int(255 * (1.0 - self.strength * d * d))
+                small.set_at((x, y), (v, v, v))
+        self.overlay = pygame.transform.smoothscale(small, size)
+
+    def apply(self, screen, state):
+        screen.blit(self.overlay, (0, 0), special_flags=pygame.BLEND_MULT)
+
+
+class FlashStage(PostStage):
+    """White frame around the window while the turtle is invulnerable."""
+
+    def __init__(self, enabled=True, thickness=8):
+        super().__init__(enabled)
+        self.thickness = thickness
+
+    def build(self, size):
+        w, h = size
+        b = self.thickness
+        self.rects = [pygame.Rect(r) for r in
+                      ((0, 0, w, b), (0, h - b, w, b), (0, 0, b, h), (w - b, 0, b, h))]
+
+    def active(self, state):
+        return self.enabled and state.get("flash")
+
+    def apply(self, screen, state):
+        for rect in self.rects:
+            screen.fill((255, 255, 255), rect)
+
+
+class TintStage(PostStage):
+    """Washes the frame with state['tint'] = (r, g, b, alpha) when set."""
+
+    def build(self, size):
+        self.overlay = pygame.Surface(size)
+        self.color = None
+
+    def active(self, state):
+        return self.enabled and state.get("tint")
+
+    def apply(self, screen, state):
+        tint = state["tint"]
+        if tint != self.color:
+            self.color = tint
+            self.overlay.fill(tint[:3])
+            # Surface-wide alpha is far cheaper to blit than per-pixel alpha
+            self.overlay.set_alpha(tint[3])
+        screen.blit(self.overlay, (0, 0))
+
+
+class PostPipeline:
+    """
+    Runs the enabled stages, in order, over the presented frame: the whole
+    window, or only the picture inside the letterbox bars.
+    """
+
+    def __init__(self, stages):
+        self.stages = list(stages)
+
+    def apply(self, screen, **state):
+        size = screen.get_size()
+        for stage in self.stages:
+            if stage.active(state):
+                stage.prepare(size)
+                stage.apply(screen, state)
@@ -0,0 +1,182 @@
+import time
+
+import pygame
+
+try:  # numpy is only needed for the Scale3x filter
+    import numpy
+except ImportError:
+    numpy = None
+
+######################################################################
+# Presentation: getting the low-res base surface onto the window
+######################################################################
+
+# stretch  - scale to the full window (original behaviour, may distort)
+# integer  - largest whole-number nearest-neighbour scale, letterboxed
+# scale2x  - Scale2x edge-smoothing filter, then integer scale
+# scale3x  - Scale3x filter (needs numpy), then integer scale
+PRESENT_MODES = ("stretch", "integer", "scale2x", "scale3x")
+
+
+def _scale3x(src, dest):
+    """Vectorised Scale3x (AdvMAME3x) from src into a 3x sized dest."""
+    p = pygame.surfarray.array2d(src)
+    p = numpy.pad(p, 1, mode='edge')
+    e = p[1:-1, 1:-1]
+    a, b, c = p[:-2, :-2], p[1:-1, :-2], p[2:, :-2]
+    d, f = p[:-2, 1:-1], p[2:, 1:-1]
+    g, h, i = p[:-2, 2:], p[1:-1, 2:], p[2:, 2:]
+
+    active = (b != h) & (d != f)
+    db, bf, dh, hf = d == b, b == f, d == h, h == f
+    w, hgt = e.shape
+    out = numpy.empty((w * 3, hgt * 3), dtype=p.dtype)
+
+    def pick(cond, other):
+        return numpy.where(active & cond, other, e)
+
+    out[0::3, 0::3] = pick(db, d)
+    out[1::3, 0::3] = pick((db & (e != c)) | (bf & (e != a)), b)
+    out[2::3, 0::3] = pick(bf, f)
+    out[0::3, 1::3] = pick((db & (e != g)) | (dh & (e != a)), d)
+    out[1::3, 1::3] = e
+    out[2::3, 1::3] = pick((bf & (e != i)) | (hf & (e != c)), f)
+    out[0::3, 2::3] = pick(dh, d)
+    out[1::3, 2::3] = pick((dh & (e != i)) | (hf & (e != g)), h)
+    out[2::3, 2::3] = pick(hf, f)
+    pygame.surfarray.blit_array(dest, out)
+
+
+class Presenter:
+    """
+    Copies the base surface to the window in one of PRESENT_MODES.
+
+    Everything that depends on the window or base size (filter buffers and
+    the letterboxed destination subsurface of the screen) is cached and only
+    rebuilt when one of those sizes changes. The time each mode takes is
+    tracked as a moving average so the cheapest one for the current window
+    can be chosen with pick_fastest().
+
+    An 8-bit (palettized) base is first converted to the screen's format at
+    base resolution; that is cheaper than scaling the indices and letting
+    SDL convert every window pixel.
+
+    With a scaler (an ecco.bands.BandScaler) the scale up to the window is
+    split into bands across threads.
+    """
+
+    def __init__(self, mode="stretch", scaler=None):
+        self.modes = tuple(m for m in PRESENT_MODES if m != "scale3x" or numpy is not None)
+        self.mode = mode if mode in self.modes else "stretch"
+        self.cost_ms = {}
+        self._layout_key = None
+        self._dest = None
+        self._filtered = None
+        self._clear_frames = 0
+        self._truecolor = None
+        self.scaler = scaler
+
+    def invalidate(self):
+        """
+        Forget the layout after any set_mode(). The display surface can keep
+        its size (and its Python object) while SDL moves its pixels, which
+        would leave the cached destination subsurface pointing at freed memory.
+        """
+        self._layout_key = None
+        self._dest = None
+        if self.scaler is not None:
+            self.scaler.invalidate()
+
+    def cycle(self):
+        self.mode = self.modes[(self.modes.index(self.mode) + 1) % len(self.modes)]
+        self._layout_key = None
+        return self.mode
+
+    def _layout(self, base, screen):
+        bw, bh = base.get_size()
+        sw, sh = screen.get_size()
+        key = (self.mode, bw, bh, sw, sh, id(screen))
+        if key == self._layout_key:
+            return
+        self._layout_key = key
+        self._filtered = None
+
+        if self.mode == "stretch":
+            self._dest = None
+            return
+
+        factor = {"scale2x": 2, "scale3x": 3}.get(self.mode, 1)
+        if factor > 1:
+            self._filtered = pygame.Surface((bw * factor, bh * factor), 0, base)
+        fw, fh = bw * factor, bh * factor
+        k = max(1, min(sw // fw, sh // fh))
+        dw, dh = min(sw, fw * k), min(sh, fh * k)
+        rect = pygame.Rect((sw - dw) // 2, (sh - dh) // 2, dw, dh)
+        self._dest = screen.subsurface(rect)
+        # Letterbox bars only need clearing when the layout changes (twice,
+        # in case the display is double buffered)
+        self._clear_frames = 2
+
+    def present(self, base, screen):
+        start = time.perf_counter()
+        if base.get_bitsize() == 8:
+            if self._truecolor is None or self._truecolor.get_size() != base.get_size():
+                self._truecolor = pygame.Surface(base.get_size(), 0, screen)
+            self._truecolor.blit(base, (0, 0))
+            base = self._truecolor
+        self._layout(base, screen)
+
+        if self.mode == "stretch":
+            self._scale(base, screen)
+        else:
+            if self._clear_frames:
+                screen.fill((0, 0, 0))
+                self._clear_frames -= 1
+            src = base
+            if self.mode == "scale2x":
+                src = pygame.transform.scale2x(base, self._filtered)
+            elif self.mode == "scale3x":
+                _scale3x(base, self._filtered)
+                src = self._filtered
+            if src.get_size() == self._dest.get_size():
+                self._dest.blit(src, (0, 0))
+            else:
+                self._scale(src, self._dest)
+
+        ms = (time.perf_counter() - start) * 1000.0
+        prev = self.cost_ms.get(self.mode)
+        self.cost_ms[self.mode] = ms if prev is None else prev * 0.9 + ms * 0.1
+        return ms
+
+    def target(self, screen):
+        """
+        The part of screen present() drew the frame on: the letterboxed
+        subsurface, or the whole screen when stretching. Window effects go
+        here, so the bars (cleared only after a layout change) stay black.
+        """
+        return self._dest if self._dest is not None else screen
+
+    def _scale(self, src, dest):
+        if self.scaler is not None:
+            self.scaler.scale(src, dest)
+        else:
+            pygame.transform.scale(src, dest.get_size(), dest)
+
+    def pick_fastest(self, base, screen, frames=10):
+        """Time every mode on the current window and switch to the cheapest."""
+        timings = {}
+        for mode in self.modes:
+            self.mode = mode
+            self._layout_key = None
+            self.present(base, screen)  # Warm up buffers outside the timing
+            start = time.perf_counter()
+            for _ in range(frames):
+                self.present(base, screen)
+            timings[mode] = (time.perf_counter() - start) * 1000.0 / frames
+        self.mode = min(timings, key=timings.get)
+        self._layout_key = None
+        return timings
+
+    def report(self):
+        cost = self.cost_ms.get(self.mode)
+        return f"Present: {self.mode}" + (f" {cost:.2f}ms" if cost is not None else "")
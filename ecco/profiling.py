@@ -0,0 +1,89 @@
+import cProfile
+import io
+import json
+import pstats
+import threading
+import time
+import tracemalloc
+
+from .config import PROFILE_DIR, PROFILE_CAPTURE_SEC
+
+######################################################################
+# On-demand profiling capture
+######################################################################
+
+
+class ProfileCapture:
+    """
+    Captures the next `seconds` of the game with cProfile and tracemalloc.
+
+    Nothing is installed until start() is called, so an idle capture costs
+    nothing beyond the `active` check. When the time is up, the results are
+    written on a background thread:
+
+      profile-<stamp>.prof       cProfile stats (snakeviz, pstats, ...)
+      profile-<stamp>.txt        game context, top allocations, top functions
+    """
+
+    def __init__(self, directory=PROFILE_DIR, seconds=PROFILE_CAPTURE_SEC,
+                 top=25, traceback_frames=1):
+        self.directory = directory
+        self.seconds = seconds
+        self.top = top
+        self.traceback_frames = traceback_frames
+        self.active = False
+        self.last_path = None
+        self._profiler = None
+        self._traced = False
+        self._context = None
+        self._ends_at = 0.0
+
+    def remaining(self):
+        return max(0.0, self._ends_at - time.perf_counter()) if self.active else 0.0
+
+    def start(self, context):
+        if self.active:
+            return
+        self._context = {"started": dict(context)}
+        self._traced = tracemalloc.is_tracing()
+        if not self._traced:
+            tracemalloc.start(self.traceback_frames)
+        self._profiler = cProfile.Profile()
+        self.active = True
+        self._ends_at = time.perf_counter() + self.seconds
+        self._profiler.enable()
+
+    def stop(self, context):
+        if not self.active:
+            return
+        self._profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        if not self._traced:
+            tracemalloc.stop()
+        self.active = False
+        self._context["ended"] = dict(context)
+        self._context["seconds"] = self.seconds
+
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.last_path = self.directory / f"profile-{stamp}.prof"
+        threading.Thread(target=self._write,
+                         args=(self._profiler, snapshot, self._context, self.last_path),
+                         daemon=True).start()
+        self._profiler = None
+
+    def _write(self, profiler, snapshot, context, path):
+        self.directory.mkdir(parents=True, exist_ok=True)
+        profiler.dump_stats(str(path))
+
+        out = io.StringIO()
+        out.write(json.dumps(context, indent=2, default=str) + "\n\n")
+        out.write(f"Top {self.top} allocations by line\n")
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        ))
+        for stat in snapshot.statistics("lineno")[:self.top]:
+            out.write(f"  {stat}\n")
+        out.write(f"\nTop {self.top} functions by cumulative time\n")
+        pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(self.top)
+        path.with_suffix(".txt").write_text(out.getvalue(), encoding="utf-8")
@@ -0,0 +1,111 @@
+from collections import deque
+
+from .config import FPS, SCALE, ENABLE_CAUSTICS
+
+######################################################################
+# Adaptive quality governor
+######################################################################
+
+
+class QualityTier:
+    def __init__(self, name, caustics=ENABLE_CAUSTICS, parallax_layers=2,
+                 max_particles=200, simple_creatures=False,
+                 max_jellies=30, max_bags=20, max_creatures=15, scale=SCALE):
+        self.name = name
+        self.caustics = caustics
+        self.parallax_layers = parallax_layers
+        self.max_particles = max_particles
+        self.simple_creatures = simple_creatures
+        self.max_jellies = max_jellies
+        self.max_bags = max_bags
+        self.max_creatures = max_creatures
+        self.scale = scale
+
+
+# Ordered best to cheapest; each tier keeps every saving of the one before
+QUALITY_TIERS = (
+    QualityTier("full"),
+    QualityTier("no caustics", caustics=False),
+    QualityTier("one parallax layer", caustics=False, parallax_layers=1),
+    QualityTier("few particles", caustics=False, parallax_layers=1, max_particles=24),
+    QualityTier("simple creatures", caustics=False, parallax_layers=1, max_particles=24,
+                simple_creatures=True),
+    QualityTier("low entity caps", caustics=False, parallax_layers=0, max_particles=12,
+                simple_creatures=True, max_jellies=18, max_bags=12, max_creatures=8),
+    QualityTier("low resolution", caustics=False, parallax_layers=0, max_particles=12,
+                simple_creatures=True, max_jellies=18, max_bags=12, max_creatures=8,
+                scale=SCALE + 2),
+)
+
+
+class QualityGovernor:
+    """
+    Steps through QUALITY_TIERS based on the measured work time per frame
+    (time spent in the frame excluding clock.tick's sleep).
+
+    Hysteresis: quality drops when the rolling average stays above
+    `down_ratio` of the frame budget for `down_hold` seconds, and only comes
+    back when it stays under `up_ratio` for `up_hold` seconds. Every step-up
+    that is undone shortly afterwards doubles the wait before the next one.
+    """
+
+    def __init__(self, target_fps=FPS, window=30, down_ratio=0.9, up_ratio=0.55,
+                 down_hold=1.0, up_hold=3.0, tiers=QUALITY_TIERS):
+        self.tiers = tiers
+        self.level = 0
+        self.budget_ms = 1000.0 / target_fps
+        self.samples = deque(maxlen=window)
+        self.down_ratio = down_ratio
+        self.up_ratio = up_ratio
+        self.down_hold = down_hold
+        self.base_up_hold = up_hold
+        self.up_hold = up_hold
+        self._over = 0.0
+        self._under = 0.0
+        self._since_change = 0.0
+        self._last_step_up = False
+
+    @property
+    def tier(self):
+        return self.tiers[self.level]
+
+    def average_ms(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def _change(self, step):
+        self.level += step
+        self.samples.clear()
+        self._over = self._under = 0.0
+        if step > 0 and self._last_step_up and self._since_change < self.up_hold * 2:
+            # The tier we just restored could not hold: back off longer
+            self.up_hold = min(self.up_hold * 2, 60.0)
+        elif step < 0 and self._since_change > self.up_hold * 4:
+            self.up_hold = self.base_up_hold
+        self._last_step_up = step < 0
+        self._since_change = 0.0
+
+    def update(self, work_ms, dt_ms):
+        """Feed one frame's timing; returns True when the tier changed."""
+        dt_sec = dt_ms / 1000.0
+        self.samples.append(work_ms)
+        self._since_change += dt_sec
+        if len(self.samples) < self.samples.maxlen:
+            return False
+
+        avg = self.average_ms()
+        if avg > self.budget_ms * self.down_ratio:
+            self._over += dt_sec
+            self._under = 0.0
+        elif avg < self.budget_ms * self.up_ratio:
+            self._under += dt_sec
+            self._over = 0.0
+        else:
+            self._over = self._under = 0.0
+
+        if self._over >= self.down_hold and self.level < len(self.tiers) - 1:
+            self._change(1)
+            return True
+        if self._under >= self.up_hold and self.level > 0:
+            self._change(-1)
+            return True
+        return False
@@ -0,0 +1,154 @@
+import heapq
+import random
+import time
+from collections import deque
+
+######################################################################
+# Time-based event scheduler
+######################################################################
+
+
+def poisson_interval(rate, rng=random):
+    """Seconds until the next event of a Poisson process (rate in events/sec)."""
+    if rate <= 0:
+        return float('inf')
+    return rng.expovariate(rate)
+
+
+class EventScheduler:
+    """
+    Min-heap of named events on a game clock measured in seconds.
+
+    Recurring events are Poisson processes: the gap to the next occurrence is
+    drawn from an exponential distribution when the previous one fires, so
+    their frequency is independent of the frame rate and costs one RNG call
+    per event instead of one per frame. A rate may be a callable, evaluated
+    each time the next gap is drawn (e.g. spawn rates that grow with score).
+    """
+
+    def __init__(self, rng=None):
+        self.rng = rng or random.Random()
+        self.now = 0.0
+        self._heap = []
+        self._seq = 0
+        # Bumped on cancel so stale heap entries are skipped lazily
+        self._generation = {}
+        # Last rate each name was scheduled with, for restore()
+        self._rates = {}
+
+    def _push(self, when, name, rate):
+        self._seq += 1
+        gen = self._generation.get(name, 0)
+        self._rates[name] = rate
+        heapq.heappush(self._heap, (when, self._seq, name, gen, rate))
+
+    def _rate(self, rate):
+        return rate() if callable(rate) else rate
+
+    def every(self, name, rate):
+        """Schedule a recurring Poisson event averaging `rate` per second."""
+        self.cancel(name)
+        self._push(self.now + poisson_interval(self._rate(rate), self.rng), name, rate)
+
+    def after(self, name, delay):
+        """Schedule a one-shot event `delay` seconds from now."""
+        self.cancel(name)
+        self._push(self.now + max(0.0, delay), name, None)
+
+    def cancel(self, name):
+        self._generation[name] = self._generation.get(name, 0) + 1
+
+    def clear(self):
+        self._heap.clear()
+        self._generation.clear()
+        self.now = 0.0
+
+    def pending(self):
+        """Live (name, due time) pairs in due order, for snapshots."""
+        return [(name, when) for when, _, name, gen, _ in sorted(self._heap)
+                if gen == self._generation.get(name, 0)]
+
+    def restore(self, now, pending):
+        """
+        Reset the clock and queue to a pending() list. Rates cannot be
+        serialised, so each name gets back the rate it was last scheduled
+        with on this scheduler.
+        """
+        self._heap.clear()
+        self._generation.clear()
+        self.now = now
+        for name, when in pending:
+            self._push(when, name, self._rates.get(name))
+
+    def advance(self, dt_sec):
+        """Move the clock forward and return the names of due events in order."""
+        self.now += dt_sec
+        fired = []
+        heap = self._heap
+        while heap and heap[0][0] <= self.now:
+            when, _, name, gen, rate = heapq.heappop(heap)
+            if gen != self._generation.get(name, 0):
+                continue
+            fired.append(name)
+            if rate is not None:
+                self._push(when + poisson_interval(self._rate(rate), self.rng), name, rate)
+        return fired
+
+
+class IdleTaskQueue:
+    """
+    FIFO of named jobs (cache warm-ups) run in the spare time left at the
+    end of a frame. A job is a zero-argument callable, or a generator that
+    does one slice of a larger build per next() and is stepped until it
+    finishes. A step only starts when its expected cost fits in what is
+    left: the cost of each job name is learned from its runs, and a name
+    not seen yet is only tried with half a frame to spare. A step that costs
+    more than a whole frame never fits, so it runs first thing in a later
+    run() instead, a frame to itself well before its result is needed.
+    """
+
+    def __init__(self, frame_ms=1000.0 / 60):
+        self.frame_ms = frame_ms
+        self.cost_ms = {}  # Job name -> expected cost of one step
+        self._tasks = deque()
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def add(self, tasks):
+        """Queue (name, job) pairs."""
+        self._tasks.extend(tasks)
+
+    def clear(self):
+        self._tasks.clear()
+
+    def run(self, budget_ms):
+        """Run the queued steps that fit in budget_ms, in order; returns how many ran."""
+        start = time.perf_counter()
+        done = 0
+        waiting = deque()
+        while self._tasks:
+            name, job = self._tasks.popleft()
+            expected = self.cost_ms.get(name, self.frame_ms / 2)
+            fits = expected <= budget_ms - (time.perf_counter() - start) * 1000.0
+            if not fits and not (done == 0 and expected > self.frame_ms):
+                waiting.append((name, job))  # Try again next frame
+                continue
+            began = time.perf_counter()
+            if callable(job):
+                job()
+                finished = True
+            else:
+                finished = next(job, _FINISHED) is _FINISHED
+            ms = (time.perf_counter() - began) * 1000.0
+            # Rise at once, fall slowly: a cache hit shouldn't hide a rebuild
+            prev = self.cost_ms.get(name)
+            self.cost_ms[name] = ms if prev is None or ms > prev else prev * 0.8 + ms * 0.2
+            done += 1
+            if not finished:
+                self._tasks.appendleft((name, job))  # Its next step, if it fits
+        self._tasks = waiting
+        return done
+
+
+_FINISHED = object()
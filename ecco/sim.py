@@ -0,0 +1,277 @@
+import argparse
+import multiprocessing
+import random
+import time
+
+import pygame
+
+from . import game
+from .config import FPS, SCALE, DEFAULT_W, DEFAULT_H, ENV_DURATION_SEC, CURRENT_DRIFT_SPEED
+from .environment import draw_environment
+from .game import (Turtle, CharacterType, ENVIRONMENT_ORDER, populate_world, schedule_spawns,
+                   spawn_entity, follow_camera, update_entities, resolve_collisions)
+from .quality import QUALITY_TIERS
+from .scheduler import EventScheduler
+
+######################################################################
+# Headless, gym-style environment for bots and load testing
+######################################################################
+
+# Actions: 9 headings (none, E, NE, N, NW, W, SW, S, SE), +9 to also dash
+N_ACTIONS = 18
+_HEADINGS = ((0, 0), (1, 0), (1, -1), (0, -1), (-1, -1), (-1, 0), (-1, 1), (0, 1), (1, 1))
+# Nearest entities of each kind included in the state vector
+NEAREST_K = 4
+
+
+class _Keys(dict):
+    """Stands in for pygame.key.get_pressed(); unlisted keys are up."""
+
+    def __missing__(self, key):
+        return False
+
+
+def _action_keys(action):
+    dx, dy = _HEADINGS[action % 9]
+    return _Keys({
+        pygame.K_RIGHT: dx > 0, pygame.K_LEFT: dx < 0,
+        pygame.K_DOWN: dy > 0, pygame.K_UP: dy < 0,
+        pygame.K_SPACE: action >= 9,
+    })
+
+
+_ACTION_KEYS = [_action_keys(a) for a in range(N_ACTIONS)]
+
+
+class SeaTurtleEnv:
+    """
+    The game's rules (Turtle, entity lists, spawns, collisions, zone cycle)
+    stepped at a fixed frame time without a window, mixer or frame limiter.
+
+    reset(seed) -> obs, step(action) -> (obs, reward, done, info). obs is a
+    dict with a flat "state" vector, plus raw RGB "pixels" when obs_size is
+    given. reward is the score gained during the step.
+
+    Entities draw from the global `random` module, so each instance swaps
+    its own copy of that state in for the duration of a step; runs are
+    reproducible per seed even with several instances in one process. All
+    instances in one process share the game's base size.
+    """
+
+    def __init__(self, character=CharacterType.MALE_TURTLE, base_size=None,
+                 frame_ms=1000.0 / FPS, max_steps=None, obs_size=None):
+        self.character = character
+        self.base_w, self.base_h = base_size or (DEFAULT_W // SCALE, DEFAULT_H // SCALE)
+        self.frame_ms = frame_ms
+        self.max_steps = max_steps
+        self.obs_size = obs_size
+        self.tier = QUALITY_TIERS[0]
+        self._surface = None
+        self.reset()
+
+    def _enter(self):
+        game._window_size = (self.base_w * game._render_scale, self.base_h * game._render_scale)
+        saved = random.getstate()
+        random.setstate(self._random_state)
+        return saved
+
+    def _leave(self, saved):
+        self._random_state = random.getstate()
+        random.setstate(saved)
+
+    def reset(self, seed=None):
+        self.rng = random.Random(seed)
+        self._random_state = random.Random(self.rng.random()).getstate()
+        saved = self._enter()
+        try:
+            self.turtle = Turtle(50, self.base_h // 2, self.character)
+            self.jellies, self.bags, self.creatures, self.bubbles = [], [], [], []
+            self.env_index = 0
+            self.world_offset = 0
+            self.score = 0
+            self.streak = 0
+            self.steps = 0
+            self.time_ms = 0.0
+            populate_world(self.rng, self.environment, self.base_w, self.base_h,
+                           self.jellies, self.bags, self.creatures)
+            self.scheduler = EventScheduler(self.rng)
+            schedule_spawns(self.scheduler, lambda: self.score)
+            self.scheduler.after("env_switch", ENV_DURATION_SEC)
+        finally:
+            self._leave(saved)
+        return self.observe()
+
+    @property
+    def environment(self):
+        return ENVIRONMENT_ORDER[self.env_index]
+
+    def step(self, action):
+        dt = self.frame_ms
+        saved = self._enter()
+        try:
+            for event in self.scheduler.advance(dt / 1000.0):
+                if spawn_entity(event, self.rng, self.environment, self.base_w, self.base_h,
+                                self.jellies, self.bags, self.creatures):
+                    continue
+                if event == "env_switch":
+                    self.env_index = (self.env_index + 1) % len(ENVIRONMENT_ORDER)
+                    self.scheduler.after("env_switch", ENV_DURATION_SEC)
+
+            turtle = self.turtle
+            turtle.update(dt, _ACTION_KEYS[action], CURRENT_DRIFT_SPEED)
+            self.world_offset = follow_camera(turtle, self.base_w, self.world_offset)
+            update_entities(dt, CURRENT_DRIFT_SPEED, self.jellies, self.bags,
+                            self.creatures, self.bubbles, self.base_w)
+            self.jellies = self.jellies[-self.tier.max_jellies:]
+            self.bags = self.bags[-self.tier.max_bags:]
+            self.creatures = self.creatures[-self.tier.max_creatures:]
+            self.bubbles = self.bubbles[-self.tier.max_particles:]
+
+            before = self.score
+            self.score, self.streak, _ = resolve_collisions(
+                turtle, self.jellies, self.bags, self.creatures, self.bubbles,
+                self.score, self.streak)
+        finally:
+            self._leave(saved)
+
+        self.steps += 1
+        self.time_ms += dt
+        done = turtle.health <= 0 or (self.max_steps is not None and self.steps >= self.max_steps)
+        info = {"score": self.score, "health": turtle.health,
+                "environment": self.environment, "steps": self.steps}
+        return self.observe(), self.score - before, done, info
+
+    def _state(self):
+        t = self.turtle
+        w, h = float(self.base_w), float(self.base_h)
+        state = [t.x / w, t.y / h, t.vx / 300.0, t.vy / 300.0, t.health / t.max_health,
+                 1.0 if t.powered_up else 0.0, t.cooldown, float(self.env_index)]
+        for group in (self.jellies, self.bags, self.creatures):
+            nearest = sorted(group, key=lambda e: game.dist2(e.x, e.y, t.x, t.y))[:NEAREST_K]
+            for e in nearest:
+                state += [(e.x - t.x) / w, (e.y - t.y) / h]
+            state += [0.0, 0.0] * (NEAREST_K - len(nearest))
+        return state
+
+    def render(self):
+        """Draw the current frame at base resolution and return the surface."""
+        if self._surface is None or self._surface.get_size() != (self.base_w, self.base_h):
+            self._surface = pygame.Surface((self.base_w, self.base_h))
+        surf = self._surface
+        draw_environment(surf, self.environment, int(self.world_offset), int(self.time_ms),
+                         caustics=False, parallax_layers=1)
+        for group in (self.jellies, self.bags, self.creatures):
+            for e in group:
+                if game.is_visible(e, self.base_w, self.base_h):
+                    e.draw(surf)
+        for bub in self.bubbles:
+            bub.draw(surf)
+        if self.turtle.health > 0:
+            self.turtle.draw(surf)
+        return surf
+
+    def observe(self):
+        obs = {"state": self._state()}
+        if self.obs_size:
+            small = pygame.transform.scale(self.render(), self.obs_size)
+            obs["pixels"] = pygame.image.tobytes(small, "RGB")
+        return obs
+
+
+def _worker(conn, kwargs):
+    env = SeaTurtleEnv(**kwargs)
+    while True:
+        cmd, arg = conn.recv()
+        if cmd == "step":
+            obs, reward, done, info = env.step(arg)
+            if done:
+                # Auto-reset so the batch never contains finished instances
+                info["final_score"] = info["score"]
+                obs = env.reset()
+            conn.send((obs, reward, done, info))
+        elif cmd == "reset":
+            conn.send(env.reset(arg))
+        elif cmd == "close":
+            conn.close()
+            return
+
+
+class VecSeaTurtleEnv:
+    """
+    N independent SeaTurtleEnv instances, one worker process each. step()
+    sends every action before collecting any result, so instances advance
+    in parallel. Finished instances reset themselves automatically.
+    """
+
+    def __init__(self, n, **env_kwargs):
+        self.n = n
+        self._conns = []
+        self._procs = []
+        for _ in range(n):
+            parent, child = multiprocessing.Pipe()
+            proc = multiprocessing.Process(target=_worker, args=(child, env_kwargs), daemon=True)
+            proc.start()
+            child.close()
+            self._conns.append(parent)
+            self._procs.append(proc)
+
+    def reset(self, seed=None):
+        for i, conn in enumerate(self._conns):
+            conn.send(("reset", None if seed is None else seed + i))
+        return [conn.recv() for conn in self._conns]
+
+    def step(self, actions):
+        for conn, action in zip(self._conns, actions):
+            conn.send(("step", action))
+        results = [conn.recv() for conn in self._conns]
+        obs, rewards, dones, infos = zip(*results)
+        return list(obs), list(rewards), list(dones), list(infos)
+
+    def close(self):
+        for conn in self._conns:
+            try:
+                conn.send(("close", None))
+            except (BrokenPipeError, OSError):
+                pass
+        for proc in self._procs:
+            proc.join(timeout=2.0)
+
+
+def benchmark(n_envs=1, steps=2000, seed=0, obs_size=None):
+    """Drive random actions and return total steps per second."""
+    rng = random.Random(seed)
+    if n_envs <= 1:
+        env = SeaTurtleEnv(obs_size=obs_size)
+        env.reset(seed)
+        start = time.perf_counter()
+        for _ in range(steps):
+            _, _, done, _ = env.step(rng.randrange(N_ACTIONS))
+            if done:
+                env.reset()
+        return steps / (time.perf_counter() - start)
+
+    vec = VecSeaTurtleEnv(n_envs, obs_size=obs_size)
+    try:
+        vec.reset(seed)
+        start = time.perf_counter()
+        for _ in range(steps):
+            vec.step([rng.randrange(N_ACTIONS) for _ in range(n_envs)])
+        return steps * n_envs / (time.perf_counter() - start)
+    finally:
+        vec.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless Sea Turtle Echo throughput test")
+    parser.add_argument("--envs", type=int, default=1, help="parallel instances (processes)")
+    parser.add_argument("--steps", type=int, default=2000, help="steps per instance")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pixels", type=int, nargs=2, metavar=("W", "H"),
+                        help="also render a W x H pixel observation every step")
+    args = parser.parse_args(argv)
+    sps = benchmark(args.envs, args.steps, args.seed, tuple(args.pixels) if args.pixels else None)
+    print(f"{args.envs} env(s) x {args.steps} steps: {sps:,.0f} steps/s")
+
+
+if __name__ == "__main__":
+    main()
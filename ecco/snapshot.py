@@ -0,0 +1,232 @@
+import struct
+import zlib
+from collections import deque
+
+######################################################################
+# Compact game-state snapshots and the rewind buffer
+######################################################################
+
+_COUNT = struct.Struct("<H")
+_CLASS = struct.Struct("<B")
+_EVENT = struct.Struct("<Bd")
+_NOW = struct.Struct("<d")
+# random.getstate(): version, 624 words + position, gauss_next
+_RANDOM = struct.Struct("<B625I?d")
+
+
+class SnapshotCodec:
+    """
+    Packs game state into a flat little-endian byte string.
+
+    Objects are written field by field from their class's
+    `snapshot_fields` ((name, struct code) pairs) and rebuilt without
+    calling __init__, so restoring consumes no random numbers. Fixed-size
+    blocks (scalars, turtle, RNG state) come first and the entity lists
+    last, which keeps consecutive snapshots byte-aligned for delta coding.
+
+    Layout: scalars | turtle | random states | scheduler | groups
+    """
+
+    def __init__(self, scalar_format, turtle_class, classes, event_names, randoms=1):
+        self.scalars = struct.Struct("<" + scalar_format)
+        self.turtle_class = turtle_class
+        self.turtle = self._struct(turtle_class)
+        self.classes = tuple(classes)
+        self._class_index = {cls: i for i, cls in enumerate(self.classes)}
+        self._structs = [self._struct(cls) for cls in self.classes]
+        self.event_names = tuple(event_names)
+        self._event_index = {name: i for i, name in enumerate(self.event_names)}
+        self.randoms = randoms
+
+    @staticmethod
+    def _struct(cls):
+        return struct.Struct("<" + "".join(code for _, code in cls.snapshot_fields))
+
+    @staticmethod
+    def _fields(obj):
+        return [getattr(obj, name) for name, _ in type(obj).snapshot_fields]
+
+    def encode(self, scalars, turtle, random_states, scheduler_state, groups):
+        out = [self.scalars.pack(*scalars), self.turtle.pack(*self._fields(turtle))]
+        for version, words, gauss in random_states:
+            out.append(_RANDOM.pack(version, *words, gauss is not None, gauss or 0.0))
+        now, pending = scheduler_state
+        out.append(_NOW.pack(now))
+        out.append(_COUNT.pack(len(pending)))
+        for name, when in pending:
+            out.append(_EVENT.pack(self._event_index[name], when))
+        for group in groups:
+            out.append(_COUNT.pack(len(group)))
+            for obj in group:
+                i = self._class_index[type(obj)]
+                out.append(_CLASS.pack(i))
+                out.append(self._structs[i].pack(*self._fields(obj)))
+        return b"".join(out)
+
+    def _build(self, cls, st, data, offset):
+        obj = cls.__new__(cls)
+        for (name, _), value in zip(cls.snapshot_fields, st.unpack_from(data, offset)):
+            setattr(obj, name, value)
+        return obj, offset + st.size
+
+    def decode(self, data, turtle=None, n_groups=4):
+        """
+        Returns (scalars, turtle, random_states, scheduler_state, groups).
+        Turtle fields are written onto `turtle` when given, so attributes
+        that are not part of the snapshot (colours, character) survive.
+        """
+        scalars = self.scalars.unpack_from(data, 0)
+        offset = self.scalars.size
+        if turtle is None:
+            turtle = self.turtle_class.__new__(self.turtle_class)
+        for (name, _), value in zip(self.turtle_class.snapshot_fields,
+                                    self.turtle.unpack_from(data, offset)):
+            setattr(turtle, name, value)
+        offset += self.turtle.size
+
+        random_states = []
+        for _ in range(self.randoms):
+            values = _RANDOM.unpack_from(data, offset)
+            offset += _RANDOM.size
+            random_states.append((values[0], values[1:626], values[627] if values[626] else None))
+
+        now, = _NOW.unpack_from(data, offset)
+        offset += _NOW.size
+        count, = _COUNT.unpack_from(data, offset)
+        offset += _COUNT.size
+        pending = []
+        for _ in range(count):
+            i, when = _EVENT.unpack_from(data, offset)
+            offset += _EVENT.size
+            pending.append((self.event_names[i], when))
+
+        groups = []
+        for _ in range(n_groups):
+            count, = _COUNT.unpack_from(data, offset)
+            offset += _COUNT.size
+            group = []
+            for _ in range(count):
+                i, = _CLASS.unpack_from(data, offset)
+                obj, offset = self._build(self.classes[i], self._structs[i], data, offset + 1)
+                group.append(obj)
+            groups.append(group)
+        return scalars, turtle, random_states, (now, pending), groups
+
+
+def _xor(a, b):
+    """Byte-wise XOR of two strings, the shorter one padded with zeros."""
+    n = max(len(a), len(b))
+    x = int.from_bytes(a, "little") ^ int.from_bytes(b, "little")
+    return x.to_bytes(n, "little")
+
+
+class RewindBuffer:
+    """
+    Fixed-size ring of encoded snapshots, newest last.
+
+    Every `keyframe_every`-th snapshot is stored whole; the ones in between
+    are XORed against that keyframe (so unchanged bytes become zeros) and
+    zlib-compressed. When the ring is full the oldest snapshot is dropped;
+    deltas whose keyframe has been dropped are discarded with it.
+    """
+
+    def __init__(self, capacity=600, keyframe_every=30, level=1):
+        self.capacity = capacity
+        self.keyframe_every = keyframe_every
+        self.level = level
+        # (ref, raw length, compressed payload); ref is the keyframe id for
+        # keyframes and -1 - id for deltas against that keyframe
+        self._frames = deque()
+        self._keys = {}       # keyframe id -> raw bytes
+        self._next_key = 0
+        self._current_key = None
+        self._since_key = keyframe_every
+
+    def __len__(self):
+        return len(self._frames)
+
+    def clear(self):
+        self._frames.clear()
+        self._keys.clear()
+        self._since_key = self.keyframe_every
+
+    def nbytes(self):
+        return sum(len(p) for _, _, p in self._frames)
+
+    def push(self, raw):
+        if self._since_key >= self.keyframe_every:
+            key = self._next_key
+            self._next_key += 1
+            self._keys[key] = raw
+            self._frames.append((key, len(raw), zlib.compress(raw, self.level)))
+            self._since_key = 1
+            self._current_key = key
+        else:
+            delta = _xor(raw, self._keys[self._current_key])
+            self._frames.append((-1 - self._current_key, len(raw), zlib.compress(delta, self.level)))
+            self._since_key += 1
+        while len(self._frames) > self.capacity:
+            self._drop_oldest()
+
+    def _drop_oldest(self):
+        ref, _, _ = self._frames.popleft()
+        if ref >= 0:
+            self._keys.pop(ref, None)
+            # Deltas of the dropped keyframe can no longer be decoded
+            while self._frames and self._frames[0][0] == -1 - ref:
+                self._frames.popleft()
+
+    def pop(self):
+        """Remove and return the newest snapshot, or None when empty."""
+        if not self._frames:
+            return None
+        ref, size, payload = self._frames.pop()
+        data = zlib.decompress(payload)
+        if ref >= 0:
+            self._keys.pop(ref, None)
+            self._since_key = self.keyframe_every
+            return data
+        key = -1 - ref
+        if self._frames and self._frames[-1][0] in (key, ref):
+            # More of this keyframe's group remains: new pushes delta against it
+            self._current_key = key
+            self._since_key = sum(1 for f in self._frames if f[0] in (key, ref))
+        else:
+            self._since_key = self.keyframe_every
+        return _xor(data, self._keys[key])[:size]
+
+
+# ----------------------- Save files -----------------------
+
+_SAVE_MAGIC = b"ECSV"
+_SAVE_HEADER = struct.Struct("<HH")  # version, character name length
+SAVE_VERSION = 1
+
+
+def save_snapshot(path, character, raw):
+    """Write one snapshot (and the character it belongs to) to disk."""
+    name = character.encode("utf-8")
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(_SAVE_MAGIC + _SAVE_HEADER.pack(SAVE_VERSION, len(name)) + name)
+        f.write(zlib.compress(raw, 6))
+
+
+def load_snapshot(path):
+    """Return (character, raw snapshot) from save_snapshot(), or None."""
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    if data[:4] != _SAVE_MAGIC:
+        return None
+    version, size = _SAVE_HEADER.unpack_from(data, 4)
+    if version != SAVE_VERSION:
+        return None
+    start = 4 + _SAVE_HEADER.size
+    try:
+        raw = zlib.decompress(data[start + size:])
+    except zlib.error:
+        return None
+    return data[start:start + size].decode("utf-8"), raw
@@ -1,51 +1,204 @@
+import io
 import os
 import math
 import random
-import struct
+import threading
+import time
 import wave
 
 import pygame
 
+from . import synth
 from .environment import Environment
 from .config import (MUSIC_BEACH_FILE, MUSIC_CORAL_FILE, MUSIC_REEF_FILE,
                      MUSIC_OCEAN_FILE, MUSIC_RIG_FILE,
                      SFX_DASH_FILE, SFX_EAT_FILE,
                      SFX_HURT_FILE, SFX_POWERUP_FILE,
-                     ENV_DURATION_SEC)
-                     SFX_HURT_FILE, SFX_POWERUP_FILE,
+                     ENV_DURATION_SEC, MUSIC_FADE_MS,
                      AMBIENT_WAVES_FILE, AMBIENT_GULLS_FILE,
                      AMBIENT_HUM_FILE,
+                     MUSIC_STEMS, MUSIC_TEMPOS, MUSIC_LAYER_FADE_MS, MUSIC_STEM_DIR,
+                     AUDIO_CACHE,
                      ASSET_DIR)
 
 
-def write_wav_deep_synth_melody(path, tempo_bpm=100, duration_sec=90.0, sample_rate=44100):
-    melody = [
-        ("A3",2),("C4",2),("E4",2),("D4",2),
-        ("F3",2),("A3",2),("C4",2),("E4",2),
-        ("G3",2),("B3",2),("D4",2),("C4",2),
-        ("F3",2),("A3",2),("G3",2),("E3",2),
-        ("A4",1),("G4",1),("F4",2),("E4",2),("D4",2),
-        ("C4",2),("E4",2),("A3",2),("C4",2),
-        ("D4",1),("E4",1),("F4",2),("G4",2),("A4",2),
-        ("E4",4),("A3",4),
-    ]
-    bass_prog = ["A1","F1","G1","A1","F1","C1","D1","E1"]
-    bass_notes = []
-    for i in range(bars):
-        bass_notes += [(bass_prog[i % 8], 8)]
-
-    A4 = 440.0
-    NOTES = {'C':-9, 'C#':-8, 'Db':-8, 'D':-7, 'D#':-6, 'Eb':-6, 'E':-5, 'F':-4, 'F#':-3,
-             'Gb':-3, 'G':-2, 'G#':-1, 'Ab':-1, 'A':0, 'A#':1, 'Bb':1, 'B':2}
-
-    def note_to_freq(name):
-        if name is None:
-            return None
-        pitch = ''.join([c for c in name if c.isalpha() or c == '#'])
-        octave = int(''.join([c for c in name if c.isdigit()]))
-        semis = NOTES[pitch] + (octave-4)*12
-        return A4 * (2 ** (semis/12))
+######################################################################
+# The deep synth theme
+######################################################################
+
+MELODY = [
+    ("A3",2),("C4",2),("E4",2),("D4",2),
+    ("F3",2),("A3",2),("C4",2),("E4",2),
+    ("G3",2),("B3",2),("D4",2),("C4",2),
+    ("F3",2),("A3",2),("G3",2),("E3",2),
+    ("A4",1),("G4",1),("F4",2),("E4",2),("D4",2),
+    ("C4",2),("E4",2),("A3",2),("C4",2),
+    ("D4",1),("E4",1),("F4",2),("G4",2),("A4",2),
+    ("E4",4),("A3",4),
+]
+# One note per 8-beat bar; the melody and the progression both repeat
+# after 8 bars, which is the length of a music stem
+BASS_PROG = ["A1","F1","G1","A1","F1","C1","D1","E1"]
+LOOP_BARS = 8
+
+A4 = 440.0
+NOTES = {'C':-9, 'C#':-8, 'Db':-8, 'D':-7, 'D#':-6, 'Eb':-6, 'E':-5, 'F':-4, 'F#':-3,
+         'Gb':-3, 'G':-2, 'G#':-1, 'Ab':-1, 'A':0, 'A#':1, 'Bb':1, 'B':2}
+
+
+def note_to_freq(name):
+    if name is None:
+        return None
+    pitch = ''.join([c for c in name if c.isalpha() or c == '#'])
+    octave = int(''.join([c for c in name if c.isdigit()]))
+    semis = NOTES[pitch] + (octave-4)*12
+    return A4 * (2 ** (semis/12))
+
+
+def _place_line(line, spb, sample_rate, num_samples):
+    """(start sample, sample count, freq) of each note that starts in time."""
+    t = 0
+    for n, d in line:
+        start_s = int(t*spb*sample_rate)
+        end_s = min(int((t+d)*spb*sample_rate), num_samples)
+        if end_s > start_s:
+            yield start_s, end_s - start_s, note_to_freq(n)
+        t += d
+
+
+def _bass_line(num_samples, spb, sample_rate):
+    bars = int(math.ceil(num_samples / (8*spb*sample_rate)))
+    return [(BASS_PROG[i % 8], 8) for i in range(bars)]
+
+
+# Each part renders num_samples of dry mono signal, drawing any noise from
+# rng (the random module, or a seeded random.Random). Envelopes restart every
+# bar (bass, pad) / every two beats (lead), so one period of each is
+# computed and repeated. Oscillators start each note at the phase they would
+# have had running since sample 0.
+
+def _render_bass(num_samples, spb, sample_rate, rng=random):
+    bank = synth.oscillator_bank(sample_rate)
+    bass_env = synth.as_buffer(
+        min(1.0, p / (sample_rate*0.1)) * max(0.3, 1.0 - p / (8*spb*sample_rate))
+        for p in range(int(8*spb*sample_rate)))
+    dry = synth.zeros(num_samples)
+    for start, n, b in _place_line(_bass_line(num_samples, spb, sample_rate), spb, sample_rate, num_samples):
+        saw, _ = bank.render("saw", b, n, (start*b/sample_rate) % 1.0)
+        sub, _ = bank.render("sine", b*0.5, n, (start*b*0.5/sample_rate) % 1.0)
+        voice = synth.add(synth.mul(saw, 0.7), synth.mul(sub, 0.3))
+        synth.mix_into(dry, start, synth.mul(synth.mul(voice, synth.periodic(bass_env, start, n)), 0.25))
+    return dry
+
+
+def _render_lead(num_samples, spb, sample_rate, rng=random):
+    bank = synth.oscillator_bank(sample_rate)
+
+    def lead_env(note_pos):
+        attack = min(1.0, note_pos/(sample_rate*0.05))
+        decay = max(0.7, 1.0 - (note_pos-sample_rate*0.05)/(sample_rate*0.1)) if note_pos > sample_rate*0.05 else 1.0
+        sustain = 0.7
+        release = max(0.0, 1.0 - (note_pos-sample_rate*1.5)/(sample_rate*0.5)) if note_pos > sample_rate*1.5 else 1.0
+        return attack * decay * sustain * release
+    lead_env = synth.as_buffer(lead_env(p) for p in range(int(2*spb*sample_rate)))
+
+    melody = list(MELODY)
+    beats = int(math.ceil(num_samples / (spb*sample_rate)))
+    while sum(d for _, d in melody) < beats:
+        melody += MELODY
+
+    detune_cents = [-7, -3, 0, 3, 7]
+    dry = synth.zeros(num_samples)
+    for start, n, m in _place_line(melody, spb, sample_rate, num_samples):
+        lead = synth.zeros(n)
+        for cents in detune_cents:
+            freq = m * (2 ** (cents/1200))
+            saw, _ = bank.render("saw", freq, n, (start*freq/sample_rate) % 1.0)
+            lead = synth.add(lead, saw)
+        noise = synth.as_buffer([rng.random()*0.002 for _ in range(n)])
+        lead = synth.add(synth.mul(lead, 0.15 * 0.6), noise)
+        synth.mix_into(dry, start, synth.mul(synth.mul(lead, synth.periodic(lead_env, start, n)), 0.3))
+    return dry
+
+
+def _render_pad(num_samples, spb, sample_rate, rng=random):
+    """Slow-swelling root, fifth and octave two octaves over the bass, chorused."""
+    bank = synth.oscillator_bank(sample_rate)
+    bar = int(8*spb*sample_rate)
+    pad_env = synth.as_buffer(
+        min(1.0, p / (bar*0.25)) * min(1.0, (bar - p) / (bar*0.125))
+        for p in range(bar))
+    dry = synth.zeros(num_samples)
+    for start, n, b in _place_line(_bass_line(num_samples, spb, sample_rate), spb, sample_rate, num_samples):
+        pad = synth.zeros(n)
+        for ratio in (4, 6, 8):
+            for cents in (-4, 4):
+                freq = b * ratio * (2 ** (cents/1200))
+                tone, _ = bank.render("sine", freq, n, (start*freq/sample_rate) % 1.0)
+                pad = synth.add(pad, tone)
+        synth.mix_into(dry, start, synth.mul(synth.mul(pad, synth.periodic(pad_env, start, n)), 0.04))
+    return dry
+
+
+def _render_drums(num_samples, spb, sample_rate, rng=random):
+    """A kick on every other beat and a noise hat between them."""
+    kick_len = int(sample_rate*0.25)
+    # Sine falling from 170 Hz to 50 Hz; the phase is the integral of that
+    kick = synth.as_buffer(
+        math.sin(2*math.pi*(50*t + 120*0.03*(1 - math.exp(-t/0.03)))) * math.exp(-t/0.08)
+        for t in (k/sample_rate for k in range(kick_len)))
+    hat_len = int(sample_rate*0.04)
+    noise = [rng.random()*2 - 1 for _ in range(hat_len + 1)]
+    # First difference keeps the hiss and drops the low end
+    hat = synth.as_buffer((noise[k+1] - noise[k]) * math.exp(-k/(sample_rate*0.008))
+                          for k in range(hat_len))
+    dry = synth.zeros(num_samples)
+    beat = 0
+    while True:
+        start = int(beat*spb*sample_rate)
+        if start >= num_samples:
+            break
+        hit, gain = (kick, 0.35) if beat % 2 == 0 else (hat, 0.05)
+        n = min(len(hit), num_samples - start)
+        synth.mix_into(dry, start, synth.mul(hit[:n], gain))
+        beat += 1
+    return dry
+
+
+def _master(dry, wrap=False):
+    """Reverb, echoes and soft clipping; the (left, right) mix of the dry signal."""
+    # Reverb and echoes are taps 3.5k/7k (wet) and 2.5k/4.5k (L/R) samples
+    # back into the dry signal, which goes through the 0.3 send. A looped
+    # stem wraps them, so its tail rings on into its own start.
+    wet = synth.add(synth.delayed(dry, 3499, 0.3*0.4, wrap), synth.delayed(dry, 6999, 0.3*0.2, wrap))
+    sample = synth.soft_clip(synth.add(dry, wet))
+    # L/R mix with tiny detune to emulate 90s console width
+    s = synth.mul(sample, 0.85)
+    left = synth.clamp(synth.add(s, synth.delayed(dry, 2499, 0.3*0.15, wrap)))
+    right = synth.clamp(synth.add(s, synth.delayed(dry, 4499, 0.3*0.15, wrap)))
+    return left, right
+
+
+# The render_* functions return a tuple of float channel buffers (one for
+# mono, left and right for stereo) at sample_rate; write_wav_* save them as
+# 16-bit WAV files and synth_sound() turns them into a Sound directly. Those
+# that use noise take a seed, which makes their output repeatable.
+
+
+def _rng(seed):
+    return random if seed is None else random.Random(seed)
+
+
+def _write_wav(path, channels, sample_rate):
+    """path may also be a file object."""
+    with wave.open(str(path) if isinstance(path, os.PathLike) else path, 'wb') as wf:
+        wf.setnchannels(len(channels))
+        wf.setsampwidth(2)
+        wf.setframerate(sample_rate)
+        wf.writeframes(synth.pcm16(*channels))
 
+
+def render_deep_synth_melody(tempo_bpm=100, duration_sec=90.0, sample_rate=44100, seed=None):
     spb = 60.0/tempo_bpm
     # We generate enough bars to cover the requested duration
     bars = max(1, int(math.ceil((duration_sec) / (8*spb))))
@@ -53,157 +206,98 @@ def write_wav_deep_synth_melody(path, tempo_bpm=100, duration_sec=90.0, sample_r
     total_seconds = total_beats*spb
     num_samples = int(total_seconds*sample_rate)
 
-    mel_timeline = [None]*num_samples
-    bass_timeline = [None]*num_samples
-
-    def place_line(line, start_beat, timeline):
-        t = start_beat
-        for n, d in line:
-            start_s = int(t*spb*sample_rate)
-            end_s = int((t+d)*spb*sample_rate)
-            f = note_to_freq(n)
-            for i in range(start_s, min(end_s, num_samples)):
-                timeline[i] = f
-            t += d
-
-    beats_total = sum(d for _, d in melody)
-    bars_len_beats = bars * 8
-    while beats_total < bars_len_beats:
-        melody += melody
-        beats_total = sum(d for _, d in melody)
-
-    place_line(melody[:bars_len_beats], 0, mel_timeline)
-    place_line(bass_notes, 0, bass_timeline)
-
-    # Stereo mix buffers (L/R)
-    data = bytearray()
-    reverb_buffer = [0.0] * 8000
-    reverb_idx = 0
-
-    for i in range(num_samples):
-        m = mel_timeline[i]
-        b = bass_timeline[i]
-        sample = 0.0
+    dry = synth.add(_render_bass(num_samples, spb, sample_rate),
+                    _render_lead(num_samples, spb, sample_rate, _rng(seed)))
+    return _master(dry)
 
-        if b is not None:
-            t = (i/sample_rate)*b
-            saw = 2.0 * ((t % 1.0) - 0.5)
-            sub = math.sin(2*math.pi*b*0.5*t/sample_rate)
-            env = min(1.0, (i % int(8*spb*sample_rate)) / (sample_rate*0.1))
-            env *= max(0.3, 1.0 - ((i % int(8*spb*sample_rate)) / (8*spb*sample_rate)))
-            sample += 0.25 * (saw * 0.7 + sub * 0.3) * env
-
-        if m is not None:
-            lead = 0.0
-            detune_cents = [-7, -3, 0, 3, 7]
-            for cents in detune_cents:
-                freq = m * (2 ** (cents/1200))
-                t = (i/sample_rate)*freq
-                saw = 2.0 * ((t % 1.0) - 0.5)
-                lead += saw * 0.15
-
-            note_pos = i % int(2*spb*sample_rate)
-            attack = min(1.0, note_pos/(sample_rate*0.05))
-            decay = max(0.7, 1.0 - (note_pos-sample_rate*0.05)/(sample_rate*0.1)) if note_pos > sample_rate*0.05 else 1.0
-            sustain = 0.7
-            release = max(0.0, 1.0 - (note_pos-sample_rate*1.5)/(sample_rate*0.5)) if note_pos > sample_rate*1.5 else 1.0
-            env = attack * decay * sustain * release
-
-            lead = lead * 0.6 + random.random()*0.002
-            sample += lead * env * 0.3
-
-        reverb_buffer[reverb_idx] = sample * 0.3
-        reverb_idx = (reverb_idx + 1) % len(reverb_buffer)
-        reverb = reverb_buffer[(reverb_idx - 3500) % len(reverb_buffer)] * 0.4
-        reverb += reverb_buffer[(reverb_idx - 7000) % len(reverb_buffer)] * 0.2
-        sample += reverb
-
-        if abs(sample) > 0.7:
-            sample = math.tanh(sample)
-        else:
-            sample = max(-1.0, min(1.0, sample))
-
-        # Subtle chorus + stereo spread: 6 ms delay to right, 3 ms to left
-        delay_l = int(0.003 * sample_rate)
-        delay_r = int(0.006 * sample_rate)
-        idx_l = max(0, i - delay_l)
-        idx_r = max(0, i - delay_r)
-
-        # Simple echoes using reverb buffer content
-        echo_l = reverb_buffer[(reverb_idx - 2500) % len(reverb_buffer)] * 0.15
-        echo_r = reverb_buffer[(reverb_idx - 4500) % len(reverb_buffer)] * 0.15
-
-        # The dry signal
-        s = sample
-        # L/R mix with tiny detune to emulate 90s console width
-        left = s * 0.85 + echo_l
-        right = s * 0.85 + echo_r
-
-        left = max(-1.0, min(1.0, left))
-        right = max(-1.0, min(1.0, right))
-
-        data += struct.pack('<hh', int(left*32767), int(right*32767))
-
-    with wave.open(path, 'wb') as wf:
-        wf.setnchannels(2)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(data)
 
+def write_wav_deep_synth_melody(path, tempo_bpm=100, duration_sec=90.0, sample_rate=44100):
+    _write_wav(path, render_deep_synth_melody(tempo_bpm, duration_sec, sample_rate), sample_rate)
 
-def write_wav_synth_beep(path, freq=880, ms=150, sample_rate=44100,
-                         shape="saw", volume=0.3):
+
+# Tempo of each environment's whole track (when not using stems)
+TRACK_TEMPOS = {
+    Environment.BEACH: 120,
+    Environment.CORAL_COVE: 100,
+    Environment.ROCKY_REEF: 90,
+    Environment.OCEAN_FLOOR: 70,
+    Environment.OIL_RIG: 60,
+}
+
+
+_STEM_PARTS = {"bass": _render_bass, "lead": _render_lead,
+               "pad": _render_pad, "drums": _render_drums}
+STEMS = tuple(_STEM_PARTS)
+
+
+def render_music_stem(stem, tempo_bpm=100, sample_rate=44100, seed=None, bars=LOOP_BARS):
+    """
+    One seamlessly looping part of the theme. Drums repeat every bar and are
+    one bar long; the other stems run the full LOOP_BARS, a whole number of
+    drum bars, so stems started together stay in step for good. Fewer bars
+    give an excerpt from the start.
+    """
+    spb = 60.0/tempo_bpm
+    bar = int(8*spb*sample_rate)
+    num_samples = bar if stem == "drums" else bar * bars
+    return _master(_STEM_PARTS[stem](num_samples, spb, sample_rate, _rng(seed)), wrap=True)
+
+
+def write_wav_music_stem(path, stem, tempo_bpm=100, sample_rate=44100):
+    _write_wav(path, render_music_stem(stem, tempo_bpm, sample_rate), sample_rate)
+
+
+# Synthesized SFX (render_synth_beep arguments)
+SFX_BEEPS = {
+    "eat": dict(freq=330, ms=180, shape="sine", volume=0.2),  # Softer chomp sound
+    "hurt": dict(freq=110, ms=300, shape="saw"),
+    "dash": dict(freq=293, ms=150, shape="saw"),
+    "powerup": dict(freq=440, ms=500, shape="powerup"),
+}
+
+
+def render_synth_beep(freq=880, ms=150, sample_rate=44100, shape="saw", volume=0.3):
     samples = int(sample_rate * ms/1000.0)
-    data = bytearray()
-    for i in range(samples):
-        t = i/sample_rate
-        if shape == "saw":
-            val = 2.0 * ((freq*t % 1.0) - 0.5)
-        elif shape == "sine":
-            val = math.sin(2*math.pi*freq*t)
-        elif shape == "powerup":
-            val = math.sin(2*math.pi*freq*t) * 0.5
-            val += math.sin(2*math.pi*freq*1.5*t) * 0.3
-            val += math.sin(2*math.pi*freq*2*t) * 0.2
-        else:
-            val = 1.0 if math.sin(2*math.pi*freq*t) >= 0 else -1.0
+    if shape not in ("saw", "sine", "powerup"):
+        shape = "square"
+    val, _ = synth.oscillator_bank(sample_rate).render(shape, freq, samples)
 
+    def fade(i):
         attack = min(1.0, i/(samples*0.1))
         release = max(0.0, 1.0 - (i-samples*0.7)/(samples*0.3)) if i > samples*0.7 else 1.0
-        fade = attack * release
+        return attack * release
 
-        s = max(-1.0, min(1.0, val * volume * fade))
-        data += struct.pack('<h', int(s*32767))
+    fade = synth.as_buffer(fade(i) for i in range(samples))
+    return (synth.clamp(synth.mul(synth.mul(val, fade), volume)),)
 
-    with wave.open(path, 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(data)
 
+def write_wav_synth_beep(path, freq=880, ms=150, sample_rate=44100,
+                         shape="saw", volume=0.3):
+    _write_wav(path, render_synth_beep(freq, ms, sample_rate, shape, volume), sample_rate)
 
-def write_wav_ambient_waves(path, duration=4, sample_rate=44100):
+
+def render_ambient_waves(duration=4, sample_rate=44100, seed=None):
+    rng = _rng(seed)
     samples = int(sample_rate * duration)
-    data = bytearray()
+    data = []
     for i in range(samples):
         t = i / sample_rate
         slow = math.sin(2 * math.pi * 0.25 * t) * 0.5 + 0.5
         val = (math.sin(2 * math.pi * 0.5 * t) +
                0.5 * math.sin(2 * math.pi * 0.8 * t)) * 0.3
-        noise = (random.random() * 2 - 1) * 0.02
+        noise = (rng.random() * 2 - 1) * 0.02
         sample = (val + noise) * slow
-        sample = max(-1.0, min(1.0, sample))
-        data += struct.pack('<h', int(sample * 32767))
-    with wave.open(path, 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(data)
+        data.append(max(-1.0, min(1.0, sample)))
+    return (synth.as_buffer(data),)
 
 
-def write_wav_ambient_gulls(path, duration=4, sample_rate=44100):
+def write_wav_ambient_waves(path, duration=4, sample_rate=44100):
+    _write_wav(path, render_ambient_waves(duration, sample_rate), sample_rate)
+
+
+def render_ambient_gulls(duration=4, sample_rate=44100):
     samples = int(sample_rate * duration)
-    data = bytearray()
+    data = []
     period = int(sample_rate * 2)
     chirp = int(sample_rate * 0.5)
     for i in range(samples):
@@ -214,27 +308,87 @@ def write_wav_ambient_gulls(path, duration=4, sample_rate=44100):
             env = 1.0 - (cycle / chirp)
             sample = (math.sin(2 * math.pi * 1000 * t) * 0.3 +
                       math.sin(2 * math.pi * 1500 * t) * 0.2) * env
-        data += struct.pack('<h', int(max(-1.0, min(1.0, sample)) * 32767))
-    with wave.open(path, 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(data)
+        data.append(max(-1.0, min(1.0, sample)))
+    return (synth.as_buffer(data),)
 
 
-def write_wav_ambient_hum(path, duration=4, sample_rate=44100):
+def write_wav_ambient_gulls(path, duration=4, sample_rate=44100):
+    _write_wav(path, render_ambient_gulls(duration, sample_rate), sample_rate)
+
+
+def render_ambient_hum(duration=4, sample_rate=44100):
     samples = int(sample_rate * duration)
-    data = bytearray()
+    data = []
     for i in range(samples):
         t = i / sample_rate
         sample = (math.sin(2 * math.pi * 60 * t) +
                   0.5 * math.sin(2 * math.pi * 120 * t)) * 0.3
-        data += struct.pack('<h', int(max(-1.0, min(1.0, sample)) * 32767))
-    with wave.open(path, 'wb') as wf:
-        wf.setnchannels(1)
-        wf.setsampwidth(2)
-        wf.setframerate(sample_rate)
-        wf.writeframes(data)
+        data.append(max(-1.0, min(1.0, sample)))
+    return (synth.as_buffer(data),)
+
+
+def write_wav_ambient_hum(path, duration=4, sample_rate=44100):
+    _write_wav(path, render_ambient_hum(duration, sample_rate), sample_rate)
+
+
+# ----------------------- Sounds in the mixer's format -----------------------
+
+def mixer_format():
+    """(frequency, channels) of the open mixer if it mixes signed 16-bit, else None."""
+    init = pygame.mixer.get_init()
+    if not init or init[1] != -16:
+        return None
+    return init[0], init[2]
+
+
+def _wav_format(path):
+    try:
+        with wave.open(str(path), 'rb') as wf:
+            return wf.getframerate(), wf.getnchannels(), wf.getsampwidth()
+    except (OSError, EOFError, wave.Error):
+        return None
+
+
+def _fit_channels(channels, count):
+    """Down-mix stereo to mono, or repeat channels to fill a wider layout."""
+    if len(channels) == count:
+        return channels
+    if count == 1:
+        return (synth.mul(synth.add(channels[0], channels[1]), 0.5),)
+    return tuple(channels[i % len(channels)] for i in range(count))
+
+
+def synth_sound(render, cache_path=None, **kwargs):
+    """
+    A Sound built straight from render(sample_rate=..., **kwargs), rendered
+    at the mixer's own rate and channel layout so SDL neither reads a file
+    nor resamples. A WAV at cache_path in exactly that format is loaded
+    instead; with AUDIO_CACHE a fresh render is stored there for next time.
+    """
+    fmt = mixer_format()
+    rate, count = fmt if fmt is not None else (44100, None)
+    if cache_path is not None and fmt is not None and _wav_format(cache_path) == (rate, count, 2):
+        return pygame.mixer.Sound(str(cache_path))
+    channels = render(sample_rate=rate, **kwargs)
+    if count is not None:
+        channels = _fit_channels(channels, count)
+    if AUDIO_CACHE and cache_path is not None:
+        # Written under a temporary name so a quit mid-write can't leave a
+        # truncated file behind; failing to cache costs nothing but time
+        tmp = str(cache_path) + ".tmp"
+        try:
+            os.makedirs(os.path.dirname(tmp), exist_ok=True)
+            _write_wav(tmp, channels, rate)
+            os.replace(tmp, cache_path)
+        except OSError:
+            pass
+    if fmt is None:
+        # Not a 16-bit mixer: hand SDL an in-memory WAV to convert
+        wav = io.BytesIO()
+        _write_wav(wav, channels, rate)
+        wav.seek(0)
+        return pygame.mixer.Sound(file=wav)
+    return pygame.mixer.Sound(buffer=synth.pcm16(*channels))
 
 
 _sfx = {}
@@ -243,12 +397,278 @@ _ambient_channels = {}
 _active_ambient = set()
 
 def play_sfx(name):
+    # Checked first so headless runs (ecco.sim) never touch the mixer
+    if name not in _sfx:
+        return
     ch = pygame.mixer.find_channel()
-    if ch and name in _sfx:
+    if ch:
         ch.play(_sfx[name])
 
 
-def load_or_generate_audio():
+class MusicDeck:
+    """
+    Two reserved mixer channels that cross-fade between fully decoded tracks.
+    Tracks are decoded into Sound objects on a worker thread ahead of time so
+    switching music never touches the disk on the render thread.
+    """
+
+    def __init__(self, music_map, volume=1.0, fade_ms=MUSIC_FADE_MS):
+        self.music_map = music_map
+        self.fade_ms = fade_ms
+        self.volume = volume
+        # Reserve channels 0 and 1 so find_channel() never hands them to SFX
+        pygame.mixer.set_reserved(2)
+        self.channels = (pygame.mixer.Channel(0), pygame.mixer.Channel(1))
+        self.active = 0
+        self.current_path = None
+        self.queued_env = None
+        self.queued_fade_ms = None  # The fade play() was asked for, kept with the env
+        self._sounds = {}
+        self._workers = {}
+        self._lock = threading.Lock()
+        for ch in self.channels:
+            ch.set_volume(volume)
+
+    def _decode(self, path):
+        try:
+            snd = pygame.mixer.Sound(path)
+        except Exception:
+            snd = None
+        with self._lock:
+            if snd is not None:
+                self._sounds[path] = snd
+            self._workers.pop(path, None)
+
+    def prefetch(self, env):
+        """Start decoding the track for env in the background (idempotent)."""
+        path = self.music_map.get(env)
+        if path is None:
+            return
+        with self._lock:
+            if path in self._sounds or path in self._workers:
+                return
+            worker = threading.Thread(target=self._decode, args=(path,), daemon=True)
+            self._workers[path] = worker
+        worker.start()
+
+    def is_ready(self, env):
+        with self._lock:
+            return self.music_map.get(env) in self._sounds
+
+    def play(self, env, fade_ms=None):
+        """
+        Cross-fade to env's track. If it is still decoding the switch is
+        queued and happens from update() as soon as the worker finishes.
+        """
+        path = self.music_map.get(env)
+        if path is None or path == self.current_path:
+            self.queued_env = None
+            return
+        with self._lock:
+            snd = self._sounds.get(path)
+        if snd is None:
+            self.prefetch(env)
+            self.queued_env = env
+            self.queued_fade_ms = fade_ms
+            return
+
+        fade = self.fade_ms if fade_ms is None else fade_ms
+        old = self.channels[self.active]
+        self.active = 1 - self.active
+        new = self.channels[self.active]
+        old.fadeout(fade)
+        new.set_volume(self.volume)
+        new.play(snd, loops=-1, fade_ms=fade)
+        self.current_path = path
+        self.queued_env = None
+        # Only the playing track stays cached; the fading channel keeps its
+        # own reference until it goes silent.
+        with self._lock:
+            self._sounds = {path: snd}
+
+    def update(self):
+        if self.queued_env is not None and self.is_ready(self.queued_env):
+            self.play(self.queued_env, self.queued_fade_ms)
+
+    def set_volume(self, volume):
+        self.volume = volume
+        for ch in self.channels:
+            ch.set_volume(volume)
+
+    def boost(self, on):
+        """Whole tracks have no layers to bring in (see StemDeck)."""
+
+    def stop(self):
+        for ch in self.channels:
+            ch.stop()
+        self.current_path = None
+        self.queued_env = None
+
+
+# Tempo group and audible stems of each environment's music
+MUSIC_LAYERS = {
+    Environment.BEACH: ("surface", ("bass", "lead", "drums")),
+    Environment.CORAL_COVE: ("reef", ("bass", "lead", "pad")),
+    Environment.ROCKY_REEF: ("reef", ("bass", "lead", "pad", "drums")),
+    Environment.OCEAN_FLOOR: ("deep", ("bass", "pad")),
+    Environment.OIL_RIG: ("deep", ("bass", "lead", "drums")),
+}
+
+
+def stem_path(group, stem):
+    return MUSIC_STEM_DIR / f"{group}_{MUSIC_TEMPOS[group]}bpm_{stem}.wav"
+
+
+class StemDeck:
+    """
+    Music layered live from looping stems. Each tempo group's stems are
+    rendered once into Sounds (and cached in MUSIC_STEM_DIR) on a worker
+    thread, like MusicDeck's tracks are decoded. All stems of the playing group loop in
+    step on their own reserved channel, at the volume of their layer:
+    environments of the same group just fade layers in and out over the
+    running loop, a new group cross-fades between two channel banks, and a
+    boost (power-up) brings in every layer.
+    """
+
+    def __init__(self, volume=1.0, fade_ms=MUSIC_FADE_MS, layer_fade_ms=MUSIC_LAYER_FADE_MS):
+        self.fade_ms = fade_ms
+        self.layer_fade_ms = layer_fade_ms
+        self.volume = volume
+        n = len(STEMS)
+        # Reserve both banks so find_channel() never hands them to SFX
+        pygame.mixer.set_reserved(2 * n)
+        self.banks = ([pygame.mixer.Channel(i) for i in range(n)],
+                      [pygame.mixer.Channel(n + i) for i in range(n)])
+        self.active = 0
+        self.env = None
+        self.group = None
+        self.boosted = False
+        self.queued_env = None
+        self.queued_fade_ms = None  # The fade play() was asked for, kept with the env
+        # Layer volumes of the active bank, ramped towards their targets
+        self.gains = dict.fromkeys(STEMS, 0.0)
+        self.targets = dict.fromkeys(STEMS, 0.0)
+        self._ramp_ms = layer_fade_ms
+        self._last_update = None
+        self._sounds = {}
+        self._workers = {}
+        self._lock = threading.Lock()
+
+    def _decode(self, group):
+        try:
+            sounds = {stem: synth_sound(render_music_stem, stem_path(group, stem),
+                                        stem=stem, tempo_bpm=MUSIC_TEMPOS[group])
+                      for stem in STEMS}
+        except Exception:
+            sounds = None
+        with self._lock:
+            if sounds is not None:
+                self._sounds[group] = sounds
+            self._workers.pop(group, None)
+
+    def prefetch(self, env):
+        """Start loading (or rendering) the stems for env (idempotent)."""
+        group = MUSIC_LAYERS[env][0]
+        with self._lock:
+            if group in self._sounds or group in self._workers:
+                return
+            worker = threading.Thread(target=self._decode, args=(group,), daemon=True)
+            self._workers[group] = worker
+        worker.start()
+
+    def is_ready(self, env):
+        with self._lock:
+            return MUSIC_LAYERS[env][0] in self._sounds
+
+    def _retarget(self, ramp_ms):
+        layers = MUSIC_LAYERS[self.env][1]
+        for stem in STEMS:
+            self.targets[stem] = 1.0 if self.boosted or stem in layers else 0.0
+        self._ramp_ms = max(1, ramp_ms)
+        self._last_update = time.perf_counter()
+
+    def play(self, env, fade_ms=None):
+        """
+        Fade to env's layers. If its stems are still loading the switch is
+        queued and happens from update() as soon as the worker finishes.
+        """
+        if env == self.env:
+            self.queued_env = None
+            return
+        group = MUSIC_LAYERS[env][0]
+        with self._lock:
+            sounds = self._sounds.get(group)
+        if sounds is None:
+            self.prefetch(env)
+            self.queued_env = env
+            self.queued_fade_ms = fade_ms
+            return
+
+        fade = self.fade_ms if fade_ms is None else fade_ms
+        self.env = env
+        self.queued_env = None
+        if group == self.group:
+            self._retarget(fade)
+            return
+        for stem, ch in zip(STEMS, self.banks[self.active]):
+            # SDL ignores fadeout() on a channel at volume 0, which would
+            # leave a muted layer looping forever
+            if self.gains[stem] > 0 and fade > 0:
+                ch.fadeout(fade)
+            else:
+                ch.stop()
+        self.active = 1 - self.active
+        self.group = group
+        # The new bank starts silent and its layers ramp up from update()
+        self.gains = dict.fromkeys(STEMS, 0.0)
+        self._retarget(fade)
+        if fade <= 0:
+            self.gains.update(self.targets)
+        for stem, ch in zip(STEMS, self.banks[self.active]):
+            ch.set_volume(self.volume * self.gains[stem])
+            ch.play(sounds[stem], loops=-1)
+        # Only the playing group stays cached; the fading bank keeps its
+        # own references until it goes silent.
+        with self._lock:
+            self._sounds = {group: sounds}
+
+    def boost(self, on):
+        """Bring every layer in (power-up) or back to the environment's mix."""
+        if on != self.boosted:
+            self.boosted = on
+            if self.env is not None:
+                self._retarget(self.layer_fade_ms)
+
+    def update(self):
+        if self.queued_env is not None and self.is_ready(self.queued_env):
+            self.play(self.queued_env, self.queued_fade_ms)
+        now = time.perf_counter()
+        dt_ms = 0.0 if self._last_update is None else (now - self._last_update) * 1000.0
+        self._last_update = now
+        step = dt_ms / self._ramp_ms
+        for stem, ch in zip(STEMS, self.banks[self.active]):
+            gain, target = self.gains[stem], self.targets[stem]
+            if gain != target:
+                gain = min(target, gain + step) if target > gain else max(target, gain - step)
+                self.gains[stem] = gain
+                ch.set_volume(self.volume * gain)
+
+    def set_volume(self, volume):
+        self.volume = volume
+        for stem, ch in zip(STEMS, self.banks[self.active]):
+            ch.set_volume(volume * self.gains[stem])
+
+    def stop(self):
+        for bank in self.banks:
+            for ch in bank:
+                ch.stop()
+        self.env = None
+        self.group = None
+        self.queued_env = None
+
+
+def resolve_music_map():
+    """Map each environment to a track path without generating anything."""
     music_map = {
         Environment.BEACH: str(MUSIC_BEACH_FILE),
         Environment.CORAL_COVE: str(MUSIC_CORAL_FILE),
@@ -270,6 +690,17 @@ def load_or_generate_audio():
     music_map[Environment.ROCKY_REEF] = ensure_track(music_map[Environment.ROCKY_REEF], tune_fallback)
     music_map[Environment.OCEAN_FLOOR] = ensure_track(music_map[Environment.OCEAN_FLOOR], deep_fallback)
     music_map[Environment.OIL_RIG] = ensure_track(music_map[Environment.OIL_RIG], deep_fallback)
+    return music_map
+
+
+def load_or_generate_audio():
+    """
+    Generate any missing whole tracks (when not using stems) and build the
+    ambient and SFX Sounds. Returns (music_map, ambient_map, eat, hurt, dash,
+    powerup); the last four are Sounds.
+    """
+    music_map = resolve_music_map()
+    rate = (mixer_format() or (44100,))[0]
 
     ambient_map = {
         'waves': str(AMBIENT_WAVES_FILE),
@@ -277,43 +708,30 @@ def load_or_generate_audio():
         'hum': str(AMBIENT_HUM_FILE),
     }
 
-    eat = str(SFX_EAT_FILE)
-    hurt = str(SFX_HURT_FILE)
-    dash = str(SFX_DASH_FILE)
-    powerup = str(SFX_POWERUP_FILE)
-
-    # Generate music for each environment if still missing (no fallback)
-    if not os.path.exists(music_map[Environment.BEACH]):
-        write_wav_deep_synth_melody(music_map[Environment.BEACH], tempo_bpm=120, duration_sec=ENV_DURATION_SEC)
-    if not os.path.exists(music_map[Environment.CORAL_COVE]):
-        write_wav_deep_synth_melody(music_map[Environment.CORAL_COVE], tempo_bpm=100, duration_sec=ENV_DURATION_SEC)
-    if not os.path.exists(music_map[Environment.ROCKY_REEF]):
-        write_wav_deep_synth_melody(music_map[Environment.ROCKY_REEF], tempo_bpm=90, duration_sec=ENV_DURATION_SEC)
-    if not os.path.exists(music_map[Environment.OCEAN_FLOOR]):
-        write_wav_deep_synth_melody(music_map[Environment.OCEAN_FLOOR], tempo_bpm=70, duration_sec=ENV_DURATION_SEC)
-    if not os.path.exists(music_map[Environment.OIL_RIG]):
-        write_wav_deep_synth_melody(music_map[Environment.OIL_RIG], tempo_bpm=60, duration_sec=ENV_DURATION_SEC)
-
-    # Softer chomp sound
-    if not os.path.exists(eat):
-        write_wav_synth_beep(eat, freq=330, ms=180, shape="sine", volume=0.2)
-    if not os.path.exists(hurt):
-        write_wav_synth_beep(hurt, freq=110, ms=300, shape="saw")
-    if not os.path.exists(dash):
-        write_wav_synth_beep(dash, freq=293, ms=150, shape="saw")
-    if not os.path.exists(powerup):
-        write_wav_synth_beep(powerup, freq=440, ms=500, shape="powerup")
+    # Generate music for each environment if still missing (no fallback);
+    # stems are rendered by StemDeck when a group is first needed
+    if not MUSIC_STEMS:
+        for env, tempo in TRACK_TEMPOS.items():
+            if not os.path.exists(music_map[env]):
+                write_wav_deep_synth_melody(music_map[env], tempo_bpm=tempo,
+                                            duration_sec=ENV_DURATION_SEC, sample_rate=rate)
+
+    # SFX files that exist are shipped assets; missing ones take a few
+    # milliseconds to synthesize, so they aren't cached
+    def sfx(path, name):
+        if os.path.exists(path):
+            return pygame.mixer.Sound(path)
+        return synth_sound(render_synth_beep, **SFX_BEEPS[name])
+
+    eat = sfx(str(SFX_EAT_FILE), "eat")
+    hurt = sfx(str(SFX_HURT_FILE), "hurt")
+    dash = sfx(str(SFX_DASH_FILE), "dash")
+    powerup = sfx(str(SFX_POWERUP_FILE), "powerup")
 
     # Ambient loops
-    if not os.path.exists(ambient_map['waves']):
-        write_wav_ambient_waves(ambient_map['waves'])
-    if not os.path.exists(ambient_map['gulls']):
-        write_wav_ambient_gulls(ambient_map['gulls'])
-    if not os.path.exists(ambient_map['hum']):
-        write_wav_ambient_hum(ambient_map['hum'])
-
-    for name, path in ambient_map.items():
-        _ambient_sounds[name] = pygame.mixer.Sound(path)
+    _ambient_sounds['waves'] = synth_sound(render_ambient_waves, ambient_map['waves'])
+    _ambient_sounds['gulls'] = synth_sound(render_ambient_gulls, ambient_map['gulls'])
+    _ambient_sounds['hum'] = synth_sound(render_ambient_hum, ambient_map['hum'])
 
     return music_map, ambient_map, eat, hurt, dash, powerup
 
@@ -0,0 +1,93 @@
+import os
+import json
+import time
+
+import pygame
+
+from .config import FONT_CACHE_FILE
+
+######################################################################
+# Startup instrumentation and fast-start helpers
+######################################################################
+
+
+class StartupTimer:
+    """Records how long each startup phase takes until the first frame."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, (now - self.last) * 1000.0))
+        self.last = now
+
+    def total_ms(self):
+        return (self.last - self.start) * 1000.0
+
+    def report(self):
+        lines = ["Startup breakdown (ms):"]
+        for phase, ms in self.phases:
+            lines.append(f"  {phase:<22}{ms:8.1f}")
+        lines.append(f"  {'time to first frame':<22}{self.total_ms():8.1f}")
+        print("\n".join(lines))
+
+
+def init_pygame(fast):
+    """
+    pygame.init() brings up every module (joystick, camera, ...). The fast
+    path only starts the ones the game actually uses.
+    """
+    if not fast:
+        pygame.init()
+        return
+    pygame.display.init()
+    pygame.font.init()
+
+
+_font_paths = None
+
+
+def _load_font_cache():
+    global _font_paths
+    if _font_paths is None:
+        try:
+            with open(FONT_CACHE_FILE, 'r', encoding='utf-8') as f:
+                _font_paths = dict(json.load(f))
+        except Exception:
+            _font_paths = {}
+    return _font_paths
+
+
+def _save_font_cache():
+    try:
+        FONT_CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with open(FONT_CACHE_FILE, 'w', encoding='utf-8') as f:
+            json.dump(_font_paths, f)
+    except Exception:
+        pass
+
+
+def load_font(name, size, bold=False):
+    """
+    Drop-in for pygame.font.SysFont that remembers the resolved font file,
+    so only the very first launch pays for the system font scan.
+    """
+    cache = _load_font_cache()
+    key = f"{name}|{int(bold)}"
+    entry = cache.get(key)
+    if entry is None or (entry[0] and not os.path.exists(entry[0])):
+        path = pygame.font.match_font(name, bold=bold)
+        # match_font falls back to the regular face when no bold one exists
+        fake_bold = bool(bold) and path == pygame.font.match_font(name)
+        entry = [path or "", fake_bold]
+        cache[key] = entry
+        _save_font_cache()
+
+    path, fake_bold = entry
+    font = pygame.font.Font(path or None, size)
+    if fake_bold:
+        font.set_bold(True)
+    return font
@@ -0,0 +1,211 @@
+import atexit
+import queue
+import sqlite3
+import sys
+import threading
+import time
+
+from .config import STORE_FILE, STORE_FLUSH_SEC, SAVE_FILE
+
+######################################################################
+# Session / score store
+######################################################################
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    character TEXT NOT NULL,
+    score INTEGER NOT NULL,
+    environment TEXT,
+    duration_sec REAL NOT NULL,
+    started_at REAL NOT NULL,
+    ended_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS best_scores (
+    character TEXT PRIMARY KEY,
+    score INTEGER NOT NULL,
+    achieved_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS env_stats (
+    environment TEXT PRIMARY KEY,
+    visits INTEGER NOT NULL DEFAULT 0,
+    seconds REAL NOT NULL DEFAULT 0,
+    eaten INTEGER NOT NULL DEFAULT 0,
+    deaths INTEGER NOT NULL DEFAULT 0,
+    updated_at REAL NOT NULL
+);
+"""
+
+_UPSERT_BEST = """
+INSERT INTO best_scores (character, score, achieved_at) VALUES (?, ?, ?)
+ON CONFLICT(character) DO UPDATE SET score = excluded.score, achieved_at = excluded.achieved_at
+WHERE excluded.score > best_scores.score
+"""
+
+_UPSERT_ENV = """
+INSERT INTO env_stats (environment, visits, seconds, eaten, deaths, updated_at)
+VALUES (?, 1, ?, ?, ?, ?)
+ON CONFLICT(environment) DO UPDATE SET
+    visits = visits + 1,
+    seconds = seconds + excluded.seconds,
+    eaten = eaten + excluded.eaten,
+    deaths = deaths + excluded.deaths,
+    updated_at = excluded.updated_at
+"""
+
+# Character name used for a score carried over from tide_highscore.json
+LEGACY_CHARACTER = "Legacy"
+# Tries per batch commit (reconnecting in between), and the wait before
+# the first retry; it doubles after that
+WRITE_ATTEMPTS = 3
+RETRY_SEC = 0.2
+# How long one try waits on a locked database (sqlite's default is 5 s)
+BUSY_TIMEOUT_SEC = 1.0
+# Longest a batch can spend in _commit() before it gives up
+COMMIT_BUDGET_SEC = (WRITE_ATTEMPTS * BUSY_TIMEOUT_SEC
+                     + sum(RETRY_SEC * 2 ** i for i in range(WRITE_ATTEMPTS - 1)))
+
+
+def _report(message):
+    print(f"Score store: {message}", file=sys.stderr)
+
+
+def load_highscore(path):
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            return max(0, int(f.read().strip()))
+    except Exception:
+        return 0
+
+
+def _connect(path):
+    conn = sqlite3.connect(str(path), timeout=BUSY_TIMEOUT_SEC)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+class ScoreStore:
+    """
+    SQLite-backed record of runs, per-character bests and per-environment
+    stats. The game thread only queues writes; a worker thread commits them
+    in batches, one transaction per batch, so a crash never leaves a
+    half-written record and the render loop never waits on the disk.
+
+    A batch that still fails after WRITE_ATTEMPTS (a locked or unopenable
+    database) is reported and kept, then committed on its own before the
+    next batch; only if that fails too are its writes dropped.
+    """
+
+    def __init__(self, path=STORE_FILE, flush_sec=STORE_FLUSH_SEC):
+        self.path = path
+        self.flush_sec = flush_sec
+        self.bests = {}
+        self._queue = queue.Queue()
+        self._closed = False
+        self._in_flight = 0  # Writes the worker is committing right now
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = _connect(path)
+        try:
+            with conn:
+                conn.executescript(_SCHEMA)
+                if conn.execute("SELECT COUNT(*) FROM best_scores").fetchone()[0] == 0:
+                    legacy = load_highscore(SAVE_FILE)
+                    if legacy > 0:
+                        conn.execute(_UPSERT_BEST, (LEGACY_CHARACTER, legacy, time.time()))
+            self.bests = dict(conn.execute("SELECT character, score FROM best_scores"))
+        finally:
+            conn.close()
+
+        self._worker = threading.Thread(target=self._writer, daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def best(self, character=None):
+        if character is not None:
+            return self.bests.get(character, 0)
+        return max(self.bests.values(), default=0)
+
+    def record_run(self, character, score, environment, duration_sec, started_at):
+        now = time.time()
+        score = int(score)
+        if score > self.bests.get(character, 0):
+            self.bests[character] = score
+        self._queue.put((
+            "INSERT INTO runs (character, score, environment, duration_sec, started_at, ended_at) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (character, score, environment, duration_sec, started_at, now),
+        ))
+        self._queue.put((_UPSERT_BEST, (character, score, now)))
+
+    def record_environment(self, environment, seconds, eaten=0, died=False):
+        self._queue.put((_UPSERT_ENV, (environment, seconds, eaten, int(died), time.time())))
+
+    def _commit(self, conn, batch):
+        """Commit batch as one transaction, retrying; returns (connection, committed)."""
+        for attempt in range(WRITE_ATTEMPTS):
+            if attempt:
+                time.sleep(RETRY_SEC * 2 ** (attempt - 1))
+            try:
+                if conn is None:
+                    conn = _connect(self.path)
+                with conn:
+                    for sql, params in batch:
+                        conn.execute(sql, params)
+                return conn, True
+            except sqlite3.Error as e:
+                error = e
+                # Start the next attempt on a fresh connection
+                if conn is not None:
+                    conn.close()
+                    conn = None
+        _report(f"{len(batch)} write(s) failed after {WRITE_ATTEMPTS} attempts: {error}")
+        return conn, False
+
+    def _writer(self):
+        conn = None
+        carried = []  # A failed batch, given one more go before the next
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            # Let a burst of writes (game over = run + best + env) share one commit
+            deadline = time.monotonic() + self.flush_sec
+            while True:
+                timeout = deadline - time.monotonic()
+                if batch[-1] is None or timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            if batch[-1] is None:
+                running = False
+                batch.pop()
+            self._in_flight = len(carried) + len(batch)
+            if carried:
+                conn, ok = self._commit(conn, carried)
+                if not ok:
+                    _report(f"dropped {len(carried)} write(s)")
+                carried = []
+            if batch:
+                conn, ok = self._commit(conn, batch)
+                if not ok:
+                    if running:
+                        carried = batch
+                    else:
+                        _report(f"dropped {len(batch)} write(s)")
+            self._in_flight = len(carried)
+        if conn is not None:
+            conn.close()
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put(None)
+        # Room for the last flush plus a carried batch, each retried in full
+        self._worker.join(timeout=self.flush_sec + 2 * COMMIT_BUDGET_SEC + 1.0)
+        if self._worker.is_alive():
+            unsaved = self._in_flight + self._queue.qsize() - 1  # Less the None
+            _report(f"closed with {max(unsaved, self._in_flight)} write(s) not saved")
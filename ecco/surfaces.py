@@ -0,0 +1,148 @@
+import pygame
+
+######################################################################
+# Display-format surface caches
+######################################################################
+
+# How a cached surface is converted for the display:
+#   opaque   - convert(); every pixel is solid
+#   colorkey - convert() onto a key colour with RLE colour-keying; pixels
+#              are either solid or fully transparent
+#   alpha    - convert_alpha(); real per-pixel alpha (antialiased edges),
+#              and colour-keyable surfaces that also have a surface alpha
+OPAQUE = "opaque"
+COLORKEY = "colorkey"
+ALPHA = "alpha"
+
+_KEY_COLOR = (255, 0, 255)
+
+# Every SurfaceCache, so set_mode can reconvert them all
+_caches = []
+# Display format the caches were last converted for
+_format = None
+
+
+def display_format():
+    """(bits, masks) of the display surface, or None before set_mode."""
+    screen = pygame.display.get_surface()
+    if screen is None:
+        return None
+    return screen.get_bitsize(), screen.get_masks()
+
+
+def classify(surf):
+    """OPAQUE, COLORKEY or ALPHA, from what the surface actually contains."""
+    if not surf.get_flags() & pygame.SRCALPHA and surf.get_colorkey() is None:
+        return OPAQUE
+    w, h = surf.get_size()
+    visible = pygame.mask.from_surface(surf, 0).count()
+    solid = pygame.mask.from_surface(surf, 254).count()
+    if visible != solid:
+        return ALPHA
+    return OPAQUE if solid == w * h else COLORKEY
+
+
+def convert_surface(surf, kind=None):
+    """
+    A display-format copy of surf. Surface-wide alpha (set_alpha) carries
+    over; without a display mode the surface is returned unchanged.
+    """
+    if display_format() is None:
+        return surf
+    kind = kind or classify(surf)
+    alpha = surf.get_alpha()
+    faded = alpha is not None and alpha < 255
+    if kind == ALPHA or (kind == COLORKEY and faded):
+        out = surf.convert_alpha()
+        if faded:
+            # SDL blends plain per-pixel alpha several times faster than
+            # per-pixel or colour-keyed pixels times a surface alpha, so
+            # bake the surface alpha into the pixels
+            out.set_alpha(255)
+            out.fill((255, 255, 255, alpha), special_flags=pygame.BLEND_RGBA_MULT)
+        return out
+    if kind == COLORKEY:
+        out = pygame.Surface(surf.get_size()).convert()
+        out.fill(_KEY_COLOR)
+        src = surf.copy()
+        src.set_alpha(255)
+        out.blit(src, (0, 0))
+        out.set_colorkey(_KEY_COLOR, pygame.RLEACCEL)
+        return out
+    out = surf.convert()
+    if faded:
+        out.set_alpha(alpha)
+    return out
+
+
+class SurfaceCache:
+    """
+    Dict-like cache whose values come back in the display's format.
+
+    The source surfaces are kept so that everything can be converted again
+    when set_mode changes the display format. `kind` forces a conversion
+    (OPAQUE / COLORKEY / ALPHA); by default each surface is classified.
+    With a `limit` the oldest entries are dropped first.
+    """
+
+    def __init__(self, kind=None, limit=None):
+        self.kind = kind
+        self.limit = limit
+        self._sources = {}
+        self._converted = {}
+        _caches.append(self)
+
+    def __contains__(self, key):
+        return key in self._converted
+
+    def __getitem__(self, key):
+        return self._converted[key]
+
+    def __setitem__(self, key, surf):
+        self._sources[key] = surf
+        self._converted[key] = convert_surface(surf, self.kind)
+        if self.limit is not None and len(self._sources) > self.limit:
+            oldest = next(iter(self._sources))
+            del self._sources[oldest]
+            del self._converted[oldest]
+
+    def __len__(self):
+        return len(self._converted)
+
+    def get(self, key, default=None):
+        return self._converted.get(key, default)
+
+    def clear(self):
+        self._sources.clear()
+        self._converted.clear()
+
+    def reconvert(self):
+        for key, surf in self._sources.items():
+            self._converted[key] = convert_surface(surf, self.kind)
+
+
+def reconvert_all():
+    """Call after set_mode; a no-op unless the display format changed."""
+    global _format
+    fmt = display_format()
+    if fmt is None or fmt == _format:
+        return False
+    _format = fmt
+    for cache in _caches:
+        cache.reconvert()
+    return True
+
+
+# ----------------------- Text -----------------------
+
+_text_cache = SurfaceCache(limit=256)
+
+
+def render_text(font, text, antialias, color):
+    """font.render() through a cache of display-format surfaces."""
+    key = (id(font), text, antialias, color)
+    surf = _text_cache.get(key)
+    if surf is None:
+        _text_cache[key] = font.render(text, antialias, color)
+        surf = _text_cache[key]
+    return surf
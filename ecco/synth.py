@@ -0,0 +1,207 @@
+import math
+
+try:  # numpy turns every block operation below into array arithmetic
+    import numpy
+except ImportError:
+    numpy = None
+
+######################################################################
+# Band-limited wavetable oscillators and block helpers
+######################################################################
+
+TABLE_SIZE = 2048
+# Notes from here up get their own table every octave
+_LOWEST_HZ = 20.0
+
+_SINE = [math.sin(2 * math.pi * i / TABLE_SIZE) for i in range(TABLE_SIZE)]
+
+
+# Partial amplitudes by harmonic number. The saw matches 2*((t % 1) - 0.5)
+# and the square sign(sin) (both cut off per octave); "powerup" is the
+# f + 1.5f + 2f chord of the SFX, which repeats every *two* cycles of f, so
+# its table holds harmonics 2, 3, 4 of f/2 (see Wavetable.ratio).
+def _saw(h):
+    return -2.0 / (math.pi * h)
+
+
+def _square(h):
+    return 4.0 / (math.pi * h) if h % 2 else 0.0
+
+
+_SHAPES = {
+    "saw": (_saw, 1.0),
+    "square": (_square, 1.0),
+    "sine": ({1: 1.0}.get, 1.0),
+    "powerup": ({2: 0.5, 3: 0.3, 4: 0.2}.get, 0.5),
+}
+
+
+class Wavetable:
+    """
+    One waveform as single-cycle tables, one per octave. Each table only
+    holds the partials that stay below Nyquist for the highest note of its
+    octave, so nothing aliases; tables are built the first time a note in
+    their octave is played. Partials are summed by indexing one shared sine
+    table, so building a table costs no sin() calls.
+    """
+
+    def __init__(self, partial, ratio=1.0, sample_rate=44100, size=TABLE_SIZE):
+        self.partial = partial   # harmonic number -> amplitude (or None / 0)
+        self.ratio = ratio       # table fundamental / played frequency
+        self.sample_rate = sample_rate
+        self.size = size
+        self._tables = {}
+
+    def _table(self, freq):
+        octave = max(0, int(math.log2(max(freq, _LOWEST_HZ) / _LOWEST_HZ)))
+        table = self._tables.get(octave)
+        if table is None:
+            top = _LOWEST_HZ * 2 ** (octave + 1)
+            size = self.size
+            sine = _SINE if size == TABLE_SIZE else [math.sin(2 * math.pi * i / size)
+                                                     for i in range(size)]
+            values = [0.0] * size
+            for h in range(1, max(1, int(self.sample_rate / 2 / top)) + 1):
+                amp = self.partial(h)
+                if amp:
+                    for j in range(size):
+                        values[j] += amp * sine[(h * j) % size]
+            values.append(values[0])  # Wrap-around entry for interpolation
+            table = numpy.array(values) if numpy is not None else values
+            self._tables[octave] = table
+        return table
+
+    def render(self, freq, n, phase=0.0):
+        """
+        n samples at freq, starting `phase` (0..1) into the cycle, with linear
+        interpolation between table entries. Returns (samples, end phase).
+        """
+        freq *= self.ratio
+        table = self._table(freq)
+        size = self.size
+        inc = freq * size / self.sample_rate
+        start = phase * size
+        end_phase = (phase + n * freq / self.sample_rate) % 1.0
+        if numpy is not None:
+            pos = (start + numpy.arange(n) * inc) % size
+            i = pos.astype(numpy.int64)
+            a = table[i]
+            return a + (table[i + 1] - a) * (pos - i), end_phase
+        out = [0.0] * n
+        pos = start
+        for k in range(n):
+            i = int(pos)
+            a = table[i]
+            out[k] = a + (table[i + 1] - a) * (pos - i)
+            pos += inc
+            if pos >= size:
+                pos -= size
+        return out, end_phase
+
+
+class OscillatorBank:
+    """The shared wavetables ("saw", "square", "sine", "powerup") for one rate."""
+
+    def __init__(self, sample_rate=44100):
+        self.sample_rate = sample_rate
+        self.tables = {name: Wavetable(partial, ratio, sample_rate)
+                       for name, (partial, ratio) in _SHAPES.items()}
+
+    def render(self, shape, freq, n, phase=0.0):
+        return self.tables[shape].render(freq, n, phase)
+
+
+_banks = {}
+
+
+def oscillator_bank(sample_rate=44100):
+    if sample_rate not in _banks:
+        _banks[sample_rate] = OscillatorBank(sample_rate)
+    return _banks[sample_rate]
+
+
+# ----------------------- Block helpers -----------------------
+# Sample buffers are numpy arrays when numpy is available, lists otherwise.
+
+def zeros(n):
+    return numpy.zeros(n) if numpy is not None else [0.0] * n
+
+
+def as_buffer(values):
+    values = list(values)
+    return numpy.array(values, dtype=float) if numpy is not None else values
+
+
+def mul(a, b):
+    """Element-wise a * b (b may be a number)."""
+    if numpy is not None:
+        return a * b
+    if isinstance(b, (int, float)):
+        return [x * b for x in a]
+    return [x * y for x, y in zip(a, b)]
+
+
+def add(a, b):
+    if numpy is not None:
+        return a + b
+    return [x + y for x, y in zip(a, b)]
+
+
+def mix_into(dst, start, block):
+    """dst[start:start + len(block)] += block."""
+    if numpy is not None:
+        dst[start:start + len(block)] += block
+        return
+    for k, x in enumerate(block, start):
+        dst[k] += x
+
+
+def periodic(pattern, start, n):
+    """n samples of a repeating pattern, beginning at absolute sample start."""
+    p = len(pattern)
+    if numpy is not None:
+        return pattern[(start + numpy.arange(n)) % p]
+    return [pattern[(start + k) % p] for k in range(n)]
+
+
+def delayed(buf, lag, gain=1.0, wrap=False):
+    """
+    buf delayed by lag samples, times gain. The start is silent, or with
+    wrap (a looping buffer) the end of buf.
+    """
+    n = len(buf)
+    lag = lag % n if wrap else min(lag, n)
+    if numpy is not None:
+        if wrap:
+            return numpy.roll(buf, lag) * gain
+        out = numpy.zeros(n)
+        out[lag:] = buf[:n - lag] * gain
+        return out
+    head = [x * gain for x in buf[n - lag:]] if wrap else [0.0] * lag
+    return head + [x * gain for x in buf[:n - lag]]
+
+
+def clamp(buf, lo=-1.0, hi=1.0):
+    if numpy is not None:
+        return numpy.clip(buf, lo, hi)
+    return [lo if x < lo else hi if x > hi else x for x in buf]
+
+
+def soft_clip(buf, knee=0.7):
+    """tanh() on samples louder than knee, the rest unchanged."""
+    if numpy is not None:
+        return numpy.where(numpy.abs(buf) > knee, numpy.tanh(buf), buf)
+    return [math.tanh(x) if abs(x) > knee else x for x in buf]
+
+
+def pcm16(*channels):
+    """Interleave float channels in -1..1 into 16-bit little-endian PCM bytes."""
+    if numpy is not None:
+        frames = numpy.stack([numpy.asarray(c) for c in channels], axis=1) * 32767
+        return frames.astype('<i2').tobytes()  # astype truncates like int()
+    from array import array
+    import sys
+    out = array('h', [int(x * 32767) for frame in zip(*channels) for x in frame])
+    if sys.byteorder != 'little':
+        out.byteswap()
+    return out.tobytes()
@@ -0,0 +1,134 @@
+import argparse
+import hashlib
+import json
+import math
+import time
+
+from . import sound, synth
+from .config import AUDIO_GOLDEN_FILE, MUSIC_TEMPOS
+
+######################################################################
+# Golden-output and throughput checks for the audio generators
+######################################################################
+
+SAMPLE_RATE = 44100
+SEED = 1234
+# Sections each excerpt's loudness and brightness are fingerprinted over
+BLOCKS = 32
+# Allowed drift per block, as a fraction of the excerpt's overall level
+DEFAULT_TOLERANCE = 0.05
+
+
+def excerpts():
+    """name -> (render function, keyword arguments), short and seeded."""
+    cases = {}
+    for tempo in sound.TRACK_TEMPOS.values():
+        cases[f"melody {tempo}bpm"] = (sound.render_deep_synth_melody,
+                                       dict(tempo_bpm=tempo, duration_sec=0.1, seed=SEED))
+    for group, tempo in MUSIC_TEMPOS.items():
+        for stem in sound.STEMS:
+            cases[f"stem {group} {stem}"] = (sound.render_music_stem,
+                                             dict(stem=stem, tempo_bpm=tempo, seed=SEED, bars=1))
+    for name, beep in sound.SFX_BEEPS.items():
+        cases[f"beep {name}"] = (sound.render_synth_beep, beep)
+    cases["beep square"] = (sound.render_synth_beep, dict(shape="square"))
+    cases["ambient waves"] = (sound.render_ambient_waves, dict(duration=1, seed=SEED))
+    cases["ambient gulls"] = (sound.render_ambient_gulls, dict(duration=1))
+    cases["ambient hum"] = (sound.render_ambient_hum, dict(duration=1))
+    return cases
+
+
+def fingerprint(channels):
+    """
+    Length, an exact hash of the 16-bit output, and per block the RMS level
+    and zero-crossing rate (a cheap stand-in for brightness) of the mono sum.
+    """
+    mono = [sum(frame) / len(channels) for frame in zip(*channels)]
+    n = len(mono)
+    size = max(1, n // BLOCKS)
+    rms, zcr = [], []
+    for start in range(0, size * BLOCKS, size):
+        block = mono[start:start + size]
+        if not block:
+            break
+        rms.append(round(math.sqrt(sum(x * x for x in block) / len(block)), 6))
+        crossings = sum(1 for a, b in zip(block, block[1:]) if (a < 0) != (b < 0))
+        zcr.append(round(crossings / len(block), 6))
+    return {
+        "frames": n,
+        "channels": len(channels),
+        "sha1": hashlib.sha1(synth.pcm16(*channels)).hexdigest(),
+        "rms": rms,
+        "zcr": zcr,
+    }
+
+
+def compare(fp, golden, tolerance=DEFAULT_TOLERANCE):
+    """(ok, description) of fp against its golden fingerprint."""
+    if golden is None:
+        return False, "no golden"
+    if fp["sha1"] == golden["sha1"]:
+        return True, "exact"
+    if (fp["frames"], fp["channels"]) != (golden["frames"], golden["channels"]):
+        return False, (f"CHANGED length {golden['frames']}x{golden['channels']}"
+                       f" -> {fp['frames']}x{fp['channels']}")
+    level = max(1e-4, math.sqrt(sum(r * r for r in golden["rms"]) / len(golden["rms"])))
+    rms_dev = max(abs(a - b) for a, b in zip(fp["rms"], golden["rms"])) / level
+    # Crossing rates of near-silent blocks are just noise
+    zcr_dev = max((abs(a - b) / max(b, 1e-3)
+                   for a, b, r in zip(fp["zcr"], golden["zcr"], golden["rms"]) if r > level * 0.1),
+                  default=0.0)
+    worst = max(rms_dev, zcr_dev)
+    text = f"level {rms_dev:.1%} brightness {zcr_dev:.1%}"
+    return worst <= tolerance, ("within " if worst <= tolerance else "CHANGED ") + text
+
+
+def run(names=None, tolerance=DEFAULT_TOLERANCE, update=False):
+    """Render every excerpt, check (or store) goldens and print throughput."""
+    goldens = {}
+    if AUDIO_GOLDEN_FILE.exists():
+        goldens = json.loads(AUDIO_GOLDEN_FILE.read_text()).get("excerpts", {})
+    failed = []
+    print(f"{'excerpt':<22}{'frames':>8}{'Msamples/s':>12}{'x realtime':>12}  golden"
+          f"  ({'numpy' if synth.numpy is not None else 'pure Python'}, seed {SEED})")
+    for name, (render, kwargs) in excerpts().items():
+        if names and not any(n in name for n in names):
+            continue
+        start = time.perf_counter()
+        channels = render(sample_rate=SAMPLE_RATE, **kwargs)
+        elapsed = max(time.perf_counter() - start, 1e-9)
+        fp = fingerprint(channels)
+        if update:
+            goldens[name] = fp
+            status = "stored"
+        else:
+            ok, status = compare(fp, goldens.get(name), tolerance)
+            if not ok:
+                failed.append(name)
+        frames = fp["frames"]
+        print(f"{name:<22}{frames:>8}{frames * fp['channels'] / elapsed / 1e6:>12.2f}"
+              f"{frames / SAMPLE_RATE / elapsed:>12.1f}  {status}")
+    if update:
+        AUDIO_GOLDEN_FILE.write_text(json.dumps(
+            {"sample_rate": SAMPLE_RATE, "seed": SEED, "excerpts": goldens}, indent=1) + "\n")
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check the audio generators against golden output")
+    parser.add_argument("names", nargs="*", help="only excerpts whose name contains one of these")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed drift per block, as a fraction (default %(default)s)")
+    parser.add_argument("--update", action="store_true",
+                        help=f"store the current output as golden in {AUDIO_GOLDEN_FILE.name}")
+    parser.add_argument("--pure", action="store_true", help="use the pure-Python synth path")
+    args = parser.parse_args(argv)
+    if args.pure:
+        synth.numpy = None
+    failed = run(args.names, args.tolerance, args.update)
+    if failed:
+        parser.exit(1, f"{len(failed)} excerpt(s) changed: {', '.join(failed)}\n")
+
+
+if __name__ == "__main__":
+    main()
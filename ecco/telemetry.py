@@ -0,0 +1,189 @@
+import argparse
+import atexit
+import json
+import struct
+import threading
+import time
+from pathlib import Path
+
+from .config import TELEMETRY_DIR, TELEMETRY_CAPACITY, TELEMETRY_FLUSH_SEC
+
+######################################################################
+# Per-frame session telemetry
+######################################################################
+
+MAGIC = b"ECTL"
+VERSION = 1
+
+# One fixed-size little-endian record per frame
+FIELDS = ("frame_ms", "work_ms", "jellies", "bags", "creatures", "bubbles",
+          "eaten", "hits", "environment", "flags", "score")
+RECORD = struct.Struct("<ffHHHHBBBBI")
+
+# Bits of the flags field
+FLAG_MUSIC_TRANSITION = 1
+FLAG_QUALITY_CHANGE = 2
+
+
+def _clamp16(n):
+    return n if n < 0xFFFF else 0xFFFF
+
+
+class TelemetryRecorder:
+    """
+    Writes one RECORD per frame into a preallocated ring buffer; a
+    background thread appends whatever has accumulated to a session file
+    every flush_sec. record() is a single struct.pack_into, so the game
+    thread never allocates or touches the disk. If the writer falls more
+    than a whole ring behind, the oldest frames are dropped and counted.
+
+    The file is a header (MAGIC, version, JSON with the field names, record
+    format and environment names) followed by raw records.
+    """
+
+    def __init__(self, environments, directory=TELEMETRY_DIR,
+                 capacity=TELEMETRY_CAPACITY, flush_sec=TELEMETRY_FLUSH_SEC):
+        self.environments = list(environments)
+        self._env_index = {env: i for i, env in enumerate(self.environments)}
+        self.capacity = capacity
+        self.flush_sec = flush_sec
+        self._buffer = bytearray(RECORD.size * capacity)
+        self._written = 0   # records ever recorded
+        self._flushed = 0   # records ever handed to the file
+        self.dropped = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        directory.mkdir(parents=True, exist_ok=True)
+        self.path = directory / time.strftime("session-%Y%m%d-%H%M%S.bin")
+        header = json.dumps({"fields": FIELDS, "format": RECORD.format,
+                             "environments": self.environments,
+                             "started_at": time.time()}).encode("utf-8")
+        with open(self.path, "wb") as f:
+            f.write(MAGIC + struct.pack("<HI", VERSION, len(header)) + header)
+
+        self._worker = threading.Thread(target=self._writer, daemon=True)
+        self._worker.start()
+        atexit.register(self.close)
+
+    def record(self, frame_ms, work_ms, jellies, bags, creatures, bubbles,
+               eaten, hits, environment, score, flags=0):
+        with self._lock:
+            RECORD.pack_into(self._buffer, (self._written % self.capacity) * RECORD.size,
+                             frame_ms, work_ms, _clamp16(jellies), _clamp16(bags),
+                             _clamp16(creatures), _clamp16(bubbles), min(eaten, 255),
+                             min(hits, 255), self._env_index.get(environment, 255), flags,
+                             max(0, int(score)))
+            self._written += 1
+
+    def _take(self):
+        """Copy out the records not yet written, oldest first."""
+        with self._lock:
+            start = max(self._flushed, self._written - self.capacity)
+            self.dropped += start - self._flushed
+            end = self._written
+            self._flushed = end
+            if start == end:
+                return b""
+            a = (start % self.capacity) * RECORD.size
+            b = (end % self.capacity) * RECORD.size
+            if a < b:
+                return bytes(self._buffer[a:b])
+            return bytes(self._buffer[a:]) + bytes(self._buffer[:b])
+
+    def _writer(self):
+        with open(self.path, "ab") as f:
+            while not self._stop.wait(self.flush_sec):
+                data = self._take()
+                if data:
+                    f.write(data)
+                    f.flush()
+            f.write(self._take())
+
+    def close(self):
+        if self._stop.is_set():
+            return
+        self._stop.set()
+        self._worker.join(timeout=5.0)
+
+
+# ----------------------- Reading and summarising -----------------------
+
+def read_session(path):
+    """Return (header dict, list of record dicts) for a session file."""
+    with open(path, "rb") as f:
+        data = f.read()
+    if data[:4] != MAGIC:
+        raise ValueError(f"{path} is not a telemetry file")
+    version, size = struct.unpack_from("<HI", data, 4)
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported telemetry version {version}")
+    start = 4 + struct.calcsize("<HI")
+    header = json.loads(data[start:start + size].decode("utf-8"))
+    record = struct.Struct(header["format"])
+    body = data[start + size:]
+    body = body[:len(body) - len(body) % record.size]  # Ignore a torn last record
+    fields = header["fields"]
+    return header, [dict(zip(fields, values)) for values in record.iter_unpack(body)]
+
+
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    k = (len(sorted_values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(sorted_values) - 1)
+    return sorted_values[lo] + (sorted_values[hi] - sorted_values[lo]) * (k - lo)
+
+
+def summarize(paths):
+    """Frame-time percentiles per environment over one or more sessions."""
+    frames = {}
+    extra = {}
+    for path in paths:
+        header, records = read_session(path)
+        envs = header["environments"]
+        for r in records:
+            env = envs[r["environment"]] if r["environment"] < len(envs) else "?"
+            frames.setdefault(env, []).append(r["frame_ms"])
+            stats = extra.setdefault(env, [0, 0, 0])
+            stats[0] += r["eaten"] + r["hits"]
+            stats[1] += bool(r["flags"] & FLAG_MUSIC_TRANSITION)
+            stats[2] = max(stats[2], r["jellies"] + r["bags"] + r["creatures"])
+
+    rows = []
+    everything = []
+    for env, values in frames.items():
+        values.sort()
+        everything.extend(values)
+        rows.append((env, values, *extra[env]))
+    everything.sort()
+    rows.append(("all", everything, sum(e[0] for e in extra.values()),
+                 sum(e[1] for e in extra.values()), max((e[2] for e in extra.values()), default=0)))
+
+    lines = [f"{'environment':<14}{'frames':>8}{'p50':>9}{'p95':>9}{'p99':>9}"
+             f"{'collide':>9}{'music':>7}{'peak ent':>10}"]
+    for env, values, collisions, music, peak in rows:
+        lines.append(f"{env:<14}{len(values):>8}{percentile(values, 50):>9.2f}"
+                     f"{percentile(values, 95):>9.2f}{percentile(values, 99):>9.2f}"
+                     f"{collisions:>9}{music:>7}{peak:>10}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise Sea Turtle Echo telemetry sessions")
+    parser.add_argument("files", nargs="*", type=Path,
+                        help=f"session files (default: newest in {TELEMETRY_DIR})")
+    parser.add_argument("--all", action="store_true", help="every session in the directory")
+    args = parser.parse_args(argv)
+    paths = args.files
+    if not paths:
+        sessions = sorted(TELEMETRY_DIR.glob("session-*.bin"))
+        paths = sessions if args.all else sessions[-1:]
+    if not paths:
+        parser.exit(1, "no telemetry sessions found\n")
+    print(summarize(paths))
+
+
+if __name__ == "__main__":
+    main()